@@ -3,23 +3,58 @@
 
 import sys
 
-from gtasks.cli.cli import build_parser
-from gtasks.client.client_factory import build_cached_client
-from gtasks.defaults import CONFIG_FILE_PATH
+from gtasks.cli.cli import build_parser, dispatched_command
+from gtasks.client.api_client import ApiClient
+from gtasks.client.client_factory import (
+    build_cached_client,
+    cache_backend,
+    cache_policy,
+    request_executor,
+    tasks_resource_provider,
+)
+from gtasks.defaults import CONFIG_FILE_PATH, DAEMON_SOCKET_PATH
+from gtasks.utils import write_back
 from gtasks.utils.config import Config
 
+# Commands that must always run in the invoking process.
+_IN_PROCESS_COMMANDS = {"auth", "daemon"}
+
 
 def main(argv: list[str] | None = None) -> int:
-    client = build_cached_client()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if dispatched_command(argv) not in _IN_PROCESS_COMMANDS:
+        from gtasks.cli.daemon import forward
+
+        code = forward(argv, DAEMON_SOCKET_PATH)
+        if code is not None:
+            return code
 
     cfg_path = CONFIG_FILE_PATH
     cfg = Config(cfg_path)
-    parser = build_parser(client, cfg)
+    # A one-shot process leaves stale entries for the next call to sync instead of
+    # keeping the shell waiting on a background revalidation after printing its output.
+    client = build_cached_client(
+        tasks_resource_provider(cfg),
+        cache_policy(cfg),
+        cache_backend(cfg),
+        request_executor(cfg),
+        background_revalidation=False,
+    )
+    return run(argv, client, cfg)
+
+
+def run(argv: list[str], client: ApiClient, cfg: Config) -> int:
+    """Parse argv and dispatch it against the given client and config."""
+    parser = build_parser(client, cfg, argv)
 
     args = parser.parse_args(argv)
 
     try:
-        args.func(args)
+        # Cache and config writes made by the command are flushed once, when it finishes.
+        with write_back.session():
+            args.func(args)
         return 0
     except KeyboardInterrupt:
         print("\nOperation cancelled.")
@@ -1,25 +1,90 @@
 """CLI parser building for the Google Tasks CLI."""
 
 import argparse
-from functools import partial
-
-from gtasks.cli.parsers.add_parser import add_subparser_add_task
-from gtasks.cli.parsers.auth_parser import add_subparser_auth
-from gtasks.cli.parsers.config_parser import add_subparser_config
-from gtasks.cli.parsers.delete_parser import add_subparser_delete
-from gtasks.cli.parsers.done_parser import add_subparser_done
-from gtasks.cli.parsers.lists_parser import add_subparser_lists
-from gtasks.cli.parsers.refresh_parser import add_subparser_refresh
-from gtasks.cli.parsers.tasks_parser import add_subparser_tasks, cmd_list_tasks
-from gtasks.cli.parsers.use_parser import add_subparser_use
+import importlib
+from collections.abc import Callable
+from typing import NamedTuple
+
 from gtasks.client.api_client import ApiClient
 from gtasks.utils.config import Config
 
 _DEFAULT_LIMIT = 10
 
 
-def build_parser(client: ApiClient, cfg: Config) -> argparse.ArgumentParser:
-    """Build and return the argument parser for the CLI."""
+class _Command(NamedTuple):
+    """Registry entry: where a subcommand lives and what its subparser builder needs."""
+
+    module: str
+    add_subparser: str
+    help: str
+    needs_client: bool = True
+    needs_cfg: bool = True
+
+
+# Only the dispatched command's module is imported; the rest get help-only stubs so that
+# e.g. `gtasks lists` never pays for dateparser or the OAuth flow.
+_COMMANDS: dict[str, _Command] = {
+    "tasks": _Command(
+        "gtasks.cli.parsers.tasks_parser", "add_subparser_tasks", "List tasks from a task list"
+    ),
+    "lists": _Command(
+        "gtasks.cli.parsers.lists_parser",
+        "add_subparser_lists",
+        "List all task lists",
+        needs_cfg=False,
+    ),
+    "add": _Command("gtasks.cli.parsers.add_parser", "add_subparser_add_task", "Add a new task"),
+    "use": _Command(
+        "gtasks.cli.parsers.use_parser", "add_subparser_use", "Set the active task list"
+    ),
+    "done": _Command(
+        "gtasks.cli.parsers.done_parser",
+        "add_subparser_done",
+        "Mark one or more tasks as complete",
+    ),
+    "delete": _Command(
+        "gtasks.cli.parsers.delete_parser", "add_subparser_delete", "Delete one or more tasks"
+    ),
+    "refresh": _Command(
+        "gtasks.cli.parsers.refresh_parser",
+        "add_subparser_refresh",
+        "Refresh the task list cache",
+        needs_cfg=False,
+    ),
+    "config": _Command(
+        "gtasks.cli.parsers.config_parser",
+        "add_subparser_config",
+        "View or set configuration defaults",
+        needs_client=False,
+    ),
+    "daemon": _Command(
+        "gtasks.cli.parsers.daemon_parser",
+        "add_subparser_daemon",
+        "Run a background daemon that keeps the client warm",
+        needs_client=False,
+        needs_cfg=False,
+    ),
+    "auth": _Command(
+        "gtasks.cli.parsers.auth_parser",
+        "add_subparser_auth",
+        "Configure Google OAuth credentials",
+        needs_client=False,
+        needs_cfg=False,
+    ),
+}
+
+
+def build_parser(
+    client: ApiClient,
+    cfg: Config,
+    argv: list[str] | None = None,
+) -> argparse.ArgumentParser:
+    """Build and return the argument parser for the CLI.
+
+    When argv is given, only the subcommand it dispatches to is fully registered (and its
+    module imported); the others are registered as help-only stubs. Without argv every
+    subcommand is registered in full.
+    """
     parser = argparse.ArgumentParser(
         prog="gtasks",
         description="Command-line interface for Google Tasks",
@@ -27,7 +92,9 @@ def build_parser(client: ApiClient, cfg: Config) -> argparse.ArgumentParser:
 
     # Default: bare `gtasks` shows the first 10 tasks from the default list.
     parser.set_defaults(
-        func=partial(cmd_list_tasks, client=client, cfg=cfg),
+        func=_lazy_command(
+            "gtasks.cli.parsers.tasks_parser", "cmd_list_tasks", client=client, cfg=cfg
+        ),
         tasklist_title=None,
         limit=_DEFAULT_LIMIT,
         show_ids=False,
@@ -39,19 +106,46 @@ def build_parser(client: ApiClient, cfg: Config) -> argparse.ArgumentParser:
         required=False,
     )
 
-    add_subparser_tasks(subparsers, client, cfg)
-    add_subparser_lists(subparsers, client)
-    add_subparser_add_task(subparsers, client, cfg)
-    add_subparser_use(subparsers, client, cfg)
-    add_subparser_done(subparsers, client, cfg)
-    add_subparser_delete(subparsers, client, cfg)
-    add_subparser_refresh(subparsers, client)
-    add_subparser_config(subparsers, cfg)
-    add_subparser_auth(subparsers)
+    dispatched = dispatched_command(argv) if argv is not None else None
+    for name, command in _COMMANDS.items():
+        if argv is None or name == dispatched:
+            _register(subparsers, command, client, cfg)
+        else:
+            subparsers.add_parser(name, help=command.help)
 
     return parser
 
 
+def dispatched_command(argv: list[str]) -> str | None:
+    """Return the subcommand argv dispatches to, if any.
+
+    The top-level parser takes no options besides -h, so the first positional is the
+    subcommand.
+    """
+    for token in argv:
+        if not token.startswith("-"):
+            return token if token in _COMMANDS else None
+    return None
+
+
+def _register(subparsers, command: _Command, client: ApiClient, cfg: Config) -> None:
+    add_subparser = getattr(importlib.import_module(command.module), command.add_subparser)
+    deps: list[ApiClient | Config] = []
+    if command.needs_client:
+        deps.append(client)
+    if command.needs_cfg:
+        deps.append(cfg)
+    add_subparser(subparsers, *deps)
+
+
+def _lazy_command(module: str, name: str, **kwargs) -> Callable[[argparse.Namespace], None]:
+    """Return a handler that imports its implementation only when invoked."""
+
+    def run(args: argparse.Namespace) -> None:
+        getattr(importlib.import_module(module), name)(args, **kwargs)
+
+    return run
+
 """
     Goal Example usage:
 
@@ -1,6 +1,6 @@
 import argparse
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
@@ -34,7 +34,7 @@ def _fmt_title(title: str, completed: bool) -> str:
     return title
 
 
-def print_tasks(tasks: list, args: argparse.Namespace) -> None:
+def print_tasks(tasks: Iterable, args: argparse.Namespace) -> None:
     for ix, task in enumerate(tasks, 1):
         raw_title: str = task.get("title", "<no title>")
         notes = task.get("notes")
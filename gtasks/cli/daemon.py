@@ -0,0 +1,184 @@
+"""Opt-in daemon that serves thin `gtasks` invocations from one warm client.
+
+`gtasks daemon` listens on a Unix domain socket in the app config directory and holds a
+single CachedApiClient, so credentials, the discovery resource, open connections and the
+task caches stay loaded between invocations. Each request is one JSON line, either
+{"argv": [...]} or {"stop": true}; the reply is one JSON line with the exit code and the
+captured stdout/stderr.
+
+Commands that need to prompt can't be answered over the socket. The daemon replies
+{"fallback": true} instead, and the caller re-runs the command in-process.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections.abc import Callable
+from configparser import ConfigParser
+from pathlib import Path
+from typing import Any
+
+from gtasks.client.cached_api_client import CachedApiClient
+from gtasks.utils.config import Config
+
+_ENCODING = "utf-8"
+
+
+class _PromptRequired(BaseException):
+    """Raised when a command served by the daemon reads from stdin.
+
+    Derives from BaseException so the `except Exception` in command dispatch can't
+    swallow it.
+    """
+
+
+class _NoStdin(io.TextIOBase):
+    def readline(self, size: int | None = -1) -> str:
+        raise _PromptRequired
+
+    def read(self, size: int | None = -1) -> str:
+        raise _PromptRequired
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves CLI invocations one at a time against a long-lived client."""
+
+    def __init__(
+        self,
+        socket_path: Path,
+        client_factory: Callable[[], CachedApiClient],
+        config_path: Path,
+    ) -> None:
+        self._client_factory = client_factory
+        self._client: CachedApiClient = client_factory()
+        self._config_path = config_path
+        self._reload_pending = False
+        old_umask = os.umask(0o177)  # socket is owner-only: it drives your Google account
+        try:
+            super().__init__(str(socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def run_argv(self, argv: list[str]) -> dict[str, Any]:
+        from gtasks.app import run
+
+        if self._reload_pending:
+            self._client = self._client_factory()
+            self._reload_pending = False
+
+        # Re-read config on every request so `gtasks config` changes made anywhere apply.
+        cfg = Config(self._config_path, ConfigParser())
+        stdout, stderr = io.StringIO(), io.StringIO()
+        real_stdin, sys.stdin = sys.stdin, _NoStdin()
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    code = run(argv, self._client, cfg)
+                except SystemExit as e:
+                    code = _exit_code(e)
+        except _PromptRequired:
+            # The caller re-runs in-process and may rewrite the caches on disk.
+            self._reload_pending = True
+            return {"fallback": True}
+        finally:
+            sys.stdin = real_stdin
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get("stop"):
+            # shutdown() blocks until serve_forever() returns, so it can't run on this thread.
+            threading.Thread(target=self.server.shutdown).start()
+            response: dict[str, Any] = {"code": 0, "stdout": "", "stderr": ""}
+        else:
+            response = self.server.run_argv(request["argv"])
+        self.wfile.write(json.dumps(response).encode(_ENCODING) + b"\n")
+
+
+def serve(
+    socket_path: Path,
+    client_factory: Callable[[], CachedApiClient],
+    config_path: Path,
+) -> None:
+    """Serve requests on socket_path until stopped or interrupted."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)  # stale socket left behind by a crashed daemon
+    with DaemonServer(socket_path, client_factory, config_path) as server:
+        try:
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def forward(argv: list[str], socket_path: Path) -> int | None:
+    """Run argv on the daemon and replay its output.
+
+    Returns the exit code, or None when no daemon is listening or the command needs to
+    run in-process.
+    """
+    response = _request(socket_path, {"argv": argv})
+    if response is None or response.get("fallback"):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["code"]
+
+
+def is_running(socket_path: Path) -> bool:
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def stop(socket_path: Path) -> bool:
+    """Ask a running daemon to shut down. Returns False if none is running."""
+    return _request(socket_path, {"stop": True}) is not None
+
+
+def _connect(socket_path: Path) -> socket.socket | None:
+    if not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _request(socket_path: Path, payload: dict[str, Any]) -> dict[str, Any] | None:
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as f:
+        # Past this point the daemon may already have run the command, so failures are
+        # reported rather than silently retried in-process.
+        try:
+            sock.sendall(json.dumps(payload).encode(_ENCODING) + b"\n")
+            return json.loads(f.readline())
+        except (OSError, ValueError) as e:
+            return {"code": 1, "stdout": "", "stderr": f"Error: gtasks daemon failed: {e}\n"}
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
@@ -4,31 +4,10 @@ import argparse
 import sys
 from functools import partial
 
-import dateparser
-
 from gtasks.cli.cli_utils import prompt_choose_tasklist_id
 from gtasks.client.api_client import ApiClient
 from gtasks.utils.config import Config, ConfigKey
-
-
-def parse_due_date(date_str: str) -> str:
-    """Parse a human-readable date string and return an RFC 3339 timestamp.
-
-    Uses dateparser with PREFER_DATES_FROM=future so relative expressions like
-    "monday" or "next week" resolve to upcoming dates rather than past ones.
-    Always normalises to midnight UTC since the Tasks API ignores the time component.
-    """
-    dt = dateparser.parse(
-        date_str,
-        settings={
-            "PREFER_DATES_FROM": "future",
-            "RETURN_AS_TIMEZONE_AWARE": True,
-            "TO_TIMEZONE": "UTC",
-        },
-    )
-    if dt is None:
-        raise ValueError(f"Could not parse due date: {date_str!r}")
-    return dt.strftime("%Y-%m-%dT00:00:00.000Z")
+from gtasks.utils.due_dates import parse_due_date
 
 
 def cmd_add_task(args: argparse.Namespace, client: ApiClient, cfg: Config) -> None:
@@ -2,17 +2,53 @@
 
 import argparse
 import sys
+from collections.abc import Callable
 from functools import partial
 
+from gtasks.defaults import CACHE_BACKENDS
 from gtasks.utils.config import Config, ConfigKey
 
 _DESCRIPTIONS: dict[ConfigKey, str] = {
     ConfigKey.DEFAULT_TASKLIST_TITLE: "The default task list used when no -l flag is given",
+    ConfigKey.HTTP_POOL_SIZE: "Maximum number of keep-alive connections to the Tasks API",
+    ConfigKey.HTTP_IDLE_TIMEOUT: "Seconds an idle API connection is kept before reconnecting",
+    ConfigKey.HTTP_TIMEOUT: "Seconds to wait on the API to connect or send data before retrying",
+    ConfigKey.CACHE_FRESH_TTL: "Seconds cached data is served without checking the API",
+    ConfigKey.CACHE_STALE_WINDOW: (
+        "Seconds past the fresh TTL that cached data is still served, revalidated by the "
+        "daemon in the background or otherwise by the next command"
+    ),
+    ConfigKey.CACHE_MAX_AGE: "Seconds after which cached data is discarded and refetched",
+    ConfigKey.CACHE_BACKEND: "Where the local cache is stored: json (default) or sqlite",
+    ConfigKey.API_MAX_RETRIES: "Times a request that failed with a transient error is retried",
+    ConfigKey.API_RATE_LIMIT: "API requests sent per second at most (0 for no limit)",
+    ConfigKey.API_RATE_BURST: "API requests that may be sent at once before the rate limit applies",
 }
 
 _VALID_KEYS = ", ".join(k.value for k in ConfigKey)
 
 
+def _cache_backend(value: str) -> str:
+    if value not in CACHE_BACKENDS:
+        raise ValueError(value)
+    return value
+
+
+# Keys without an entry take any string.
+_PARSERS: dict[ConfigKey, Callable[[str], object]] = {
+    ConfigKey.HTTP_POOL_SIZE: int,
+    ConfigKey.HTTP_IDLE_TIMEOUT: float,
+    ConfigKey.HTTP_TIMEOUT: float,
+    ConfigKey.CACHE_FRESH_TTL: float,
+    ConfigKey.CACHE_STALE_WINDOW: float,
+    ConfigKey.CACHE_MAX_AGE: float,
+    ConfigKey.CACHE_BACKEND: _cache_backend,
+    ConfigKey.API_MAX_RETRIES: int,
+    ConfigKey.API_RATE_LIMIT: float,
+    ConfigKey.API_RATE_BURST: int,
+}
+
+
 def cmd_config(args: argparse.Namespace, cfg: Config) -> None:
     """Handle the 'config' command to view or set configuration defaults."""
     if args.key is None:
@@ -34,6 +70,13 @@ def cmd_config(args: argparse.Namespace, cfg: Config) -> None:
         display = value if value is not None else "(not set)"
         print(f"{config_key.value} = {display}")
     else:
+        parse = _PARSERS.get(config_key, str)
+        try:
+            parse(args.value)
+        except ValueError:
+            print(f"Invalid value for {config_key.value}: {args.value!r}")
+            print(f"    {_DESCRIPTIONS[config_key]}")
+            sys.exit(1)
         cfg.set(config_key, args.value)
         print(f"{config_key.value} = {args.value}")
 
@@ -0,0 +1,67 @@
+"""Daemon subcommand - serve CLI invocations from a warm background process."""
+
+import argparse
+import functools
+import sys
+
+from gtasks.client.client_factory import (
+    build_cached_client,
+    cache_backend,
+    cache_policy,
+    request_executor,
+    tasks_resource_provider,
+)
+from gtasks.defaults import CONFIG_FILE_PATH, DAEMON_SOCKET_PATH
+from gtasks.utils.config import Config
+
+
+def cmd_daemon(args: argparse.Namespace) -> None:
+    """Handle the 'daemon' command to run or stop the background daemon."""
+    from gtasks.cli import daemon
+
+    if args.stop:
+        if daemon.stop(DAEMON_SOCKET_PATH):
+            print("Daemon stopped.")
+        else:
+            print("No daemon is running.")
+        return
+
+    if daemon.is_running(DAEMON_SOCKET_PATH):
+        print("Error: a gtasks daemon is already running.")
+        sys.exit(1)
+
+    # Memoise the resource so cache reloads keep the same credentials and connections, and
+    # share one executor so they keep the same rate limit too.
+    cfg = Config(CONFIG_FILE_PATH)
+    service_provider = functools.cache(tasks_resource_provider(cfg))
+    print(f"gtasks daemon listening on {DAEMON_SOCKET_PATH} (Ctrl-C to stop)", flush=True)
+    daemon.serve(
+        DAEMON_SOCKET_PATH,
+        functools.partial(
+            build_cached_client,
+            service_provider,
+            cache_policy(cfg),
+            cache_backend(cfg),
+            request_executor(cfg),
+        ),
+        CONFIG_FILE_PATH,
+    )
+
+
+def add_subparser_daemon(subparsers) -> None:
+    """Add the 'daemon' subcommand to run or stop the background daemon."""
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Run a background daemon that keeps the client warm",
+        description=(
+            "Run in the foreground, serving other gtasks invocations over a Unix socket "
+            "from one warm client. gtasks falls back to running in-process when no "
+            "daemon is listening."
+        ),
+    )
+    daemon_parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon",
+    )
+    daemon_parser.set_defaults(func=cmd_daemon)
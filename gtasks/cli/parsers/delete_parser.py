@@ -6,6 +6,7 @@ from functools import partial
 
 from gtasks.cli.cli_utils import prompt_choose_tasklist_id, resolve_tasks_from_inputs
 from gtasks.client.api_client import ApiClient
+from gtasks.client.batch import BatchError
 from gtasks.utils.config import Config, ConfigKey
 
 
@@ -26,12 +27,23 @@ def cmd_delete(args: argparse.Namespace, client: ApiClient, cfg: Config) -> None
     if not tasks:
         return
 
-    deleted = client.delete_tasks(tasklist_id, tasks)
-    if len(deleted) == 1:
-        print(f"Deleted: {deleted[0].get('title', '?')}")
+    try:
+        deleted = client.delete_tasks(tasklist_id, tasks)
+    except BatchError as e:
+        # Report the tasks that went through; the error then reports the rest.
+        _print_deleted([r.item for r in e.results if r.ok])
+        raise
+    _print_deleted(deleted)
+
+
+def _print_deleted(tasks: list) -> None:
+    if not tasks:
+        return
+    if len(tasks) == 1:
+        print(f"Deleted: {tasks[0].get('title', '?')}")
     else:
         print("Deleted:")
-        for t in deleted:
+        for t in tasks:
             print(f"    {t.get('title', '?')}")
 
 
@@ -6,6 +6,7 @@ from functools import partial
 
 from gtasks.cli.cli_utils import prompt_choose_tasklist_id, resolve_tasks_from_inputs
 from gtasks.client.api_client import ApiClient
+from gtasks.client.batch import BatchError
 from gtasks.utils.config import Config, ConfigKey
 
 
@@ -26,12 +27,23 @@ def cmd_done(args: argparse.Namespace, client: ApiClient, cfg: Config) -> None:
     if not tasks:
         return
 
-    completed = client.complete_tasks(tasklist_id, tasks)
-    if len(completed) == 1:
-        print(f"Completed: {completed[0].get('title', '?')}")
+    try:
+        completed = client.complete_tasks(tasklist_id, tasks)
+    except BatchError as e:
+        # Report the tasks that went through; the error then reports the rest.
+        _print_completed([r.response for r in e.results if r.ok and r.response])
+        raise
+    _print_completed(completed)
+
+
+def _print_completed(tasks: list) -> None:
+    if not tasks:
+        return
+    if len(tasks) == 1:
+        print(f"Completed: {tasks[0].get('title', '?')}")
     else:
         print("Completed:")
-        for t in completed:
+        for t in tasks:
             print(f"    {t.get('title', '?')}")
 
 
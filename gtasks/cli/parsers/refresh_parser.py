@@ -1,6 +1,7 @@
-"""Refresh subcommand - force-clear and repopulate the tasklist cache."""
+"""Refresh subcommand - re-sync changed lists, or force-clear and repopulate the cache."""
 
 import argparse
+import sys
 from functools import partial
 
 from gtasks.client.api_client import ApiClient
@@ -12,15 +13,39 @@ def cmd_refresh(args: argparse.Namespace, client: ApiClient) -> None:
     if not isinstance(client, CachedApiClient):
         print("Caching is disabled; nothing to refresh.")
         return
-    tasklists = client.refresh_cache()
+    if args.all:
+        try:
+            tasklists = client.refresh_all(full=args.full, on_progress=_print_progress)
+        finally:
+            print(file=sys.stderr)  # end the progress line
+    else:
+        tasklists = client.refresh_cache(full=args.full)
     print(f"Cache refreshed: {len(tasklists)} task list(s) loaded.")
 
 
+def _print_progress(done: int, total: int) -> None:
+    print(f"\rFetching tasks: {done}/{total} list(s)", end="", file=sys.stderr, flush=True)
+
+
 def add_subparser_refresh(subparsers, client: ApiClient) -> None:
-    """Add the 'refresh' subcommand to force-clear and repopulate the cache."""
+    """Add the 'refresh' subcommand to re-sync or force-clear and repopulate the cache."""
     refresh_parser = subparsers.add_parser(
         "refresh",
         help="Refresh the task list cache",
-        description="Force-clears the local cache and repopulates it from the Google Tasks API.",
+        description=(
+            "Re-lists task lists from the Google Tasks API and re-syncs only the cached "
+            "lists that changed. Use --full to clear the local cache and repopulate it, and "
+            "--all to also fetch the tasks of every list, several lists at a time."
+        ),
+    )
+    refresh_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Clear the whole cache instead of re-syncing changed lists",
+    )
+    refresh_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Also fetch the tasks of every list not already cached, concurrently",
     )
     refresh_parser.set_defaults(func=partial(cmd_refresh, client=client))
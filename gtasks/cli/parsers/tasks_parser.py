@@ -2,6 +2,7 @@
 
 import argparse
 import sys
+from collections.abc import Iterable
 from functools import partial
 
 from gtasks.cli.cli_utils import print_tasks, prompt_choose_tasklist_id
@@ -18,7 +19,7 @@ def cmd_list_tasks(args: argparse.Namespace, client: ApiClient, cfg: Config) ->
         )
         sys.exit(1)
         return
-    tasks = []
+    tasks: Iterable = []
 
     matches = client.resolve_tasklist_from_title(tasklist_title)
 
@@ -27,7 +28,7 @@ def cmd_list_tasks(args: argparse.Namespace, client: ApiClient, cfg: Config) ->
         # TODO: "show completed" mode — fetch needsAction tasks here, then read
         # recently completed tasks from a local cache (populated by `gtasks done`)
         # to append as strikethrough, avoiding a second API call. Configurable via `gtasks config`.
-        tasks = client.get_tasks(id_, args.limit, show_completed=False)
+        tasks = client.iter_tasks(id_, args.limit, show_completed=False)
     else:
         print(f"Couldn't find a tasklist named {tasklist_title}")
 
@@ -1,26 +1,118 @@
+import copy
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from gtasks.client.batch import BatchError, ItemResult, run_batch
+from gtasks.client.retry import RequestExecutor
+from gtasks.client.single_flight import SingleFlight
+from gtasks.client.transport import HttpPool, authorized_http_pool
 
 if TYPE_CHECKING:
     from googleapiclient._apis.tasks.v1.resources import TasksResource
     from googleapiclient._apis.tasks.v1.schemas import Task, TaskList
 
 
+# Partial-response masks: only the fields the CLI and the caches read. Everything else
+# (selfLink, links, webViewLink, task etags, ...) is dropped server-side. Tasklists keep
+# their etag, cached per list next to updated in the tasklist metadata. Gzip is negotiated
+# by googleapiclient's JSON model, which sends Accept-Encoding: gzip on every request.
+TASK_FIELDS: tuple[str, ...] = (
+    "id",
+    "title",
+    "status",
+    "due",
+    "notes",
+    "parent",
+    "position",
+    "updated",
+    "completed",
+)
+TASKLIST_FIELDS: tuple[str, ...] = ("id", "title", "updated", "etag")
+# Delta syncs also need the flags marking tasks to drop from a cached list.
+TASK_DELTA_FIELDS: tuple[str, ...] = (*TASK_FIELDS, "deleted", "hidden")
+
+# Server-side caps on maxResults; always asking for a full page minimises round trips.
+MAX_TASKS_PAGE_SIZE = 100
+MAX_TASKLISTS_PAGE_SIZE = 1000
+
+
+class Listing(NamedTuple):
+    """A complete listing plus the collection ETag to revalidate it with, if usable."""
+
+    items: list[Any]
+    etag: str | None
+
+
 class Status(Enum):
     NEEDS_ACTION = "needsAction"
     COMPLETED = "completed"
 
 
 class ApiClient:
-    _service: TasksResource
+    """Client for the Tasks API. One instance may be shared by several threads."""
+
+    def __init__(
+        self,
+        service: TasksResource | None = None,
+        service_provider: Callable[[], TasksResource] | None = None,
+        executor: RequestExecutor | None = None,
+    ) -> None:
+        """Wrap a Tasks resource, or a provider that builds one on first use.
+
+        Passing a provider defers credential loading and discovery until a request
+        actually has to go to the API, so cache-only commands never pay for them.
+        Requests are sent through executor, which retries them and limits their rate;
+        by default they are retried without a rate limit.
+        """
+        if service is None and service_provider is None:
+            raise ValueError("Either a service or a service_provider is required")
+        self._service_instance: TasksResource | None = service
+        self._service_provider: Callable[[], TasksResource] | None = service_provider
+        self._executor = executor if executor is not None else RequestExecutor()
+        self._service_lock = threading.Lock()
+        # Discovery's default httplib2 transport is not thread-safe, while pagination
+        # prefetches, batches and callers' own threads send requests concurrently. Each
+        # request borrows a client of its own from this pool; a transport it cannot copy
+        # is shared under _io_lock instead.
+        self._http_pool: HttpPool | None = _http_pool(service) if service is not None else None
+        self._io_lock = threading.Lock()
+        # Identical GETs in flight at once (two threads missing the same list) go out once.
+        self._in_flight: SingleFlight[Any] = SingleFlight()
 
-    def __init__(self, service: TasksResource) -> None:
-        self._service = service
+    @property
+    def _service(self) -> TasksResource:
+        if self._service_instance is None:
+            with self._service_lock:
+                if self._service_instance is None:
+                    assert self._service_provider is not None
+                    service = self._service_provider()
+                    self._http_pool = _http_pool(service)
+                    self._service_instance = service
+        return self._service_instance
 
     def get_tasklists(self, max_results: int | None = None) -> list[TaskList]:
+        return list(self._iter_tasklists(max_results))
+
+    def iter_tasklists(self, max_results: int | None = None) -> Iterator[TaskList]:
+        """Yield tasklists as pages arrive, prefetching the next page in the background."""
+        return self._iter_tasklists(max_results)
+
+    def _iter_tasklists(self, max_results: int | None) -> Iterator[TaskList]:
         tasklists_resource: TasksResource.TasklistsResource = self._service.tasklists()
+        return self._iter_items(
+            {}, max_results, tasklists_resource, TASKLIST_FIELDS, MAX_TASKLISTS_PAGE_SIZE
+        )
 
-        return self._pagination_loop({}, max_results, tasklists_resource)
+    def list_tasklists_if_changed(self, etag: str | None = None) -> Listing | None:
+        """List all tasklists, or return None if they still match etag (HTTP 304)."""
+        tasklists_resource: TasksResource.TasklistsResource = self._service.tasklists()
+        return self._list_if_changed(
+            {}, tasklists_resource, TASKLIST_FIELDS, MAX_TASKLISTS_PAGE_SIZE, etag
+        )
 
     def resolve_tasklist_from_title(self, tasklist_title: str) -> list["TaskList"]:
         return [
@@ -40,7 +132,62 @@ class ApiClient:
         max_results: int | None = None,
         show_completed: bool = True,
         completed_min: str | None = None,
+        fields: Sequence[str] = TASK_FIELDS,
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
     ) -> list["Task"]:
+        return list(
+            self._iter_tasks(
+                tasklist_id,
+                max_results,
+                show_completed,
+                completed_min,
+                fields,
+                updated_min,
+                show_deleted,
+                show_hidden,
+            )
+        )
+
+    def iter_tasks(
+        self,
+        tasklist_id: str,
+        max_results: int | None = None,
+        show_completed: bool = True,
+        completed_min: str | None = None,
+        fields: Sequence[str] = TASK_FIELDS,
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
+    ) -> Iterator["Task"]:
+        """Yield tasks as pages arrive, prefetching the next page in the background.
+
+        Stops requesting pages once max_results items have been yielded or the consumer
+        stops iterating.
+        """
+        return self._iter_tasks(
+            tasklist_id,
+            max_results,
+            show_completed,
+            completed_min,
+            fields,
+            updated_min,
+            show_deleted,
+            show_hidden,
+        )
+
+    def _iter_tasks(
+        self,
+        tasklist_id: str,
+        max_results: int | None,
+        show_completed: bool,
+        completed_min: str | None,
+        fields: Sequence[str],
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
+    ) -> Iterator["Task"]:
         tasks_resource: TasksResource.TasksResource = self._service.tasks()
         kwargs_init: dict[str, Any] = {
             "tasklist": tasklist_id,
@@ -48,7 +195,48 @@ class ApiClient:
         }
         if completed_min is not None:
             kwargs_init["completedMin"] = completed_min
-        return self._pagination_loop(kwargs_init, max_results, tasks_resource)
+        if updated_min is not None:
+            kwargs_init["updatedMin"] = updated_min
+        if show_deleted:
+            kwargs_init["showDeleted"] = True
+        if show_hidden:
+            kwargs_init["showHidden"] = True
+        return self._iter_items(
+            kwargs_init, max_results, tasks_resource, fields, MAX_TASKS_PAGE_SIZE
+        )
+
+    def list_tasks_if_changed(
+        self,
+        tasklist_id: str,
+        etag: str | None = None,
+        fields: Sequence[str] = TASK_FIELDS,
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
+        show_completed: bool = True,
+        completed_min: str | None = None,
+        completed_max: str | None = None,
+    ) -> Listing | None:
+        """List all tasks matching the filters, or return None if they still match etag.
+
+        Completed tasks are included by default; completed_min and completed_max bound
+        their completion date.
+        """
+        tasks_resource: TasksResource.TasksResource = self._service.tasks()
+        kwargs_init: dict[str, Any] = {"tasklist": tasklist_id, "showCompleted": show_completed}
+        if completed_min is not None:
+            kwargs_init["completedMin"] = completed_min
+        if completed_max is not None:
+            kwargs_init["completedMax"] = completed_max
+        if updated_min is not None:
+            kwargs_init["updatedMin"] = updated_min
+        if show_deleted:
+            kwargs_init["showDeleted"] = True
+        if show_hidden:
+            kwargs_init["showHidden"] = True
+        return self._list_if_changed(
+            kwargs_init, tasks_resource, fields, MAX_TASKS_PAGE_SIZE, etag
+        )
 
     def add_task(
         self,
@@ -64,76 +252,211 @@ class ApiClient:
             task_body["due"] = due
 
         tasks_resource = self._service.tasks()
-        return tasks_resource.insert(tasklist=tasklist_id, body=task_body).execute()
+        # An insert that failed after reaching the server may have created the task.
+        return self._execute(
+            tasks_resource.insert(tasklist=tasklist_id, body=task_body), idempotent=False
+        )
 
     def complete_task(self, tasklist_id: str, task_id: str) -> "Task":
         tasks_resource = self._service.tasks()
-        return tasks_resource.patch(
-            tasklist=tasklist_id,
-            task=task_id,
-            body={"status": Status.COMPLETED.value},
-        ).execute()
+        return self._execute(
+            tasks_resource.patch(
+                tasklist=tasklist_id,
+                task=task_id,
+                body={"status": Status.COMPLETED.value},
+            )
+        )
 
     def complete_tasks(self, tasklist_id: str, tasks: list["Task"]) -> list["Task"]:
-        results: list[Task] = []
-        errors: list[Exception] = []
-
-        def _cb(request_id: str, response: "Task", exception: Exception | None) -> None:
-            if exception is not None:
-                errors.append(exception)
-            elif response:
-                results.append(response)
-
-        batch = self._service.new_batch_http_request(callback=_cb)
-        for task in tasks:
-            batch.add(
-                self._service.tasks().patch(
-                    tasklist=tasklist_id,
-                    task=task["id"],
-                    body={"status": Status.COMPLETED.value},
-                )
-            )
-        batch.execute()
-        if errors:
-            raise ExceptionGroup("batch complete_tasks failed", errors)
-        return results
+        """Complete tasks in batches and return the updated tasks.
+
+        Raises BatchError if any could not be completed; its results say which were.
+        """
+        results = self.run_batch(
+            tasks,
+            lambda task: self._service.tasks().patch(
+                tasklist=tasklist_id,
+                task=task["id"],
+                body={"status": Status.COMPLETED.value},
+            ),
+        )
+        _raise_failures("complete_tasks", results)
+        return [r.response for r in results if r.response]
 
     def delete_task(self, tasklist_id: str, task_id: str) -> None:
         tasks_resource = self._service.tasks()
-        tasks_resource.delete(tasklist=tasklist_id, task=task_id).execute()
+        self._execute(tasks_resource.delete(tasklist=tasklist_id, task=task_id))
 
     def delete_tasks(self, tasklist_id: str, tasks: list["Task"]) -> list["Task"]:
-        errors: list[Exception] = []
-
-        def _cb(request_id: str, response: object, exception: Exception | None) -> None:
-            if exception is not None:
-                errors.append(exception)
-
-        batch = self._service.new_batch_http_request(callback=_cb)
-        for task in tasks:
-            batch.add(self._service.tasks().delete(tasklist=tasklist_id, task=task["id"]))
-        batch.execute()
-        if errors:
-            raise ExceptionGroup("batch delete_tasks failed", errors)
-        return tasks
-
-    def _pagination_loop(
-        self, kwargs_init: dict[str, Any], max_results: int | None, listable_resource
-    ) -> list:
-        all_items: list[Task] = []
-        page_token: str | None = None
-        n: int | None = max_results
-
-        while True:
-            kwargs: dict[str, str] = kwargs_init
+        """Delete tasks in batches and return them.
+
+        Raises BatchError if any could not be deleted; its results say which were.
+        """
+        results = self.run_batch(
+            tasks,
+            lambda task: self._service.tasks().delete(tasklist=tasklist_id, task=task["id"]),
+        )
+        _raise_failures("delete_tasks", results)
+        return [r.item for r in results]
+
+    def run_batch[T](
+        self, items: Sequence[T], build_request: Callable[[T], Any]
+    ) -> list[ItemResult[T]]:
+        """Send one request per item in concurrent, size-capped batches (see batch.run_batch).
+
+        Returns each item's outcome in the order given, instead of raising on failures.
+        """
+        return run_batch(
+            items,
+            build_request,
+            self._service.new_batch_http_request,
+            self._execute,
+            on_throttled=self._executor.limiter.throttled if self._executor.limiter else None,
+        )
+
+    def _execute(self, request, cost: int = 1, idempotent: bool = True) -> Any:
+        """Send a request (or a batch of cost sub-requests), retrying transient failures.
+
+        A GET identical to one already in flight waits for that one's response instead.
+        """
+        key = _read_key(request)
+        if key is None:
+            return self._executor.execute(lambda: self._send(request), cost, idempotent)
+        response, shared = self._in_flight.do(
+            key, lambda: self._executor.execute(lambda: self._send(request), cost, idempotent)
+        )
+        # Each caller gets a response of its own to keep or modify.
+        return copy.deepcopy(response) if shared else response
+
+    def _send(self, request) -> Any:
+        if self._thread_safe_transport():
+            return request.execute()
+        import httplib2
+
+        try:
+            if self._http_pool is not None:
+                with self._http_pool.borrow() as http:
+                    return request.execute(http=http)
+            with self._io_lock:
+                return request.execute()
+        except httplib2.ServerNotFoundError as e:
+            # httplib2's DNS failure, raised as what RequestExecutor retries.
+            raise ConnectionError(str(e)) from e
+
+    def _thread_safe_transport(self) -> bool:
+        # Transports that can serve several threads at once say so (see PooledHttp).
+        return getattr(getattr(self._service, "_http", None), "thread_safe", False) is True
+
+    def _list_if_changed(
+        self,
+        kwargs_init: dict[str, Any],
+        listable_resource,
+        item_fields: Sequence[str],
+        max_page_size: int,
+        etag: str | None,
+    ) -> Listing | None:
+        """Fetch a full listing with a conditional first page.
+
+        The ETag is only kept for single-page listings, where it covers every item
+        returned; multi-page listings come back without one and are revalidated in full.
+        """
+        from googleapiclient.errors import HttpError
+
+        request = listable_resource.list(
+            **kwargs_init,
+            fields=f"etag,nextPageToken,items({','.join(item_fields)})",
+            maxResults=max_page_size,
+        )
+        if etag is not None:
+            request.headers["If-None-Match"] = etag
+        try:
+            response = self._execute(request)
+        except HttpError as e:
+            if etag is not None and e.resp.status == 304:
+                return None
+            raise
+
+        items = response.get("items", [])
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return Listing(items, response.get("etag"))
+        rest = self._iter_pages(
+            {**kwargs_init, "pageToken": page_token},
+            None,
+            listable_resource,
+            item_fields,
+            max_page_size,
+        )
+        return Listing([*items, *rest], None)
+
+    def _iter_items(
+        self,
+        kwargs_init: dict[str, Any],
+        max_results: int | None,
+        listable_resource,
+        item_fields: Sequence[str],
+        max_page_size: int,
+    ) -> Iterator:
+        items = self._iter_pages(
+            kwargs_init, max_results, listable_resource, item_fields, max_page_size
+        )
+        return islice(items, max_results) if max_results is not None else items
+
+    def _iter_pages(
+        self,
+        kwargs_init: dict[str, Any],
+        max_results: int | None,
+        listable_resource,
+        item_fields: Sequence[str],
+        max_page_size: int,
+    ) -> Iterator:
+        """Yield items page by page, fetching page N+1 while page N is consumed."""
+        fields = f"nextPageToken,items({','.join(item_fields)})"
+
+        def fetch(page_token: str | None, remaining: int | None) -> dict[str, Any]:
+            kwargs = {**kwargs_init, "fields": fields}
             if page_token is not None:
                 kwargs["pageToken"] = page_token
-            if n is not None:
-                kwargs["maxResults"] = n - len(all_items)
-            response = listable_resource.list(**kwargs).execute()
-            all_items.extend(response.get("items", []))
-            page_token = response.get("nextPageToken")
-            if not page_token or (n is not None and len(all_items) >= n):
-                break
-
-        return all_items[:n] if n is not None else all_items
+            kwargs["maxResults"] = (
+                max_page_size if remaining is None else min(remaining, max_page_size)
+            )
+            return self._execute(listable_resource.list(**kwargs))
+
+        remaining: int | None = max_results
+        response = fetch(None, remaining)
+        prefetcher: ThreadPoolExecutor | None = None
+        try:
+            while True:
+                items = response.get("items", [])
+                if remaining is not None:
+                    remaining -= len(items)
+                page_token = response.get("nextPageToken")
+                next_page: Future | None = None
+                if page_token and (remaining is None or remaining > 0):
+                    if prefetcher is None:
+                        prefetcher = ThreadPoolExecutor(max_workers=1)
+                    next_page = prefetcher.submit(fetch, page_token, remaining)
+                yield from items
+                if next_page is None:
+                    return
+                response = next_page.result()
+        finally:
+            if prefetcher is not None:
+                prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+def _http_pool(service: TasksResource) -> HttpPool | None:
+    return authorized_http_pool(getattr(service, "_http", None))
+
+
+def _read_key(request) -> tuple[str, str | None] | None:
+    """Identify a GET by what it fetches, or return None for any other request."""
+    if getattr(request, "method", None) != "GET":
+        return None  # writes and batches always go out
+    return request.uri, request.headers.get("If-None-Match")
+
+
+def _raise_failures(operation: str, results: list[ItemResult]) -> None:
+    failed = sum(1 for r in results if not r.ok)
+    if failed:
+        raise BatchError(f"batch {operation} failed for {failed} of {len(results)}", results)
@@ -0,0 +1,143 @@
+"""Chunked, concurrent execution of many independent API requests.
+
+googleapiclient's BatchHttpRequest sends any number of sub-requests as one multipart
+request, but a single batch is capped server-side and reports its outcome only through
+per-request callbacks. run_batch splits the work into chunks of at most batch_size
+sub-requests, sends up to max_workers chunks at once, and returns one ItemResult per item
+in input order. A single item is sent as a plain request, skipping the multipart round trip.
+
+execute is expected to retry what it sends itself (ApiClient's RequestExecutor does), so a
+plain request or a whole batch that fails is reported as it is. Only sub-requests that
+fail with a transient error (rate limited, 5xx) inside a successful batch, which execute
+never sees, are sent again, up to attempts times in all.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from gtasks.client.retry import is_rate_limited, is_transient
+
+# Sub-requests per batch. The batch endpoint refuses more than 1000, and smaller chunks
+# sent side by side finish sooner and lose less when one of them fails outright.
+MAX_BATCH_SIZE = 50
+MAX_CONCURRENT_BATCHES = 4
+# Rounds of sending failed sub-requests again, waiting RETRY_DELAY * 2**round before each.
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 0.5  # seconds
+
+
+class ItemResult[T](NamedTuple):
+    """Outcome of the sub-request for one item: its response, or the error it failed with."""
+
+    item: T
+    response: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchError(ExceptionGroup):
+    """Raised when some sub-requests of a batch failed.
+
+    results holds every item's outcome, so callers can act on the ones that succeeded.
+    """
+
+    def __new__(cls, message: str, results: Sequence[ItemResult]) -> BatchError:
+        self = super().__new__(cls, message, [r.error for r in results if r.error is not None])
+        self.results = list(results)
+        return self
+
+    def __init__(self, message: str, results: Sequence[ItemResult]) -> None:
+        super().__init__(message, [r.error for r in results if r.error is not None])
+
+
+def run_batch[T](
+    items: Sequence[T],
+    build_request: Callable[[T], Any],
+    new_batch: Callable[..., Any],
+    execute: Callable[..., Any],
+    batch_size: int = MAX_BATCH_SIZE,
+    max_workers: int = MAX_CONCURRENT_BATCHES,
+    attempts: int = MAX_ATTEMPTS,
+    on_throttled: Callable[[], None] | None = None,
+) -> list[ItemResult[T]]:
+    """Send one request per item and return each item's outcome, in the order given.
+
+    build_request turns an item into an unsent request, new_batch is the service's
+    new_batch_http_request, and execute(request, cost=n) sends a request or batch of n
+    sub-requests, retrying it as it sees fit, and returns its response. on_throttled is
+    called after each round in which a sub-request of a batch was rate limited; execute
+    accounts for rate limited requests it sees itself.
+    """
+    results: list[ItemResult[T]] = [ItemResult(item) for item in items]
+    pending = list(range(len(items)))
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+        chunks = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+        run_chunk = _chunk_runner(items, build_request, new_batch, execute)
+        if len(chunks) <= 1:
+            outcomes = [run_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                outcomes = list(pool.map(run_chunk, chunks))
+        resendable: list[int] = []
+        for outcome, in_batch in outcomes:
+            for i, result in outcome.items():
+                results[i] = result
+            resendable.extend(i for i in in_batch if results[i].error is not None)
+        if on_throttled is not None and any(
+            is_rate_limited(results[i].error) for i in resendable
+        ):
+            on_throttled()
+        pending = sorted(i for i in resendable if is_transient(results[i].error))
+        if not pending:
+            break
+    return results
+
+
+def _chunk_runner[T](
+    items: Sequence[T],
+    build_request: Callable[[T], Any],
+    new_batch: Callable[..., Any],
+    execute: Callable[..., Any],
+) -> Callable[[list[int]], tuple[dict[int, ItemResult[T]], list[int]]]:
+    """Return a function sending a chunk of item indices.
+
+    It returns each item's outcome, and the items whose outcome came from a sub-request
+    of a batch that was sent; only those may be sent again.
+    """
+
+    def run_chunk(chunk: list[int]) -> tuple[dict[int, ItemResult[T]], list[int]]:
+        if len(chunk) == 1:
+            (i,) = chunk
+            try:
+                return {i: ItemResult(items[i], execute(build_request(items[i])))}, []
+            except Exception as e:
+                return {i: ItemResult(items[i], error=e)}, []
+
+        outcome: dict[int, ItemResult[T]] = {}
+
+        def callback(request_id: str, response: Any, exception: Exception | None) -> None:
+            i = int(request_id)
+            outcome[i] = ItemResult(items[i], response, exception)
+
+        batch = new_batch(callback=callback)
+        for i in chunk:
+            batch.add(build_request(items[i]), request_id=str(i))
+        try:
+            execute(batch, cost=len(chunk))
+        except Exception as e:
+            # The batch itself failed after execute's own retries; sub-requests already
+            # answered keep their outcome.
+            answered = list(outcome)
+            for i in chunk:
+                outcome.setdefault(i, ItemResult(items[i], error=e))
+            return outcome, answered
+        return outcome, list(outcome)
+
+    return run_chunk
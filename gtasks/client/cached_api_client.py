@@ -1,39 +1,72 @@
 import sys
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TYPE_CHECKING, override
 
 from gtasks.utils.bidict_cache import BidictCache
-from gtasks.utils.tasks_cache import TasksCache
+from gtasks.utils.cache_policy import CachePolicy, Freshness
+from gtasks.utils.tasks_cache import ALL_HISTORY, TasksCache, api_timestamp
 
-from .api_client import ApiClient
+from .api_client import TASK_DELTA_FIELDS, TASK_FIELDS, ApiClient, Listing
+from .batch import BatchError, ItemResult
+from .retry import RequestExecutor
 
 if TYPE_CHECKING:
     from googleapiclient._apis.tasks.v1.resources import TasksResource
     from googleapiclient._apis.tasks.v1.schemas import Task, TaskList
 
+# Lists synced at once by refresh_all; each holds one pooled HTTP connection.
+MAX_CONCURRENT_SYNCS = 8
+
 
 class CachedApiClient(ApiClient):
     def __init__(
         self,
-        service: "TasksResource",
+        service: "TasksResource | None",
         title_id_cache: BidictCache[str, str],  # title <-> id tasklists
         tasks_cache: TasksCache,
+        service_provider: Callable[[], "TasksResource"] | None = None,
+        policy: CachePolicy | None = None,
+        executor: RequestExecutor | None = None,
+        background_revalidation: bool = True,
     ) -> None:
-        super().__init__(service)
+        """Without a policy, cached entries are served until written to or refreshed.
+
+        With one, stale entries are served and revalidated on a background thread. A
+        short-lived process passes background_revalidation=False so it can exit as soon as
+        its output is printed: stale entries are then marked for the next read to sync.
+        """
+        super().__init__(service, service_provider, executor)
         self._title_id_cache: BidictCache[str, str] = title_id_cache
         self._tasks_cache: TasksCache = tasks_cache
+        self._policy: CachePolicy | None = policy
+        # Guards both caches against background revalidation and callers sharing the
+        # client across threads. Never held across a request.
+        self._cache_lock = threading.RLock()
+        self._background_revalidation = background_revalidation
+        self._revalidations: dict[str, threading.Thread] = {}
 
     @override
     def get_tasklists(
         self,
         max_results: int | None = None,
     ) -> list["TaskList"]:
-        if self._title_id_cache:
+        with self._cache_lock:
+            cached = bool(self._title_id_cache)
+        if cached:
+            self._enforce_tasklists_policy()
+        with self._cache_lock:
             items = [{"title": t, "id": i} for t, i in self._title_id_cache.items()]
+        if items:
             return items[:max_results] if max_results is not None else items
 
         # Cache empty: fetch all from API and populate cache for future calls.
-        tasklists: list[TaskList] = super().get_tasklists(None)
-        self._title_id_cache.overwrite(self._dedup_by_title(tasklists, "tasklist"))
+        listing = self.list_tasklists_if_changed()
+        assert listing is not None  # unconditional without an etag
+        tasklists: list[TaskList] = listing.items
+        with self._cache_lock:
+            self._store_tasklists(listing)
         return tasklists[:max_results] if max_results is not None else tasklists
 
     @override
@@ -43,19 +76,219 @@ class CachedApiClient(ApiClient):
         max_results: int | None = None,
         show_completed: bool = True,
         completed_min: str | None = None,
+        fields: Sequence[str] = TASK_FIELDS,
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
     ) -> list["Task"]:
-        # Bypass cache for completed_min — rare, specific filter not worth caching.
+        # Bypass cache for updated_min — a rare, specific filter not worth caching; deleted
+        # and hidden tasks are never cached.
+        if updated_min is not None or show_deleted or show_hidden:
+            return super().get_tasks(
+                tasklist_id,
+                max_results,
+                show_completed,
+                completed_min,
+                fields,
+                updated_min,
+                show_deleted,
+                show_hidden,
+            )
+
         if completed_min is not None:
-            return super().get_tasks(tasklist_id, max_results, show_completed, completed_min)
+            completed_min = api_timestamp(completed_min)  # compared against cached timestamps
+        with self._cache_lock:
+            fresh = self._serve_from_cache(tasklist_id)
+        if not fresh:
+            self._sync_tasks(tasklist_id, full_history=show_completed and completed_min is None)
+        if show_completed:
+            self._load_history(tasklist_id, completed_min or ALL_HISTORY)
+        with self._cache_lock:
+            if show_completed and completed_min is not None:
+                # Like the API's completedMin, this matches completed tasks only; they come
+                # back in order of completion, found by binary search over the cache.
+                result = self._tasks_cache.completed_since(tasklist_id, completed_min) or []
+            else:
+                result = self._tasks_cache.get(tasklist_id, show_completed) or []
+        # Slice before copying: cached lists decode each task only when it is read.
+        return list(result[:max_results] if max_results is not None else result)
+
+    @override
+    def iter_tasks(
+        self,
+        tasklist_id: str,
+        max_results: int | None = None,
+        show_completed: bool = True,
+        completed_min: str | None = None,
+        fields: Sequence[str] = TASK_FIELDS,
+        updated_min: str | None = None,
+        show_deleted: bool = False,
+        show_hidden: bool = False,
+    ) -> Iterator["Task"]:
+        """Yield a list's tasks, streaming active ones from the API if the list is not cached.
+
+        Only the active listing is streamed: with completed tasks, the cached order (active
+        first, then by completion) differs from the API's, so those are read via get_tasks.
+        """
+        if show_completed or updated_min is not None or show_deleted or show_hidden:
+            return iter(
+                self.get_tasks(
+                    tasklist_id,
+                    max_results,
+                    show_completed,
+                    completed_min,
+                    fields,
+                    updated_min,
+                    show_deleted,
+                    show_hidden,
+                )
+            )
+
+        with self._cache_lock:
+            fresh = self._serve_from_cache(tasklist_id)
+            missing = not fresh and self._tasks_cache.sync_base(tasklist_id) is None
+        if missing:
+            return self._stream_active_tasks(tasklist_id, max_results)
+        if not fresh:
+            self._sync_tasks(tasklist_id)
+        with self._cache_lock:
+            result = self._tasks_cache.get(tasklist_id, show_completed=False) or []
+        return iter(list(result[:max_results] if max_results is not None else result))
+
+    def _stream_active_tasks(
+        self, tasklist_id: str, max_results: int | None
+    ) -> Iterator["Task"]:
+        """Yield active tasks as pages arrive, then cache the whole listing.
+
+        Pages past max_results are still fetched for the cache, once the caller asks for
+        more; a caller that stops early leaves the list uncached.
+        """
+        tasks: list[Task] = []
+        for task in super().iter_tasks(tasklist_id, show_completed=False):
+            tasks.append(task)
+            if max_results is None or len(tasks) <= max_results:
+                yield task
+        with self._cache_lock:
+            self._tasks_cache.set(tasklist_id, tasks, completed_min=None)
+
+    def _serve_from_cache(self, tasklist_id: str) -> bool:
+        """Return whether the cached list may be served as is; False means resync first."""
+        if not self._tasks_cache.is_fresh(tasklist_id):
+            return False
+        if self._policy is None:
+            return True
+        match self._policy.freshness(self._tasks_cache.fetched_at(tasklist_id)):
+            case Freshness.FRESH:
+                return True
+            case Freshness.STALE:
+                if self._background_revalidation:
+                    self._revalidate_in_background(tasklist_id, self._sync_tasks, tasklist_id)
+                else:
+                    self._tasks_cache.expire(tasklist_id)  # the next read syncs it
+                return True
+            case Freshness.MUST_REVALIDATE:
+                return False
+            case Freshness.EXPIRED:
+                self._tasks_cache.invalidate(tasklist_id)
+                return False
+
+    def _enforce_tasklists_policy(self) -> None:
+        if self._policy is None:
+            return
+        match self._policy.freshness(self._title_id_cache.fetched_at):
+            case Freshness.FRESH:
+                pass
+            case Freshness.STALE if self._background_revalidation:
+                self._revalidate_in_background("tasklists", self.sync_tasklists)
+            case Freshness.STALE:
+                with self._cache_lock:
+                    self._title_id_cache.expire()  # the next read syncs them
+            case Freshness.MUST_REVALIDATE | Freshness.EXPIRED:
+                self.sync_tasklists()
+
+    def _revalidate_in_background(self, key: str, fn: Callable[..., object], *args) -> None:
+        """Run fn on a background thread unless a revalidation for key is already running.
+
+        The thread is not a daemon thread, so an update under way is not cut short when the
+        interpreter exits.
+        """
+        with self._cache_lock:
+            running = self._revalidations.get(key)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._run_revalidation, args=(fn, *args), name=f"gtasks-revalidate-{key}"
+            )
+            self._revalidations[key] = thread
+        thread.start()
+
+    @staticmethod
+    def _run_revalidation(fn: Callable[..., object], *args) -> None:
+        try:
+            fn(*args)
+        except Exception:
+            pass  # the stale entry is kept; the next read past the window retries in line
+
+    def wait_for_revalidations(self, timeout: float | None = None) -> None:
+        """Block until background revalidations started so far have finished."""
+        for thread in list(self._revalidations.values()):
+            thread.join(timeout)
+
+    def _sync_tasks(self, tasklist_id: str, full_history: bool = False) -> Sequence["Task"]:
+        """Bring a missing or stale list up to date and return its cached tasks.
+
+        A missing list is filled with its active tasks only, one small listing however much
+        history it has, unless full_history asks for its completed tasks as well.
+        """
+        with self._cache_lock:
+            updated_min = self._tasks_cache.sync_base(tasklist_id)
+            etag = self._tasks_cache.etag(tasklist_id)
+        if updated_min is None:
+            listing = self.list_tasks_if_changed(tasklist_id, show_completed=full_history)
+            assert listing is not None  # unconditional without an etag
+            with self._cache_lock:
+                self._tasks_cache.set(
+                    tasklist_id,
+                    listing.items,
+                    listing.etag,
+                    completed_min=ALL_HISTORY if full_history else None,
+                )
+            return listing.items
 
-        cached = self._tasks_cache.get(tasklist_id)
-        if cached is None:
-            # Fetch all tasks once (completed + needsAction) so the cache serves all callers.
-            cached = super().get_tasks(tasklist_id, show_completed=True)
-            self._tasks_cache.set(tasklist_id, cached)
+        # Only tasks modified since the last sync; deleted and hidden ones come back
+        # flagged so the merge can drop them. If nothing changed since the last sync the
+        # API answers 304 and the cached list is reused as is.
+        delta = self.list_tasks_if_changed(
+            tasklist_id,
+            etag=etag,
+            fields=TASK_DELTA_FIELDS,
+            updated_min=updated_min,
+            show_deleted=True,
+            show_hidden=True,
+        )
+        with self._cache_lock:
+            if delta is None:
+                self._tasks_cache.revalidate(tasklist_id)
+                return self._tasks_cache.get(tasklist_id) or []
+            return self._tasks_cache.merge(tasklist_id, delta.items, delta.etag)
 
-        result = cached if show_completed else [t for t in cached if t.get("status") != "completed"]
-        return result[:max_results] if max_results is not None else result
+    def _load_history(self, tasklist_id: str, completed_min: str) -> None:
+        """Fetch the completed tasks back to completed_min that the cache does not hold."""
+        with self._cache_lock:
+            held = self._tasks_cache.history(tasklist_id)
+        if held is not None and held <= completed_min:
+            return
+        # Only the window not cached yet: completed since completed_min, before held.
+        listing = self.list_tasks_if_changed(
+            tasklist_id, completed_min=completed_min or None, completed_max=held
+        )
+        assert listing is not None  # unconditional without an etag
+        with self._cache_lock:
+            self._tasks_cache.add_history(tasklist_id, listing.items, completed_min)
+
+    @override
+    def iter_tasklists(self, max_results: int | None = None) -> Iterator["TaskList"]:
+        return iter(self.get_tasklists(max_results))
 
     @override
     def add_task(
@@ -66,40 +299,87 @@ class CachedApiClient(ApiClient):
         due: str | None = None,
     ) -> "Task":
         task = super().add_task(tasklist_id, title, notes, due)
-        self._tasks_cache.invalidate(tasklist_id)
+        self._write_through(tasklist_id, [task], expected=1)
         return task
 
     @override
     def complete_task(self, tasklist_id: str, task_id: str) -> "Task":
         task = super().complete_task(tasklist_id, task_id)
-        self._tasks_cache.invalidate(tasklist_id)
+        self._write_through(tasklist_id, [task], expected=1)
         return task
 
     @override
     def complete_tasks(self, tasklist_id: str, tasks: list["Task"]) -> list["Task"]:
         try:
-            return super().complete_tasks(tasklist_id, tasks)
-        finally:
-            self._tasks_cache.invalidate(tasklist_id)
+            completed = super().complete_tasks(tasklist_id, tasks)
+        except BatchError as e:
+            # Keep the completions that landed; a failed one may mean the list changed
+            # elsewhere (e.g. the task was deleted), so the list is resynced as well.
+            done = [r.response for r in e.results if r.ok and r.response]
+            self._write_through(tasklist_id, done, expected=len(done))
+            with self._cache_lock:
+                self._tasks_cache.mark_stale(tasklist_id)
+            raise
+        except BaseException:
+            # Some patches may have landed; let the next read resync the list.
+            with self._cache_lock:
+                self._tasks_cache.mark_stale(tasklist_id)
+            raise
+        self._write_through(tasklist_id, completed, expected=len(tasks))
+        return completed
 
     @override
     def delete_task(self, tasklist_id: str, task_id: str) -> None:
         super().delete_task(tasklist_id, task_id)
-        self._tasks_cache.invalidate(tasklist_id)
+        with self._cache_lock:
+            self._tasks_cache.remove(tasklist_id, [task_id])
 
     @override
     def delete_tasks(self, tasklist_id: str, tasks: list["Task"]) -> list["Task"]:
         try:
-            return super().delete_tasks(tasklist_id, tasks)
-        finally:
-            self._tasks_cache.invalidate(tasklist_id)
+            deleted = super().delete_tasks(tasklist_id, tasks)
+        except BatchError as e:
+            with self._cache_lock:
+                self._tasks_cache.remove(tasklist_id, [r.item["id"] for r in e.results if r.ok])
+                self._tasks_cache.mark_stale(tasklist_id)
+            raise
+        except BaseException:
+            with self._cache_lock:
+                self._tasks_cache.mark_stale(tasklist_id)
+            raise
+        with self._cache_lock:
+            self._tasks_cache.remove(tasklist_id, [t["id"] for t in deleted])
+        return deleted
+
+    def _write_through(self, tasklist_id: str, tasks: list["Task"], expected: int) -> None:
+        """Apply tasks returned by a write to the cache, resyncing if any are missing."""
+        returned = [t for t in tasks if t.get("id")]
+        with self._cache_lock:
+            if len(returned) != expected:
+                self._tasks_cache.mark_stale(tasklist_id)
+                return
+            self._tasks_cache.upsert(tasklist_id, returned)
 
     @override
     def resolve_task_from_title(self, title: str, tasklist_id: str) -> list["Task"]:
-        return [
-            t for t in self.get_tasks(tasklist_id)
-            if t.get("title", "").lower() == title.lower()
-        ]
+        """Return the tasks titled title (case-insensitively), active or completed.
+
+        The active tasks and whatever completed history is cached are searched first. Only
+        when neither holds a match is the rest of the history fetched, all of it, and
+        searched in turn.
+        """
+        with self._cache_lock:
+            fresh = self._serve_from_cache(tasklist_id)
+        if not fresh:
+            self._sync_tasks(tasklist_id)
+        with self._cache_lock:
+            matches = self._tasks_cache.find_by_title(tasklist_id, title) or []
+            complete = self._tasks_cache.history(tasklist_id) == ALL_HISTORY
+        if matches or complete:
+            return matches
+        self._load_history(tasklist_id, ALL_HISTORY)
+        with self._cache_lock:
+            return self._tasks_cache.find_by_title(tasklist_id, title) or []
 
     @staticmethod
     def _dedup_by_title(items: list[dict], label: str) -> dict[str, str]:
@@ -118,18 +398,126 @@ class CachedApiClient(ApiClient):
             deduped[title] = id_
         return deduped
 
-    def refresh_cache(self) -> list["TaskList"]:
-        """Force-clear and repopulate the tasklist cache from the API.
+    def sync_tasklists(self) -> list[str]:
+        """Re-list tasklists in one request and mark the task caches of changed lists stale.
+
+        A list counts as changed when its `updated` timestamp differs from the one cached
+        at the last listing, which includes lists seen for the first time. Task caches of
+        lists that no longer exist are dropped. Returns the ids of the changed lists.
+        """
+        with self._cache_lock:
+            previous = dict(self._title_id_cache.meta)
+            etag = self._title_id_cache.etag
+        listing = self.list_tasklists_if_changed(etag)
+
+        with self._cache_lock:
+            if listing is None:
+                # 304: no list was renamed, added, removed or modified.
+                self._title_id_cache.touch()
+                return []
+            self._store_tasklists(listing)
+            current = self._title_id_cache.meta
+
+            changed = [
+                list_id
+                for list_id, meta in current.items()
+                if previous.get(list_id, {}).get("updated") != meta.get("updated")
+            ]
+            for list_id in changed:
+                self._tasks_cache.mark_stale(list_id)
+            for list_id in previous.keys() - current.keys():
+                self._tasks_cache.invalidate(list_id)
+            return changed
+
+    def refresh_cache(self, full: bool = False) -> list["TaskList"]:
+        """Bring the caches up to date with the API.
+
+        By default this costs one tasklists request plus a delta sync of each cached list
+        that changed since the last listing. With full=True both caches are cleared and
+        the tasklist cache is repopulated from scratch.
 
-        # TODO: add a configurable auto-refresh cutoff (e.g. invalidate cache
-        # entries older than N hours) so callers don't need to invoke this
-        # explicitly when the cache is stale.
         # TODO: Add async functionality.
         """
-        self._tasks_cache.clear()
-        self._title_id_cache.clear()
+        if full:
+            with self._cache_lock:
+                self._tasks_cache.clear()
+                self._title_id_cache.clear()
+            return self.get_tasklists()
+
+        for list_id in self.sync_tasklists():
+            with self._cache_lock:
+                cached = self._tasks_cache.sync_base(list_id) is not None
+            if cached:
+                self.get_tasks(list_id, show_completed=False)
         return self.get_tasklists()
 
+    def refresh_all(
+        self,
+        full: bool = False,
+        max_workers: int = MAX_CONCURRENT_SYNCS,
+        on_progress: Callable[[int, int], None] | None = None,
+    ) -> list["TaskList"]:
+        """Refresh the tasklist index, then bring every list's tasks into the cache.
+
+        Lists that are missing or changed are synced concurrently, max_workers at a time,
+        and each is written to disk as soon as it arrives. on_progress(done, total) is
+        called after each list. With full=True both caches are cleared first.
+
+        Raises BatchError once the other lists are cached if any failed; its results say
+        which.
+        """
+        if full:
+            with self._cache_lock:
+                self._tasks_cache.clear()
+                self._title_id_cache.clear()
+            self.get_tasklists()
+        else:
+            self.sync_tasklists()
+        with self._cache_lock:
+            pending = [
+                list_id
+                for list_id in self._title_id_cache.values()
+                if not self._tasks_cache.is_fresh(list_id)
+            ]
+
+        def sync(tasklist_id: str) -> Sequence["Task"]:
+            tasks = self._sync_tasks(tasklist_id)
+            with self._cache_lock:
+                self._tasks_cache.flush()  # don't wait for the command's write-back
+            return tasks
+
+        results: dict[str, ItemResult[str]] = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        try:
+            futures = {pool.submit(sync, tasklist_id): tasklist_id for tasklist_id in pending}
+            for future in as_completed(futures):
+                tasklist_id = futures[future]
+                error = future.exception()
+                results[tasklist_id] = ItemResult(
+                    tasklist_id, None if error else future.result(), error
+                )
+                if on_progress is not None:
+                    on_progress(len(results), len(pending))
+        finally:
+            # On Ctrl-C, drop the lists not started yet instead of waiting for them.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        ordered = [results[tasklist_id] for tasklist_id in pending]
+        failed = sum(1 for r in ordered if not r.ok)
+        if failed:
+            raise BatchError(f"refresh failed for {failed} of {len(ordered)} lists", ordered)
+        return self.get_tasklists()
+
+    def _store_tasklists(self, listing: Listing) -> None:
+        meta = {
+            tl["id"]: {k: tl[k] for k in ("updated", "etag") if k in tl}
+            for tl in listing.items
+            if tl.get("id")
+        }
+        self._title_id_cache.overwrite(
+            self._dedup_by_title(listing.items, "tasklist"), meta, listing.etag
+        )
+
     @override
     def resolve_tasklist_from_title(
         self,
@@ -137,12 +525,12 @@ class CachedApiClient(ApiClient):
     ) -> list["TaskList"]:
         """Resolve a tasklist title to a list of matching TaskList dicts using the cache.
 
-        Populates the cache via get_tasklists() if it is empty.
+        Populates the cache via get_tasklists() if it is empty or due for revalidation.
         Returns a single-element list on a hit, or an empty list on a miss.
         """
-        if not self._title_id_cache:
-            self.get_tasklists()
-        try:
-            return [{"title": tasklist_title, "id": self._title_id_cache[tasklist_title]}]
-        except KeyError:
+        self.get_tasklists()  # populates the cache, or applies the policy to it
+        with self._cache_lock:
+            tasklist_id = self._title_id_cache.get(tasklist_title)
+        if tasklist_id is None:
             return []
+        return [{"title": tasklist_title, "id": tasklist_id}]
@@ -1,21 +1,44 @@
-"""Factory functions for building API clients and services."""
+"""Factory functions for building API clients and services.
 
+google-auth, google_auth_oauthlib and googleapiclient are imported inside the functions
+that need them: they dominate CLI startup, and cache-only commands never touch them.
+"""
+
+import functools
 import pickle
+import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-
 from gtasks.client.api_client import ApiClient
 from gtasks.client.cached_api_client import CachedApiClient
-from gtasks.defaults import APP_CFG_PATH, CACHE_FILE_PATH, TASKS_CACHE_DIR_PATH
+from gtasks.client.retry import RateLimiter, RequestExecutor
+from gtasks.client.transport import Transport, pooled_transport
+from gtasks.defaults import (
+    API_MAX_RETRIES,
+    API_RATE_BURST,
+    API_RATE_LIMIT,
+    APP_CFG_PATH,
+    CACHE_BACKEND,
+    CACHE_BACKENDS,
+    CACHE_DB_PATH,
+    CACHE_FILE_PATH,
+    CACHE_FRESH_TTL,
+    CACHE_MAX_AGE,
+    CACHE_STALE_WINDOW,
+    HTTP_IDLE_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    TASKS_CACHE_DIR_PATH,
+)
 from gtasks.utils.bidict_cache import BidictCache
+from gtasks.utils.cache_policy import CachePolicy
+from gtasks.utils.config import Config, ConfigKey
 from gtasks.utils.tasks_cache import TasksCache
 
 if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
     from googleapiclient._apis.tasks.v1.resources import TasksResource
 
 
@@ -25,23 +48,124 @@ SCOPES: list[str] = ["https://www.googleapis.com/auth/tasks"]
 def build_tasks_resource(
     token_path: Path = APP_CFG_PATH / "token.pickle",
     creds_path: Path = APP_CFG_PATH / "credentials.json",
+    transport: Transport | None = None,
 ) -> "TasksResource":
-    """Build and return a Google Tasks API resource."""
-    creds: Credentials = auth_from_file(token_path, creds_path)
-    return build("tasks", "v1", credentials=creds)
+    """Build and return a Google Tasks API resource.
 
+    Without a transport, discovery's default per-resource httplib2 client is used.
+    """
+    from googleapiclient.discovery import build
 
-def build_cached_client() -> CachedApiClient:
-    tasklists_cache: BidictCache[str, str] = BidictCache(CACHE_FILE_PATH)
-    tasks_cache = TasksCache(TASKS_CACHE_DIR_PATH)
-    return CachedApiClient(build_tasks_resource(), tasklists_cache, tasks_cache)
+    creds: Credentials = auth_from_file(token_path, creds_path)
+    if transport is None:
+        return build("tasks", "v1", credentials=creds)
+    return build("tasks", "v1", http=transport(creds))
+
+
+def tasks_resource_provider(cfg: Config) -> Callable[[], "TasksResource"]:
+    """Return a provider building the Tasks resource over a pooled transport sized by cfg."""
+    transport = pooled_transport(
+        pool_size=_setting(cfg.get_int, ConfigKey.HTTP_POOL_SIZE, HTTP_POOL_SIZE),
+        idle_timeout=_setting(cfg.get_float, ConfigKey.HTTP_IDLE_TIMEOUT, HTTP_IDLE_TIMEOUT),
+        timeout=_setting(cfg.get_float, ConfigKey.HTTP_TIMEOUT, HTTP_TIMEOUT),
+    )
+    return functools.partial(build_tasks_resource, transport=transport)
+
+
+def cache_policy(cfg: Config) -> CachePolicy:
+    return CachePolicy(
+        fresh_ttl=_setting(cfg.get_float, ConfigKey.CACHE_FRESH_TTL, CACHE_FRESH_TTL),
+        stale_window=_setting(cfg.get_float, ConfigKey.CACHE_STALE_WINDOW, CACHE_STALE_WINDOW),
+        max_age=_setting(cfg.get_float, ConfigKey.CACHE_MAX_AGE, CACHE_MAX_AGE),
+    )
+
+
+def cache_backend(cfg: Config) -> str:
+    backend = cfg.get(ConfigKey.CACHE_BACKEND)
+    if backend is None:
+        return CACHE_BACKEND
+    if backend not in CACHE_BACKENDS:
+        _warn(f"Invalid value for {ConfigKey.CACHE_BACKEND.value}: {backend!r}", CACHE_BACKEND)
+        return CACHE_BACKEND
+    return backend
+
+
+def request_executor(cfg: Config) -> RequestExecutor:
+    """Return an executor retrying and rate limiting requests as configured in cfg."""
+    limiter = RateLimiter(
+        rate=_setting(cfg.get_float, ConfigKey.API_RATE_LIMIT, API_RATE_LIMIT),
+        burst=_setting(cfg.get_int, ConfigKey.API_RATE_BURST, API_RATE_BURST),
+    )
+    return RequestExecutor(
+        max_retries=_setting(cfg.get_int, ConfigKey.API_MAX_RETRIES, API_MAX_RETRIES),
+        limiter=limiter,
+    )
+
+
+def _setting[T](get: Callable[[ConfigKey, T], T], key: ConfigKey, default: T) -> T:
+    """Read key with get, falling back to default (with a warning) if it does not parse.
+
+    A hand-edited config file must not stop every command, `gtasks config` included.
+    """
+    try:
+        return get(key, default)
+    except ValueError as e:
+        _warn(str(e), default)
+        return default
+
+
+def _warn(problem: str, default: object) -> None:
+    print(f"Warning: {problem}; using {default!r}", file=sys.stderr)
+
+
+def build_cached_client(
+    service_provider: Callable[[], "TasksResource"] = build_tasks_resource,
+    policy: CachePolicy | None = None,
+    backend: str = CACHE_BACKEND,
+    executor: RequestExecutor | None = None,
+    background_revalidation: bool = True,
+) -> CachedApiClient:
+    """Build a cached client whose Tasks resource is only built on the first API call.
+
+    backend is "json" (one file per cache entry) or "sqlite" (a single database).
+    """
+    tasklists_cache, tasks_cache = _build_caches(backend)
+    return CachedApiClient(
+        None,
+        tasklists_cache,
+        tasks_cache,
+        service_provider=service_provider,
+        policy=policy,
+        executor=executor,
+        background_revalidation=background_revalidation,
+    )
+
+
+def _build_caches(backend: str) -> tuple[BidictCache[str, str], TasksCache]:
+    tasklists_cache: BidictCache[str, str]
+    tasks_cache: TasksCache
+    if backend == "json":
+        tasklists_cache = BidictCache(CACHE_FILE_PATH)
+        tasks_cache = TasksCache(TASKS_CACHE_DIR_PATH)
+    elif backend == "sqlite":
+        from gtasks.utils.sqlite_cache import SqliteBidictCache, SqliteStore, SqliteTasksCache
+
+        store = SqliteStore(CACHE_DB_PATH)
+        tasklists_cache = SqliteBidictCache(store)
+        tasks_cache = SqliteTasksCache(store)
+    else:
+        raise ValueError(f"Invalid value for {ConfigKey.CACHE_BACKEND.value}: {backend!r}")
+    return tasklists_cache, tasks_cache
 
 
-def build_client() -> ApiClient:
-    return ApiClient(build_tasks_resource())
+def build_client(executor: RequestExecutor | None = None) -> ApiClient:
+    return ApiClient(service_provider=build_tasks_resource, executor=executor)
 
 
 def auth(token_path: Path, client_id: str, client_secret: str) -> Credentials:
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds: Credentials | None = None
 
     if token_path.exists():
@@ -76,6 +200,9 @@ def auth_from_file(
     token_path: Path,
     creds_path: Path,
 ) -> Credentials:
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds: Credentials | None = None
 
     if token_path.exists():
@@ -0,0 +1,200 @@
+"""Retries with backoff, and client-side rate limiting, for API requests.
+
+Every request ApiClient sends (single calls, pagination and batches alike) goes through a
+RequestExecutor. It waits for a RateLimiter token, sends the request, and on a transient
+failure (rate limited, 5xx, a dropped connection) sends it again after a jittered
+exponential backoff, or after the delay the server asked for in Retry-After. Rate limited
+requests also halve the limiter's rate, which then creeps back up with each success
+(AIMD), so a burst that hits the per-user quota slows every later request instead of just
+the one that failed.
+
+Google APIs report an exceeded quota as a 429, or as a 403 whose reason is
+rateLimitExceeded or userRateLimitExceeded; both count as rate limited. Any other 403 is
+a real refusal and is not retried.
+
+Requests that are not idempotent, such as inserts, are only retried when rate limited: a
+rate limited request was rejected before it ran, while any other failure may have
+happened after the task was created.
+"""
+
+import json
+import random
+import threading
+import time
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+
+_TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+_TOO_MANY_REQUESTS = 429
+_FORBIDDEN = 403
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+# AIMD: each rate limited request halves the rate, down to _MIN_RATE_FACTOR of the
+# configured one; each success adds back _RECOVERY_FACTOR of it.
+_DECREASE_FACTOR = 0.5
+_MIN_RATE_FACTOR = 0.05
+_RECOVERY_FACTOR = 0.05
+
+_EPSILON = 1e-9
+
+
+class RateLimiter:
+    """Token bucket holding up to burst tokens, refilled at rate tokens per second.
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._max_rate = rate
+        self.rate = rate
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: int = 1) -> None:
+        """Block until cost tokens are available, then take them.
+
+        A cost above the burst size waits for a full bucket and leaves it in debt.
+        """
+        while (wait := self._take(cost)) > 0:
+            time.sleep(wait)
+
+    def _take(self, cost: int) -> float:
+        """Take cost tokens and return 0, or return how long to wait before trying again."""
+        if self._max_rate <= 0:
+            return 0
+        with self._lock:
+            self._refill()
+            needed = min(cost, self._burst)
+            if self._tokens >= needed - _EPSILON:  # refills accrue rounding error
+                self._tokens -= cost
+                return 0
+            return (needed - self._tokens) / self.rate
+
+    def throttled(self) -> None:
+        """Record a rate limited request: halve the rate and empty the bucket."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self._max_rate * _MIN_RATE_FACTOR, self.rate * _DECREASE_FACTOR)
+            self._tokens = min(self._tokens, 0.0)
+
+    def succeeded(self) -> None:
+        """Record a success, raising the rate back towards the configured one."""
+        with self._lock:
+            self.rate = min(self._max_rate, self.rate + self._max_rate * _RECOVERY_FACTOR)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RequestExecutor:
+    """Sends requests through a shared RateLimiter, retrying transient failures.
+
+    A request is sent at most max_retries + 1 times. The nth retry waits a random time of
+    up to base_delay * 2**n seconds, capped at max_delay, unless the server's Retry-After
+    says otherwise; a Retry-After longer than max_delay is not waited for.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 32.0,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.limiter = limiter
+
+    def execute[T](self, send: Callable[[], T], cost: int = 1, idempotent: bool = True) -> T:
+        """Call send until it succeeds or fails for good.
+
+        cost is the number of API calls it makes (a batch makes one per sub-request).
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(cost)
+            try:
+                response = send()
+            except Exception as e:
+                delay = self._retry_delay(attempt, e, idempotent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if self.limiter is not None:
+                self.limiter.succeeded()
+            return response
+
+    def _retry_delay(self, attempt: int, error: Exception, idempotent: bool) -> float | None:
+        """Record a failed attempt and return how long to wait before the next, or None."""
+        rate_limited = is_rate_limited(error)
+        if self.limiter is not None and rate_limited:
+            self.limiter.throttled()
+        retryable = is_transient(error) if idempotent else rate_limited
+        if not retryable or attempt >= self.max_retries:
+            return None
+        return self._delay(attempt, error)
+
+    def _delay(self, attempt: int, error: Exception) -> float | None:
+        requested = retry_after(error)
+        if requested is not None:
+            return requested if requested <= self._max_delay else None
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2**attempt))
+
+
+def is_transient(error: BaseException | None) -> bool:
+    """Return whether a request that failed with error may succeed if sent again."""
+    status = status_of(error)
+    if status is not None:
+        return status in _TRANSIENT_STATUSES or is_rate_limited(error)
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def is_rate_limited(error: BaseException | None) -> bool:
+    """Return whether an API error is a request rejected for exceeding a rate quota."""
+    status = status_of(error)
+    if status == _TOO_MANY_REQUESTS:
+        return True
+    return status == _FORBIDDEN and bool(_error_reasons(error) & _RATE_LIMIT_REASONS)
+
+
+def _error_reasons(error: BaseException | None) -> set[str]:
+    # The reasons in the body's {"error": {"errors": [{"reason": ...}]}}.
+    try:
+        errors = json.loads(getattr(error, "content", b""))["error"]["errors"]
+        return {e["reason"] for e in errors if isinstance(e, dict) and "reason" in e}
+    except (ValueError, KeyError, TypeError):
+        return set()
+
+
+def status_of(error: BaseException | None) -> int | None:
+    """Return the HTTP status of an API error, or None for any other exception."""
+    from googleapiclient.errors import HttpError
+
+    return error.resp.status if isinstance(error, HttpError) else None
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Return the seconds an API error's Retry-After header asks to wait, if it has one."""
+    from googleapiclient.errors import HttpError
+
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
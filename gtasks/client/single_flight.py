@@ -0,0 +1,39 @@
+"""Coalescing of identical calls made concurrently from several threads."""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+
+class SingleFlight[T]:
+    """Runs at most one call per key at a time, sharing its outcome with concurrent callers.
+
+    The first caller for a key runs fn. Callers that arrive with the same key while it runs
+    wait for it instead and get its result, or its exception. The key is forgotten once
+    the call finishes, so later callers run fn again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Return fn's result, and whether it came from a call another caller started."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+        call.set_result(result)
+        return result, False
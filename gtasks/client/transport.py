@@ -0,0 +1,142 @@
+"""Pluggable HTTP transports for the Tasks discovery resource.
+
+A transport is a callable taking credentials and returning an httplib2.Http-compatible
+object, which build_tasks_resource hands to discovery. Every request the resource makes,
+batch requests included, then goes through that object.
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httplib2
+    from google.auth.credentials import Credentials
+
+type Transport = Callable[["Credentials"], Any]
+
+
+class PooledHttp:
+    """httplib2.Http-compatible adapter over a keep-alive AuthorizedSession pool.
+
+    Connections are reused across every request in the process instead of paying DNS, TCP
+    and TLS setup per call. Connections idle for longer than idle_timeout are dropped
+    before the next request rather than risking a reset from the server side.
+
+    Unlike httplib2.Http, one instance can serve several threads at once, so ApiClient
+    sends requests over it without serialising them. Connection failures and timeouts are
+    raised as the builtin ConnectionError and TimeoutError, which RequestExecutor retries.
+    timeout bounds both connecting and each wait for data, as httplib2's socket timeout did.
+    """
+
+    thread_safe = True
+
+    def __init__(
+        self, credentials: Credentials, pool_size: int, idle_timeout: float, timeout: float
+    ) -> None:
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+
+        self.credentials = credentials  # googleapiclient reads this to authorize batches
+        self._session = AuthorizedSession(credentials)
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: str | bytes | None = None,
+        headers: dict[str, str] | None = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> tuple[httplib2.Response, bytes]:
+        import httplib2
+        import requests
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_used > self._idle_timeout:
+                self._session.close()  # drops pooled connections; new ones open on demand
+            self._last_used = now
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            response = self._session.request(
+                method,
+                uri,
+                data=body,
+                headers=headers,
+                allow_redirects=redirections > 0,
+                timeout=self._timeout,
+            )
+        except requests.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            raise ConnectionError(str(e)) from e
+
+        info: dict[str, str] = {k.lower(): v for k, v in response.headers.items()}
+        info["status"] = str(response.status_code)
+        # requests already decoded the body; mirror httplib2, which hides the encoding.
+        if "content-encoding" in info:
+            info["-content-encoding"] = info.pop("content-encoding")
+            info["content-length"] = str(len(response.content))
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def pooled_transport(pool_size: int, idle_timeout: float, timeout: float) -> Transport:
+    return functools.partial(
+        PooledHttp, pool_size=pool_size, idle_timeout=idle_timeout, timeout=timeout
+    )
+
+
+class HttpPool:
+    """Lends each concurrent request an httplib2 client of its own.
+
+    httplib2.Http, which discovery uses when no transport is given, keeps one connection
+    per host and must not be used by two threads at once. A request borrows an idle client
+    for its duration, or a new one from new_http when all are busy, and returns it after,
+    so connections are reused and only as many clients exist as requests ever overlapped.
+    """
+
+    def __init__(self, new_http: Callable[[], Any], idle: list[Any] | None = None) -> None:
+        self._new_http = new_http
+        self._idle: list[Any] = list(idle or [])
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def borrow(self) -> Iterator[Any]:
+        with self._lock:
+            http = self._idle.pop() if self._idle else None
+        if http is None:
+            http = self._new_http()
+        try:
+            yield http
+        finally:
+            with self._lock:
+                self._idle.append(http)
+
+
+def authorized_http_pool(http: Any) -> HttpPool | None:
+    """Return a pool of copies of discovery's authorized httplib2 client, seeded with it.
+
+    Returns None for any other transport, which has to be shared under a lock instead.
+    """
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.http import build_http
+
+    if not isinstance(http, AuthorizedHttp):
+        return None
+    return HttpPool(lambda: AuthorizedHttp(http.credentials, http=build_http()), idle=[http])
@@ -9,3 +9,23 @@ CONFIG_FILE_NAME: str = "config.toml"
 CACHE_FILE_PATH: Path = APP_CFG_PATH / CACHE_FILE_NAME
 CONFIG_FILE_PATH: Path = APP_CFG_PATH / CONFIG_FILE_NAME
 TASKS_CACHE_DIR_PATH: Path = APP_CFG_PATH / "tasks"
+CACHE_DB_PATH: Path = APP_CFG_PATH / "cache.sqlite3"
+DAEMON_SOCKET_PATH: Path = APP_CFG_PATH / "daemon.sock"
+
+HTTP_POOL_SIZE: int = 10
+HTTP_IDLE_TIMEOUT: float = 60.0  # seconds
+HTTP_TIMEOUT: float = 60.0  # seconds, httplib2's default socket timeout in discovery
+
+# Cache policy, in seconds: fresh for a minute, then served stale (and revalidated in the
+# background) for up to 15 more; anything older than a week is refetched in full.
+CACHE_FRESH_TTL: float = 60.0
+CACHE_STALE_WINDOW: float = 900.0
+CACHE_MAX_AGE: float = 7 * 24 * 60 * 60.0
+CACHE_BACKENDS: tuple[str, ...] = ("json", "sqlite")
+CACHE_BACKEND: str = "json"
+
+# Requests are retried up to API_MAX_RETRIES times and paced at API_RATE_LIMIT per second,
+# with bursts of up to API_RATE_BURST, to stay under the per-user quota.
+API_MAX_RETRIES: int = 5
+API_RATE_LIMIT: float = 10.0
+API_RATE_BURST: int = 20
@@ -0,0 +1,86 @@
+"""Crash- and concurrency-safe file writes, and advisory locks shared between processes."""
+
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: locking degrades to in-process only
+    fcntl = None
+
+
+def atomic_write(path: Path, data: bytes | str) -> None:
+    """Replace path with data so readers see either the old file or the new one, never part.
+
+    The data is written to a temporary file in the same directory, flushed to disk and
+    renamed over path.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class FileLock:
+    """Reader/writer lock on a lock file, shared by every process that opens the same path.
+
+    Holds are reentrant within a process: nested holds reuse the outer one, and an
+    exclusive hold inside a shared one upgrades it for its duration. Threads in the same
+    process are serialised, since flock() cannot tell them apart.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._thread_lock = threading.RLock()
+        self._fd: int | None = None
+        self._depth = 0
+        self._exclusive = False
+
+    def shared(self):
+        """Hold the lock for reading; other readers may hold it at the same time."""
+        return self._hold(exclusive=False)
+
+    def exclusive(self):
+        """Hold the lock for writing, excluding every other reader and writer."""
+        return self._hold(exclusive=True)
+
+    @contextmanager
+    def _hold(self, exclusive: bool) -> Iterator[None]:
+        with self._thread_lock:
+            upgraded = False
+            if self._depth == 0:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+                self._flock(exclusive)
+                self._exclusive = exclusive
+            elif exclusive and not self._exclusive:
+                self._flock(exclusive=True)
+                self._exclusive = upgraded = True
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    os.close(self._fd)  # releases the lock
+                    self._fd = None
+                elif upgraded:
+                    self._flock(exclusive=False)
+                    self._exclusive = False
+
+    def _flock(self, exclusive: bool) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
@@ -1,9 +1,14 @@
 import json
+import time
 from pathlib import Path
+from typing import Any
 
 from bidict import bidict
 from bidict._exc import DuplicationError
 
+from gtasks.utils import write_back
+from gtasks.utils.atomic_io import FileLock, atomic_write
+
 
 class BidictCache[K, V](bidict[K, V]):
     ERR_PARSE_JSON = "Failure parsing cached JSON"
@@ -11,32 +16,99 @@ class BidictCache[K, V](bidict[K, V]):
 
     def __init__(self, cache_path: Path | None = None) -> None:
         super().__init__()
+        # Per-value metadata (e.g. a tasklist's `updated` and `etag`), plus the ETag and
+        # fetch time of the listing the items came from, persisted in a {stem}.meta.json
+        # sidecar so the bidict file itself keeps its plain format.
+        self.meta: dict[V, dict[str, Any]] = {}
+        self.etag: str | None = None
+        self.fetched_at: float | None = None
+        # Content hash of each file as last read or written, to skip unchanged rewrites.
+        self._digests: dict[Path, str] = {}
+        self._dirty = False
 
         # conditional necessary to avoid sub/superclass initialization errors
         if cache_path is not None:
             self._cache_path: Path = cache_path.expanduser()
+            # Other gtasks processes may rewrite the files while this one reads them.
+            self._lock = FileLock(self._cache_path.with_name(f".{self._cache_path.stem}.lock"))
             self.load()
 
-    def overwrite(self, items: dict[K, V]) -> None:
+    def overwrite(
+        self,
+        items: dict[K, V],
+        meta: dict[V, dict[str, Any]] | None = None,
+        etag: str | None = None,
+    ) -> None:
         """Replace in-memory state and persist to disk."""
         self.clear()
         self.update(items)
+        self.meta = {v: m for v, m in (meta or {}).items() if v in self.inv}
+        self.etag = etag
+        self.fetched_at = time.time()
         self._save()
 
+    def touch(self) -> None:
+        """Record that the items were just confirmed current, without rewriting them."""
+        self.fetched_at = time.time()
+        self._save_meta()
+
+    def expire(self) -> None:
+        """Make the items due for revalidation on their next use, without dropping them."""
+        self.fetched_at = None
+        self._save_meta()
+
     def load(self):
+        with self._lock.shared():
+            self._load()
+
+    def _load(self) -> None:
         if not self._cache_path.exists():
             self.clear()
             return
 
         try:
-            with self._cache_path.open(mode="r", encoding="utf-8") as f:
-                self.update(json.load(fp=f))
+            text = self._cache_path.read_text(encoding="utf-8")
+            self.update(json.loads(text))
+            self._digests[self._cache_path] = write_back.digest(text)
         except (json.JSONDecodeError, OSError, TypeError) as e:
             raise ValueError(self.ERR_PARSE_JSON) from e
         except DuplicationError as e:
             raise ValueError(self.ERR_DUPLICATE_KEY_VALUE) from e
 
+        # Metadata is advisory: a missing or corrupt sidecar only costs a refetch.
+        try:
+            text = self._meta_path().read_text(encoding="utf-8")
+            sidecar = json.loads(text)
+            self._digests[self._meta_path()] = write_back.digest(text)
+            self.meta = {v: m for v, m in sidecar["meta"].items() if v in self.inv}
+            self.etag = sidecar.get("etag")
+            self.fetched_at = sidecar.get("fetched_at")
+        except (json.JSONDecodeError, OSError, AttributeError, KeyError, TypeError):
+            self.meta, self.etag, self.fetched_at = {}, None, None
+
+    def flush(self) -> None:
+        """Write the items and sidecar if they changed since they were last written."""
+        if not self._dirty:
+            return
+        sidecar = {"etag": self.etag, "fetched_at": self.fetched_at, "meta": self.meta}
+        with self._lock.exclusive():
+            self._write_file(self._cache_path, json.dumps(dict(self), ensure_ascii=False))
+            self._write_file(self._meta_path(), json.dumps(sidecar, ensure_ascii=False))
+        self._dirty = False
+
     def _save(self) -> None:
-        self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._cache_path.open(mode="w", encoding="utf-8") as f:
-            json.dump(obj=dict(self), fp=f, indent=2, ensure_ascii=False)
+        self._dirty = True
+        if not write_back.schedule(self):
+            self.flush()
+
+    def _save_meta(self) -> None:
+        self._save()  # an unchanged items file is skipped by its hash
+
+    def _write_file(self, path: Path, text: str) -> None:
+        content = write_back.digest(text)
+        if self._digests.get(path) != content:
+            atomic_write(path, text)
+            self._digests[path] = content
+
+    def _meta_path(self) -> Path:
+        return self._cache_path.with_name(f"{self._cache_path.stem}.meta.json")
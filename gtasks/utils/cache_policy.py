@@ -0,0 +1,36 @@
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+
+class Freshness(Enum):
+    FRESH = "fresh"  # serve from cache
+    STALE = "stale"  # serve from cache, revalidate in the background
+    MUST_REVALIDATE = "must_revalidate"  # revalidate before serving
+    EXPIRED = "expired"  # drop and refetch in full
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Age thresholds, in seconds, deciding how a cached entry may be served.
+
+    An entry is fresh for fresh_ttl seconds after it was fetched, then stale for a further
+    stale_window seconds. Past that it has to be revalidated before use, and past max_age
+    it is discarded and refetched in full rather than synced.
+    """
+
+    fresh_ttl: float
+    stale_window: float
+    max_age: float
+
+    def freshness(self, fetched_at: float | None, now: float | None = None) -> Freshness:
+        if fetched_at is None:
+            return Freshness.MUST_REVALIDATE  # expired, or fetched before timestamps were kept
+        age = (time.time() if now is None else now) - fetched_at
+        if age > self.max_age:
+            return Freshness.EXPIRED
+        if age <= self.fresh_ttl:
+            return Freshness.FRESH
+        if age <= self.fresh_ttl + self.stale_window:
+            return Freshness.STALE
+        return Freshness.MUST_REVALIDATE
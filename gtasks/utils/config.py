@@ -1,12 +1,27 @@
+import io
+from collections.abc import Callable
 from configparser import ConfigParser
 from enum import Enum
 from pathlib import Path
 
+from gtasks.utils import write_back
+from gtasks.utils.atomic_io import atomic_write
+
 DEFAULT_SECTION: str = "DEFAULT"
 
 
 class ConfigKey(Enum):
     DEFAULT_TASKLIST_TITLE = "default_tasklist"
+    HTTP_POOL_SIZE = "http_pool_size"
+    HTTP_IDLE_TIMEOUT = "http_idle_timeout"
+    HTTP_TIMEOUT = "http_timeout"
+    CACHE_FRESH_TTL = "cache_fresh_ttl"
+    CACHE_STALE_WINDOW = "cache_stale_window"
+    CACHE_MAX_AGE = "cache_max_age"
+    CACHE_BACKEND = "cache_backend"
+    API_MAX_RETRIES = "api_max_retries"
+    API_RATE_LIMIT = "api_rate_limit"
+    API_RATE_BURST = "api_rate_burst"
 
 
 class Config:
@@ -19,15 +34,35 @@ class Config:
     ) -> None:
         self._config_path: Path = config_path.expanduser()
         self._parser: ConfigParser = parser
+        self._digest: str | None = None  # of the file as last read or written
 
         if self._config_path.exists():
-            self._parser.read(self._config_path)
+            text = self._config_path.read_text()
+            self._parser.read_string(text, source=str(self._config_path))
+            self._digest = write_back.digest(text)
 
     def get(self, key: ConfigKey, section: str = DEFAULT_SECTION) -> str | None:
         if section not in self._parser:
             return None
         return self._parser[section].get(key.value)
 
+    def get_int(self, key: ConfigKey, default: int, section: str = DEFAULT_SECTION) -> int:
+        return self._get_typed(key, int, default, section)
+
+    def get_float(self, key: ConfigKey, default: float, section: str = DEFAULT_SECTION) -> float:
+        return self._get_typed(key, float, default, section)
+
+    def _get_typed[T](
+        self, key: ConfigKey, convert: Callable[[str], T], default: T, section: str
+    ) -> T:
+        value = self.get(key, section)
+        if value is None:
+            return default
+        try:
+            return convert(value)
+        except ValueError as e:
+            raise ValueError(f"Invalid value for {key.value}: {value!r}") from e
+
     def set(self, key: ConfigKey, value: str, section: str = DEFAULT_SECTION) -> None:
         if section not in self._parser:
             self._parser[section] = {}
@@ -37,8 +72,17 @@ class Config:
     def get_all(self, section: str = DEFAULT_SECTION) -> dict[ConfigKey, str | None]:
         return {key: self.get(key, section) for key in ConfigKey}
 
+    def flush(self) -> None:
+        """Write current config to disk, unless the file already holds it."""
+        buf = io.StringIO()
+        self._parser.write(buf)
+        text = buf.getvalue()
+        content = write_back.digest(text)
+        if content != self._digest:
+            atomic_write(self._config_path, text)
+            self._digest = content
+
     def _save(self) -> None:
-        """Write current config to disk."""
-        self._config_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._config_path.open("w") as f:
-            self._parser.write(f)
+        """Write current config to disk, now or when the write-back session ends."""
+        if not write_back.schedule(self):
+            self.flush()
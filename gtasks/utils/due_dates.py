@@ -0,0 +1,84 @@
+"""Due-date parsing for `gtasks add --due`.
+
+Common expressions (ISO dates, weekday names, today/tomorrow, next week, in N days) are
+handled by a few compiled regexes. Everything else falls back to dateparser, which is
+only imported when needed since importing it dominates `gtasks add` startup.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+_RFC3339_MIDNIGHT = "%Y-%m-%dT00:00:00.000Z"
+
+_WEEKDAYS: dict[str, int] = {
+    "mon": 0, "monday": 0,
+    "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5,
+    "sun": 6, "sunday": 6,
+}  # fmt: skip
+_RELATIVE_DAYS: dict[str, int] = {"today": 0, "tomorrow": 1, "next week": 7}
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}.*(?:z|[+-]\d{2}:?\d{2})")
+_IN_N_RE = re.compile(r"in\s+(\d+)\s+(day|week)s?")
+_WEEKDAY_RE = re.compile(r"(?:next\s+)?([a-z]+)")
+
+
+def parse_due_date(date_str: str, today: date | None = None) -> str:
+    """Parse a human-readable date string and return an RFC 3339 timestamp.
+
+    Relative expressions resolve to upcoming dates (a bare weekday never means today).
+    Always normalises to midnight UTC since the Tasks API ignores the time component.
+    Results are memoised per (expression, day), which keeps bulk adds cheap.
+    """
+    return _parse_due_date(" ".join(date_str.lower().split()), today or date.today())
+
+
+@lru_cache(maxsize=256)
+def _parse_due_date(expr: str, today: date) -> str:
+    due = _parse_fast_path(expr, today)
+    if due is None:
+        due = _parse_with_dateparser(expr)
+    return due.strftime(_RFC3339_MIDNIGHT)
+
+
+def _parse_fast_path(expr: str, today: date) -> date | None:
+    if expr in _RELATIVE_DAYS:
+        return today + timedelta(days=_RELATIVE_DAYS[expr])
+    if _ISO_DATE_RE.fullmatch(expr):
+        try:
+            return date.fromisoformat(expr)
+        except ValueError:
+            return None
+    if _ISO_DATETIME_RE.fullmatch(expr):
+        try:
+            return datetime.fromisoformat(expr.upper()).astimezone(timezone.utc).date()
+        except ValueError:
+            return None
+    if m := _IN_N_RE.fullmatch(expr):
+        days = int(m.group(1)) * (7 if m.group(2) == "week" else 1)
+        return today + timedelta(days=days)
+    if (m := _WEEKDAY_RE.fullmatch(expr)) and m.group(1) in _WEEKDAYS:
+        days_ahead = (_WEEKDAYS[m.group(1)] - today.weekday() - 1) % 7 + 1
+        return today + timedelta(days=days_ahead)
+    return None
+
+
+def _parse_with_dateparser(expr: str) -> date:
+    import dateparser
+
+    dt = dateparser.parse(
+        expr,
+        settings={
+            "PREFER_DATES_FROM": "future",
+            "RETURN_AS_TIMEZONE_AWARE": True,
+            "TO_TIMEZONE": "UTC",
+        },
+    )
+    if dt is None:
+        raise ValueError(f"Could not parse due date: {expr!r}")
+    return dt.date()
@@ -0,0 +1,158 @@
+"""Compact, memory-mapped record files.
+
+Layout (little-endian):
+
+    header   magic b"GTRC" | version u16 | count u32 | split u32
+    index    count x (offset u32 | flags u8), offsets relative to the data section
+    data     count x (length u32 | compact UTF-8 JSON)
+
+Opening a file maps it and reads only the header; a record is decoded the first time it
+is indexed, so reading the first few records of a long file costs the same as reading
+them from a short one. The per-record flags byte lets callers filter without decoding,
+and split divides the records into two segments that can be read independently.
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+from gtasks.utils.atomic_io import atomic_write
+
+MAGIC = b"GTRC"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sHII")
+_INDEX_ENTRY = struct.Struct("<IB")
+_LENGTH = struct.Struct("<I")
+
+
+def write_records(
+    path: Path,
+    records: Sequence[dict[str, Any]],
+    flags: Callable[[dict[str, Any]], int] | None = None,
+    split: int | None = None,
+) -> None:
+    """Write records to path, atomically replacing any existing file.
+
+    Readers that still have the old file mapped keep a consistent view of it.
+    """
+    atomic_write(path, encode_records(records, flags, split))
+
+
+def encode_records(
+    records: Sequence[dict[str, Any]],
+    flags: Callable[[dict[str, Any]], int] | None = None,
+    split: int | None = None,
+) -> bytes:
+    """Return the contents of a record file holding records.
+
+    The first split records (by default, all of them) form the first segment.
+    """
+    payloads = [
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for r in records
+    ]
+    index = bytearray()
+    data = bytearray()
+    for record, payload in zip(records, payloads, strict=True):
+        index += _INDEX_ENTRY.pack(len(data), flags(record) if flags is not None else 0)
+        data += _LENGTH.pack(len(payload)) + payload
+
+    split = len(records) if split is None else split
+    return _HEADER.pack(MAGIC, VERSION, len(records), split) + index + data
+
+
+class RecordView(Sequence[dict[str, Any]]):
+    """Read-only, lazily decoded sequence over a record file (or a subset of it)."""
+
+    def __init__(
+        self,
+        buf: mmap.mmap,
+        count: int,
+        split: int,
+        indices: Sequence[int] | None = None,
+    ) -> None:
+        self._buf = buf
+        self._count = count
+        self.split = split  # number of records in the file's first segment
+        self._indices: Sequence[int] = range(count) if indices is None else indices
+        self._data_start = _HEADER.size + count * _INDEX_ENTRY.size
+        self._decoded: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, i: int) -> dict[str, Any]: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[dict[str, Any]]: ...
+    def __getitem__(self, i: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(i, slice):
+            return [self._decode(j) for j in self._indices[i]]
+        return self._decode(self._indices[i])
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self._decode(j) for j in self._indices)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"RecordView({list(self)!r})"
+
+    def flags(self, i: int) -> int:
+        return self._entry(self._indices[i])[1]
+
+    def where(self, predicate: Callable[[int], bool]) -> RecordView:
+        """Return a view of the records whose flags satisfy predicate, without decoding."""
+        return self._view([j for j in self._indices if predicate(self._entry(j)[1])])
+
+    def segment(self, first: bool) -> RecordView:
+        """Return a view of the file's first or second segment, without decoding."""
+        return self._view(range(self.split) if first else range(self.split, self._count))
+
+    def _view(self, indices: Sequence[int]) -> RecordView:
+        view = RecordView(self._buf, self._count, self.split, indices)
+        view._decoded = self._decoded
+        return view
+
+    def _entry(self, j: int) -> tuple[int, int]:
+        return _INDEX_ENTRY.unpack_from(self._buf, _HEADER.size + j * _INDEX_ENTRY.size)
+
+    def _decode(self, j: int) -> dict[str, Any]:
+        record = self._decoded.get(j)
+        if record is None:
+            offset = self._data_start + self._entry(j)[0]
+            (length,) = _LENGTH.unpack_from(self._buf, offset)
+            start = offset + _LENGTH.size
+            record = json.loads(self._buf[start : start + length])
+            self._decoded[j] = record
+        return record
+
+
+def read_records(path: Path) -> RecordView:
+    """Map a record file. Raises ValueError if it is not a readable record file."""
+    with path.open("rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            raise ValueError(f"Not a record file: {path}") from e
+    try:
+        magic, version, count, split = _HEADER.unpack_from(buf, 0)
+    except struct.error as e:
+        buf.close()
+        raise ValueError(f"Not a record file: {path}") from e
+    if magic != MAGIC or version != VERSION:
+        buf.close()
+        raise ValueError(f"Unsupported record file: {path}")
+    if len(buf) < _HEADER.size + count * _INDEX_ENTRY.size or split > count:
+        buf.close()
+        raise ValueError(f"Truncated record file: {path}")
+    return RecordView(buf, count, split)
@@ -0,0 +1,407 @@
+"""SQLite backend for the tasklist and task caches.
+
+One database holds both caches. Mutations update individual rows inside a transaction
+instead of rewriting whole JSON files, and startup no longer parses every cached list.
+Titles are matched against a `title_lower` column filled with Python's str.lower(),
+since SQLite's lower() only folds ASCII.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gtasks.utils.bidict_cache import BidictCache
+from gtasks.utils.tasks_cache import ALL_HISTORY, TasksCache, _high_water
+
+if TYPE_CHECKING:
+    from googleapiclient._apis.tasks.v1.schemas import Task
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasklists (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_lower TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS tasklists_title_lower ON tasklists (title_lower);
+
+CREATE TABLE IF NOT EXISTS cache_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS task_sync (
+    tasklist_id TEXT PRIMARY KEY,
+    updated_min TEXT,
+    etag TEXT,
+    fetched_at REAL,
+    stale INTEGER NOT NULL DEFAULT 0,
+    completed_min TEXT DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    tasklist_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    seq REAL NOT NULL,
+    title_lower TEXT NOT NULL,
+    status TEXT,
+    due TEXT,
+    parent TEXT,
+    position TEXT,
+    completed TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (tasklist_id, id)
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (tasklist_id, status);
+CREATE INDEX IF NOT EXISTS tasks_title_lower ON tasks (tasklist_id, title_lower);
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks (tasklist_id, due);
+CREATE INDEX IF NOT EXISTS tasks_parent ON tasks (tasklist_id, parent, position);
+CREATE INDEX IF NOT EXISTS tasks_seq ON tasks (tasklist_id, seq);
+"""
+
+
+class SqliteStore:
+    """Connection to the cache database, shared by the tasklist and task caches.
+
+    Callers serialise access (CachedApiClient holds its cache lock around every cache
+    call), so the connection may be used from background revalidation threads.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        db_path = db_path.expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(task_sync)")}
+        if "completed_min" not in columns:
+            # Lists cached before history was tracked were always fetched in full.
+            with self.conn:
+                self.conn.execute("ALTER TABLE task_sync ADD COLUMN completed_min TEXT DEFAULT ''")
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        with self.conn:
+            if "completed" not in columns:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN completed TEXT")
+                self.conn.execute("UPDATE tasks SET completed = json_extract(data, '$.completed')")
+            # Created here rather than in _SCHEMA, which runs before the column exists.
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (tasklist_id, completed)"
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class SqliteBidictCache(BidictCache[str, str]):
+    """Tasklist title <-> id cache persisted to the `tasklists` table."""
+
+    def __init__(self, store: SqliteStore | None = None) -> None:
+        super().__init__()
+
+        # bidict's copy() and inverse views construct instances without arguments
+        if store is not None:
+            self._store = store
+            self.load()
+
+    def load(self) -> None:
+        conn = self._store.conn
+        self.clear()
+        rows = conn.execute("SELECT title, id, meta FROM tasklists ORDER BY rowid").fetchall()
+        self.update({title: id_ for title, id_, _ in rows})
+        self.meta = {id_: json.loads(meta) for _, id_, meta in rows}
+        values = dict(conn.execute("SELECT key, value FROM cache_meta").fetchall())
+        self.etag = values.get("tasklists_etag")
+        fetched_at = values.get("tasklists_fetched_at")
+        self.fetched_at = float(fetched_at) if fetched_at is not None else None
+
+    def _save(self) -> None:
+        with self._store.conn as conn:
+            conn.execute("DELETE FROM tasklists")
+            conn.executemany(
+                "INSERT INTO tasklists (id, title, title_lower, meta) VALUES (?, ?, ?, ?)",
+                [
+                    (id_, title, title.lower(), json.dumps(self.meta.get(id_, {})))
+                    for title, id_ in self.items()
+                ],
+            )
+            self._write_cache_meta(conn)
+
+    def _save_meta(self) -> None:
+        with self._store.conn as conn:
+            self._write_cache_meta(conn)
+
+    def _write_cache_meta(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)",
+            [
+                ("tasklists_etag", self.etag),
+                (
+                    "tasklists_fetched_at",
+                    str(self.fetched_at) if self.fetched_at is not None else None,
+                ),
+            ],
+        )
+
+
+class SqliteTasksCache(TasksCache):
+    """Per-tasklist task cache persisted to the `tasks` and `task_sync` tables.
+
+    Rows keep the order the API returned them in through a `seq` column; write-through
+    inserts take a seq between their neighbours instead of renumbering the list. Reads
+    return active tasks in that order followed by completed ones by completion time, as
+    TasksCache does.
+    """
+
+    def __init__(self, store: SqliteStore) -> None:
+        self._store = store
+
+    def flush(self) -> None:
+        pass  # every change is committed as it is made
+
+    def get(self, tasklist_id: str, show_completed: bool = True) -> list["Task"] | None:
+        if not self.is_fresh(tasklist_id):
+            return None
+        query = "SELECT data FROM tasks WHERE tasklist_id = ?"
+        if not show_completed:
+            query += " AND status IS NOT 'completed'"
+        rows = self._store.conn.execute(query + _TASK_ORDER, (tasklist_id,))
+        return [json.loads(data) for (data,) in rows]
+
+    def is_fresh(self, tasklist_id: str) -> bool:
+        row = self._sync_row(tasklist_id)
+        return row is not None and not row["stale"]
+
+    def completed_since(self, tasklist_id: str, completed_min: str) -> list["Task"] | None:
+        if not self.is_fresh(tasklist_id):
+            return None
+        rows = self._store.conn.execute(
+            "SELECT data FROM tasks WHERE tasklist_id = ? AND status = 'completed' "
+            "AND completed >= ? ORDER BY completed, seq",
+            (tasklist_id, completed_min),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def find_by_title(self, tasklist_id: str, title: str) -> list["Task"] | None:
+        if not self.is_fresh(tasklist_id):
+            return None
+        rows = self._store.conn.execute(
+            "SELECT data FROM tasks WHERE tasklist_id = ? AND title_lower = ?" + _TASK_ORDER,
+            (tasklist_id, title.lower()),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def set(
+        self,
+        tasklist_id: str,
+        tasks: list["Task"],
+        etag: str | None = None,
+        completed_min: str | None = ALL_HISTORY,
+    ) -> None:
+        with self._store.conn as conn:
+            conn.execute("DELETE FROM tasks WHERE tasklist_id = ?", (tasklist_id,))
+            conn.executemany(
+                _INSERT_TASK, [_task_row(tasklist_id, t, seq) for seq, t in enumerate(tasks)]
+            )
+            self._write_sync(conn, tasklist_id, _high_water(tasks, None), etag, completed_min)
+
+    def invalidate(self, tasklist_id: str) -> None:
+        with self._store.conn as conn:
+            conn.execute("DELETE FROM tasks WHERE tasklist_id = ?", (tasklist_id,))
+            conn.execute("DELETE FROM task_sync WHERE tasklist_id = ?", (tasklist_id,))
+
+    def mark_stale(self, tasklist_id: str) -> None:
+        if self.sync_base(tasklist_id) is None:
+            self.invalidate(tasklist_id)  # nothing to sync from
+            return
+        with self._store.conn as conn:
+            conn.execute("UPDATE task_sync SET stale = 1 WHERE tasklist_id = ?", (tasklist_id,))
+
+    def expire(self, tasklist_id: str) -> None:
+        with self._store.conn as conn:
+            conn.execute(
+                "UPDATE task_sync SET fetched_at = NULL WHERE tasklist_id = ?", (tasklist_id,)
+            )
+
+    def history(self, tasklist_id: str) -> str | None:
+        row = self._sync_row(tasklist_id)
+        return row["completed_min"] if row is not None else None
+
+    def add_history(self, tasklist_id: str, tasks: list["Task"], completed_min: str) -> None:
+        if self._sync_row(tasklist_id) is None:
+            return
+        current = self.history(tasklist_id)
+        with self._store.conn as conn:
+            self._merge_rows(conn, tasklist_id, tasks)
+            conn.execute(
+                "UPDATE task_sync SET completed_min = ? WHERE tasklist_id = ?",
+                (completed_min if current is None else min(current, completed_min), tasklist_id),
+            )
+
+    def sync_base(self, tasklist_id: str) -> str | None:
+        row = self._sync_row(tasklist_id)
+        return row["updated_min"] if row is not None else None
+
+    def etag(self, tasklist_id: str) -> str | None:
+        row = self._sync_row(tasklist_id)
+        return row["etag"] if row is not None else None
+
+    def fetched_at(self, tasklist_id: str) -> float | None:
+        row = self._sync_row(tasklist_id)
+        return row["fetched_at"] if row is not None else None
+
+    def revalidate(self, tasklist_id: str) -> None:
+        with self._store.conn as conn:
+            conn.execute(
+                "UPDATE task_sync SET stale = 0, fetched_at = ? WHERE tasklist_id = ?",
+                (time.time(), tasklist_id),
+            )
+
+    def merge(
+        self, tasklist_id: str, delta: list["Task"], etag: str | None = None
+    ) -> list["Task"]:
+        previous = self.sync_base(tasklist_id)
+        history = self.history(tasklist_id)
+        with self._store.conn as conn:
+            self._merge_rows(conn, tasklist_id, delta)
+            self._write_sync(conn, tasklist_id, _high_water(delta, previous), etag, history)
+        return self.get(tasklist_id) or []
+
+    def upsert(self, tasklist_id: str, tasks: list["Task"]) -> None:
+        if not self.is_fresh(tasklist_id):
+            return
+        with self._store.conn as conn:
+            for task in tasks:
+                if not self._update_task(conn, tasklist_id, task):
+                    seq = self._insert_seq(conn, tasklist_id, task)
+                    conn.execute(_INSERT_TASK, _task_row(tasklist_id, task, seq))
+
+    def remove(self, tasklist_id: str, task_ids: list[str]) -> None:
+        if not self.is_fresh(tasklist_id):
+            return
+        with self._store.conn as conn:
+            conn.executemany(
+                "DELETE FROM tasks WHERE tasklist_id = ? AND id = ?",
+                [(tasklist_id, task_id) for task_id in task_ids],
+            )
+
+    def clear(self) -> None:
+        with self._store.conn as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM task_sync")
+
+    def _sync_row(self, tasklist_id: str) -> sqlite3.Row | None:
+        cursor = self._store.conn.execute(
+            "SELECT updated_min, etag, fetched_at, stale, completed_min FROM task_sync "
+            "WHERE tasklist_id = ?",
+            (tasklist_id,),
+        )
+        cursor.row_factory = sqlite3.Row
+        return cursor.fetchone()
+
+    @staticmethod
+    def _write_sync(
+        conn: sqlite3.Connection,
+        tasklist_id: str,
+        updated_min: str | None,
+        etag: str | None,
+        completed_min: str | None,
+    ) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO task_sync "
+            "(tasklist_id, updated_min, etag, fetched_at, stale, completed_min) "
+            "VALUES (?, ?, ?, ?, 0, ?)",
+            (tasklist_id, updated_min, etag, time.time(), completed_min),
+        )
+
+    @classmethod
+    def _merge_rows(cls, conn: sqlite3.Connection, tasklist_id: str, tasks: list["Task"]) -> None:
+        # Same rule as the JSON cache's merge: drop removed tasks, replace known ones in
+        # place and insert new and moved ones by position.
+        for task in tasks:
+            key = (tasklist_id, task.get("id"))
+            removed = task.get("deleted") or task.get("hidden")
+            placement = conn.execute(
+                "SELECT parent, position FROM tasks WHERE tasklist_id = ? AND id = ?", key
+            ).fetchone()
+            moved = task.get("position") is not None and placement != (
+                task.get("parent"),
+                task.get("position"),
+            )
+            if not removed and placement is not None and not moved:
+                cls._update_task(conn, tasklist_id, task)
+                continue
+            conn.execute("DELETE FROM tasks WHERE tasklist_id = ? AND id = ?", key)
+            if not removed:
+                seq = cls._insert_seq(conn, tasklist_id, task)
+                conn.execute(_INSERT_TASK, _task_row(tasklist_id, task, seq))
+
+    @staticmethod
+    def _update_task(conn: sqlite3.Connection, tasklist_id: str, task: "Task") -> bool:
+        """Replace a known task in place, keeping its seq. Returns False if it is new."""
+        _, _, _, *columns = _task_row(tasklist_id, task, 0)
+        cursor = conn.execute(
+            "UPDATE tasks SET title_lower = ?, status = ?, due = ?, parent = ?, position = ?, "
+            "completed = ?, data = ? WHERE tasklist_id = ? AND id = ?",
+            (*columns, tasklist_id, task.get("id")),
+        )
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _end_seq(conn: sqlite3.Connection, tasklist_id: str) -> float:
+        (last,) = conn.execute(
+            "SELECT max(seq) FROM tasks WHERE tasklist_id = ?", (tasklist_id,)
+        ).fetchone()
+        return 0.0 if last is None else last + 1
+
+    @classmethod
+    def _insert_seq(cls, conn: sqlite3.Connection, tasklist_id: str, task: "Task") -> float:
+        # Same rule as the JSON cache: before the first sibling with a greater position.
+        position = task.get("position")
+        if position is None:
+            return cls._end_seq(conn, tasklist_id)
+        (next_seq,) = conn.execute(
+            "SELECT min(seq) FROM tasks WHERE tasklist_id = ? AND parent IS ? AND position > ?",
+            (tasklist_id, task.get("parent"), position),
+        ).fetchone()
+        if next_seq is None:
+            return cls._end_seq(conn, tasklist_id)
+        (prev_seq,) = conn.execute(
+            "SELECT max(seq) FROM tasks WHERE tasklist_id = ? AND seq < ?",
+            (tasklist_id, next_seq),
+        ).fetchone()
+        return next_seq - 1 if prev_seq is None else (prev_seq + next_seq) / 2
+
+
+# The JSON cache's segment order: active tasks in list order, then completed ones by
+# completion time.
+_TASK_ORDER = (
+    " ORDER BY status IS 'completed', "
+    "CASE WHEN status IS 'completed' THEN ifnull(completed, '') ELSE '' END, seq"
+)
+
+_INSERT_TASK = (
+    "INSERT OR REPLACE INTO tasks "
+    "(tasklist_id, id, seq, title_lower, status, due, parent, position, completed, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _task_row(tasklist_id: str, task: "Task", seq: float) -> tuple[Any, ...]:
+    return (
+        tasklist_id,
+        task.get("id"),
+        seq,
+        task.get("title", "").lower(),
+        task.get("status"),
+        task.get("due"),
+        task.get("parent"),
+        task.get("position"),
+        task.get("completed"),
+        json.dumps(task, ensure_ascii=False),
+    )
+
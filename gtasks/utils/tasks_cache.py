@@ -1,54 +1,657 @@
 import json
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from gtasks.utils import write_back
+from gtasks.utils.atomic_io import FileLock, atomic_write
+from gtasks.utils.record_file import RecordView, encode_records, read_records
 
 if TYPE_CHECKING:
     from googleapiclient._apis.tasks.v1.schemas import Task
 
+# Manifest of cached lists and their sync state, stored alongside the list files. The
+# leading dot keeps it from ever colliding with a tasklist id.
+_MANIFEST_FILE = ".sync.json"
+
+# Lock file serialising writers (and excluding readers) across gtasks processes.
+_LOCK_FILE = ".lock"
+
+# A list's journal is compacted into its snapshot once it grows past this many bytes.
+_COMPACT_THRESHOLD = 64 * 1024
+
+# Record flag set on completed tasks, which form a snapshot's second segment.
+_COMPLETED = 0x1
+
+# Manifest "layout" of snapshots whose completed segment is ordered by completion time.
+# Snapshots written before then are reordered, and rewritten, the first time they load.
+_LAYOUT = 2
+
+# history() value for a list holding every completed task. It sorts before any timestamp,
+# so a cached history covers a requested completedMin when it is less than or equal to it.
+ALL_HISTORY = ""
+
+
+def api_timestamp(value: str) -> str:
+    """Return an RFC 3339 timestamp in the form the API writes them: UTC, to the millisecond.
+
+    Cached timestamps are compared as strings, which orders them correctly only when both
+    sides share that form ("2026-03-01T00:00:00.000Z"). A timestamp without an offset is
+    taken to be UTC.
+    """
+    dt = datetime.fromisoformat(value)
+    dt = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+    return f"{dt:%Y-%m-%dT%H:%M:%S}.{dt.microsecond // 1000:03d}Z"
+
 
 class TasksCache:
-    """Per-tasklist cache storing full task objects as JSON arrays on disk.
+    """Per-tasklist cache storing full task objects in compact record files on disk.
+
+    One file per tasklist: {cache_dir}/{tasklist_id}.rec (see record_file). Files are
+    memory-mapped and each task is decoded only when read, so returning the first few
+    tasks of a long list does not parse the rest. Lists cached as JSON arrays by older
+    versions ({tasklist_id}.json) are converted the first time they are read.
+    Snapshots hold two segments, active tasks followed by completed ones, so the active
+    tasks can be read without touching any of the completed history. Completed tasks are
+    kept in order of completion time, which makes the segment its own index: tasks
+    completed since a given time are found by binary search. A list may be cached
+    with only part of its history: history() says how far back completed tasks are held,
+    and add_history() extends it as older completed tasks are fetched.
 
-    One file per tasklist: {cache_dir}/{tasklist_id}.json
-    Cache always stores ALL tasks (completed + needsAction); callers filter client-side.
+    Writes after a full fetch replace the snapshot. Smaller changes (delta syncs and
+    write-through from mutations) are appended as one JSON line each to a journal,
+    {tasklist_id}.log, and replayed over the snapshot on load; once the journal passes
+    compact_threshold bytes it is folded into a new snapshot.
+
+    A manifest records which lists are cached along with their sync state, so startup
+    reads one small file and each list file is only parsed the first time it is needed.
+
+    Each list also records a high-water mark: the newest `updated` timestamp it has seen.
+    A stale list keeps its tasks so it can be brought up to date by merging only the tasks
+    changed since that mark, instead of being refetched in full.
+
+    Several processes may share one cache directory. Files are replaced atomically, reads
+    hold a shared lock and writes an exclusive one, a loaded list is reloaded once another
+    process has written it, and manifest writes only replace this process's own entry.
+
+    Changes are kept in memory and written by flush(), immediately or at the end of a
+    write_back session. A snapshot whose content hash matches the one on disk is not
+    rewritten.
     """
 
-    def __init__(self, cache_dir: Path) -> None:
+    def __init__(self, cache_dir: Path, compact_threshold: int = _COMPACT_THRESHOLD) -> None:
         self._cache_dir = cache_dir
-        self._data: dict[str, list["Task"]] = {}
-        self._load_all()
+        self._compact_threshold = compact_threshold
+        # Lists loaded so far: a lazy RecordView until first modified, then a list.
+        self._data: dict[str, Sequence["Task"]] = {}
+        self._versions: dict[str, tuple[int, ...]] = {}  # on-disk state each was loaded from
+        self._manifest: dict[str, dict[str, Any]] = {}
+        # Changes not yet flushed: lists to snapshot, journal entries, manifest entries.
+        self._dirty_snapshots: set[str] = set()
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._dirty_manifest: set[str] = set()
+        self._lock = FileLock(cache_dir / _LOCK_FILE)
+        # Guards in-memory state: a write-back session may flush from another thread.
+        self._mutex = threading.RLock()
+        self._load_manifest()
 
-    def get(self, tasklist_id: str) -> list["Task"] | None:
-        return self._data.get(tasklist_id)
+    def get(self, tasklist_id: str, show_completed: bool = True) -> Sequence["Task"] | None:
+        """Return the cached tasks, or None if the list is missing or stale.
 
-    def set(self, tasklist_id: str, tasks: list["Task"]) -> None:
-        self._data[tasklist_id] = tasks
-        self._save(tasklist_id)
+        The result may decode tasks lazily; slice it rather than copying it whole when only
+        the first few are needed.
+        """
+        with self._mutex:
+            if not self.is_fresh(tasklist_id):
+                return None
+            with self._lock.shared():
+                tasks = self._tasks(tasklist_id)
+            if tasks is None or show_completed:
+                return tasks
+            if isinstance(tasks, RecordView):
+                return tasks.segment(first=True)
+            return [t for t in tasks if t.get("status") != "completed"]
+
+    def is_fresh(self, tasklist_id: str) -> bool:
+        """Return whether the list is cached and not marked stale."""
+        entry = self._manifest.get(tasklist_id)
+        return entry is not None and not entry.get("stale")
+
+    def completed_since(self, tasklist_id: str, completed_min: str) -> Sequence["Task"] | None:
+        """Return the tasks completed at or after completed_min, oldest first.
+
+        completed_min must be in api_timestamp form. Returns None if the list is missing or
+        stale. Only the tasks returned, and a few found by the search, are decoded.
+        """
+        with self._mutex:
+            if not self.is_fresh(tasklist_id):
+                return None
+            with self._lock.shared():
+                tasks = self._tasks(tasklist_id)
+            if tasks is None:
+                return None
+            if isinstance(tasks, RecordView):
+                completed = tasks.segment(first=False)
+            else:
+                completed = tasks[bisect_left(tasks, _COMPLETED, key=_record_flags) :]
+            return completed[bisect_left(completed, completed_min, key=_completed_at) :]
+
+    def find_by_title(self, tasklist_id: str, title: str) -> list["Task"] | None:
+        """Return the tasks titled title (case-insensitively), or None if not fresh."""
+        tasks = self.get(tasklist_id)
+        if tasks is None:
+            return None
+        return [t for t in tasks if t.get("title", "").lower() == title.lower()]
+
+    def set(
+        self,
+        tasklist_id: str,
+        tasks: list["Task"],
+        etag: str | None = None,
+        completed_min: str | None = ALL_HISTORY,
+    ) -> None:
+        """Replace a list with tasks from a full listing.
+
+        completed_min is the completedMin the listing covered: ALL_HISTORY if it included
+        every completed task, or None if it listed active tasks only.
+        """
+        with self._mutex:
+            self._data[tasklist_id] = _partitioned(tasks)
+            self._manifest[tasklist_id] = {
+                **self._manifest.get(tasklist_id, {}),  # keeps the snapshot's digest
+                "updated_min": _high_water(tasks, None),
+                "etag": etag,
+                "fetched_at": time.time(),
+                "stale": False,
+                "completed_min": completed_min,
+            }
+            self._dirty_snapshots.add(tasklist_id)
+            self._pending.pop(tasklist_id, None)  # the snapshot supersedes them
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
 
     def invalidate(self, tasklist_id: str) -> None:
-        self._data.pop(tasklist_id, None)
-        self._cache_path(tasklist_id).unlink(missing_ok=True)
+        """Drop the list entirely; the next read refetches it in full."""
+        with self._mutex:
+            self._data.pop(tasklist_id, None)
+            self._manifest.pop(tasklist_id, None)
+            self._dirty_snapshots.discard(tasklist_id)
+            self._pending.pop(tasklist_id, None)
+            with self._lock.exclusive():
+                self._unlink(tasklist_id)
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+
+    def mark_stale(self, tasklist_id: str) -> None:
+        """Flag the list as out of date while keeping its tasks as a base for a delta sync."""
+        with self._mutex:
+            if self.sync_base(tasklist_id) is None:
+                self.invalidate(tasklist_id)  # nothing to sync from
+                return
+            self._manifest[tasklist_id]["stale"] = True
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+
+    def expire(self, tasklist_id: str) -> None:
+        """Make the list due for revalidation on its next read, serving it until then."""
+        with self._mutex:
+            entry = self._manifest.get(tasklist_id)
+            if entry is None:
+                return
+            entry["fetched_at"] = None
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+
+    def history(self, tasklist_id: str) -> str | None:
+        """Return the completedMin down to which completed tasks are cached.
+
+        ALL_HISTORY means every completed task is cached; None means none are beyond those
+        that arrived through delta syncs or write-through.
+        """
+        entry = self._manifest.get(tasklist_id)
+        if entry is None:
+            return None
+        # Lists cached before history was tracked were always fetched in full.
+        return entry.get("completed_min", ALL_HISTORY)
+
+    def add_history(self, tasklist_id: str, tasks: list["Task"], completed_min: str) -> None:
+        """Add completed tasks fetched with completedMin=completed_min to a cached list.
+
+        The sync state is left alone: these tasks say nothing about other recent changes.
+        """
+        with self._mutex:
+            entry = self._manifest.get(tasklist_id)
+            if entry is None:
+                return
+            with self._lock.shared():
+                self._data[tasklist_id] = _merged(self._tasks(tasklist_id) or [], tasks)
+            current = self.history(tasklist_id)
+            entry["completed_min"] = (
+                completed_min if current is None else min(current, completed_min)
+            )
+            self._journal(tasklist_id, {"op": "merge", "tasks": tasks})
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+
+    def sync_base(self, tasklist_id: str) -> str | None:
+        """Return the updatedMin to sync a stale list from, or None if it needs a full fetch."""
+        return self._manifest.get(tasklist_id, {}).get("updated_min")
+
+    def etag(self, tasklist_id: str) -> str | None:
+        """Return the ETag of the last listing that filled or synced this list."""
+        return self._manifest.get(tasklist_id, {}).get("etag")
+
+    def fetched_at(self, tasklist_id: str) -> float | None:
+        """Return when the list was last filled, synced or revalidated (epoch seconds)."""
+        return self._manifest.get(tasklist_id, {}).get("fetched_at")
+
+    def revalidate(self, tasklist_id: str) -> None:
+        """Mark a list fresh again after the API confirmed it is unchanged.
+
+        Only the manifest is written; the list file is left as it is.
+        """
+        with self._mutex:
+            entry = self._manifest.get(tasklist_id)
+            if entry is None:
+                return
+            entry["stale"] = False
+            entry["fetched_at"] = time.time()
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+
+    def merge(
+        self, tasklist_id: str, delta: list["Task"], etag: str | None = None
+    ) -> list["Task"]:
+        """Apply tasks changed since the high-water mark and return the merged list.
+
+        Deleted and hidden tasks are dropped, matching what a full fetch returns. Changed
+        tasks replace their cached copy in place; new and moved ones are inserted by
+        position among their siblings.
+        """
+        with self._mutex:
+            with self._lock.shared():
+                merged = _merged(self._tasks(tasklist_id) or [], delta)
+            self._data[tasklist_id] = merged
+            previous = self.sync_base(tasklist_id)
+            self._manifest[tasklist_id] = {
+                **self._manifest.get(tasklist_id, {}),
+                "updated_min": _high_water(delta, previous),
+                "etag": etag,
+                "fetched_at": time.time(),
+                "stale": False,
+            }
+            self._journal(tasklist_id, {"op": "merge", "tasks": delta})
+            self._dirty_manifest.add(tasklist_id)
+            self._schedule()
+            return merged
+
+    def upsert(self, tasklist_id: str, tasks: list["Task"]) -> None:
+        """Write tasks returned by the API through to a fresh cached list.
+
+        Known tasks are replaced in place; new ones are inserted by position among their
+        siblings. The high-water mark is left alone so the next delta sync still picks up
+        changes made elsewhere. Lists that are missing or stale are left untouched.
+        """
+        with self._mutex:
+            cached = self.get(tasklist_id)
+            if cached is None:
+                return
+            self._data[tasklist_id] = _upserted(cached, tasks)
+            self._journal(tasklist_id, {"op": "upsert", "tasks": tasks})
+            self._schedule()
+
+    def remove(self, tasklist_id: str, task_ids: list[str]) -> None:
+        """Drop tasks from a fresh cached list. Missing or stale lists are left untouched."""
+        with self._mutex:
+            cached = self.get(tasklist_id)
+            if cached is None:
+                return
+            self._data[tasklist_id] = _removed(cached, task_ids)
+            self._journal(tasklist_id, {"op": "remove", "ids": task_ids})
+            self._schedule()
 
     def clear(self) -> None:
-        self._data.clear()
-        if self._cache_dir.exists():
-            for path in self._cache_dir.glob("*.json"):
-                path.unlink()
+        with self._mutex:
+            with self._lock.exclusive():
+                for tasklist_id in self._manifest | (self._read_manifest() or {}):
+                    self._unlink(tasklist_id)
+                self._data.clear()
+                self._versions.clear()
+                self._manifest.clear()
+                self._dirty_snapshots.clear()
+                self._pending.clear()
+                self._dirty_manifest.clear()
+                self._manifest_path().unlink(missing_ok=True)
 
-    def _load_all(self) -> None:
-        if not self._cache_dir.exists():
+    def flush(self) -> None:
+        """Write every change not yet on disk, then fold the changed manifest entries in."""
+        with self._mutex:
+            if not (self._dirty_snapshots or self._pending or self._dirty_manifest):
+                return
+            with self._lock.exclusive():
+                for tasklist_id in self._dirty_snapshots:
+                    if tasklist_id in self._manifest:
+                        self._save(tasklist_id)
+                for tasklist_id, entries in list(self._pending.items()):
+                    # Reload first if another process wrote the list; pending entries are
+                    # re-applied on top, so neither side's changes are lost.
+                    if tasklist_id in self._manifest and self._tasks(tasklist_id) is not None:
+                        self._append(tasklist_id, entries)
+                self._dirty_snapshots.clear()
+                self._pending.clear()
+                self._save_manifest()
+
+    def _tasks(self, tasklist_id: str) -> Sequence["Task"] | None:
+        """Return a cached list's tasks, mapping its file on first use.
+
+        A list another process has written since it was loaded is loaded again.
+        """
+        if tasklist_id in self._data:
+            if (
+                tasklist_id in self._dirty_snapshots
+                or self._versions.get(tasklist_id) == self._disk_version(tasklist_id)
+            ):
+                return self._data[tasklist_id]
+            del self._data[tasklist_id]
+        if tasklist_id not in self._manifest:
+            return None
+        try:
+            self._data[tasklist_id] = read_records(self._cache_path(tasklist_id))
+        except FileNotFoundError:
+            if not self._migrate(tasklist_id):
+                return None
+        except (ValueError, OSError):
+            self._drop(tasklist_id)
+            return None
+        self._replay(tasklist_id)
+        self._versions[tasklist_id] = self._disk_version(tasklist_id)
+        if self._manifest[tasklist_id].get("layout") != _LAYOUT:
+            self._data[tasklist_id] = _partitioned(self._data[tasklist_id])
+            self._dirty_snapshots.add(tasklist_id)
+            write_back.schedule(self)  # otherwise rewritten by the next flush
+        tasks = self._data[tasklist_id]
+        for entry in self._pending.get(tasklist_id, []):
+            tasks = _applied(tasks, entry)
+        self._data[tasklist_id] = tasks
+        return tasks
+
+    def _replay(self, tasklist_id: str) -> None:
+        """Apply a list's journal, if any, over its freshly loaded snapshot."""
+        try:
+            with self._journal_path(tasklist_id).open(encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
             return
-        for path in self._cache_dir.glob("*.json"):
+        tasks = self._data[tasklist_id]
+        for line in lines:
             try:
-                with path.open(encoding="utf-8") as f:
-                    self._data[path.stem] = json.load(f)
-            except (json.JSONDecodeError, OSError):
-                path.unlink(missing_ok=True)
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a write cut short by a crash
+            tasks = _applied(tasks, entry)
+        self._data[tasklist_id] = tasks
+
+    def _journal(self, tasklist_id: str, entry: dict[str, Any]) -> None:
+        if tasklist_id not in self._dirty_snapshots:  # a pending snapshot already has it
+            self._pending.setdefault(tasklist_id, []).append(entry)
+
+    def _append(self, tasklist_id: str, entries: list[dict[str, Any]]) -> None:
+        """Journal changes to a list, compacting the journal once it grows too large."""
+        if not self._cache_path(tasklist_id).exists():
+            self._save(tasklist_id)  # no snapshot to replay over yet
+            return
+        lines = "".join(
+            json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in entries
+        )
+        with self._journal_path(tasklist_id).open("a+b") as f:
+            # Start on a fresh line if a crashed writer left a partial one behind.
+            if f.tell() > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(lines.encode("utf-8"))
+            size = f.tell()
+        if size > self._compact_threshold:
+            self._save(tasklist_id)
+        else:
+            self._versions[tasklist_id] = self._disk_version(tasklist_id)
+
+    def _schedule(self) -> None:
+        if not write_back.schedule(self):
+            self.flush()
+
+    def _migrate(self, tasklist_id: str) -> bool:
+        """Convert a list cached as a JSON array by an older version to a record file."""
+        legacy = self._legacy_path(tasklist_id)
+        try:
+            with legacy.open(encoding="utf-8") as f:
+                tasks = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            self._drop(tasklist_id)
+            return False
+        self._data[tasklist_id] = tasks
+        with self._lock.exclusive():
+            self._save(tasklist_id)
+            legacy.unlink(missing_ok=True)
+        return True
+
+    def _drop(self, tasklist_id: str) -> None:
+        """Forget a list whose file is missing or unreadable."""
+        with self._lock.exclusive():
+            self._unlink(tasklist_id)
+            self._manifest.pop(tasklist_id)
+            self._pending.pop(tasklist_id, None)
+            self._save_manifest({tasklist_id})  # only this entry; other changes stay pending
+
+    def _unlink(self, tasklist_id: str) -> None:
+        self._cache_path(tasklist_id).unlink(missing_ok=True)
+        self._journal_path(tasklist_id).unlink(missing_ok=True)
+        self._legacy_path(tasklist_id).unlink(missing_ok=True)
+
+    def _load_manifest(self) -> None:
+        if not self._cache_dir.exists():
+            return
+        with self._lock.shared():
+            manifest = self._read_manifest()
+            if manifest is not None:
+                self._manifest = manifest
+                return
+            # No usable manifest (e.g. a cache written by an older version): index the list
+            # files once. They have no sync state, so they are refetched in full once stale.
+            with self._lock.exclusive():
+                paths = [*self._cache_dir.glob("*.rec"), *self._cache_dir.glob("*.json")]
+                self._manifest = {p.stem: {} for p in paths if p.name != _MANIFEST_FILE}
+                if self._manifest:
+                    atomic_write(self._manifest_path(), json.dumps(self._manifest, indent=2))
+                else:
+                    self._manifest_path().unlink(missing_ok=True)
+
+    def _read_manifest(self) -> dict[str, dict[str, Any]] | None:
+        """Return the manifest on disk, or None if it is missing or corrupt."""
+        try:
+            with self._manifest_path().open(encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        return manifest if isinstance(manifest, dict) else None
 
     def _save(self, tasklist_id: str) -> None:
-        self._cache_dir.mkdir(parents=True, exist_ok=True)
-        with self._cache_path(tasklist_id).open("w", encoding="utf-8") as f:
-            json.dump(self._data[tasklist_id], f, indent=2, ensure_ascii=False)
+        """Write a new snapshot of the list, which supersedes its journal.
+
+        The write is skipped when the snapshot on disk already holds the same content.
+        """
+        tasks = self._data[tasklist_id] = _partitioned(self._data[tasklist_id])
+        active = sum(1 for t in tasks if not _record_flags(t) & _COMPLETED)
+        data = encode_records(tasks, _record_flags, split=active)
+        content = write_back.digest(data)
+        entry = self._manifest[tasklist_id]
+        path = self._cache_path(tasklist_id)
+        if entry.get("digest") != content or not path.exists():
+            atomic_write(path, data)
+            entry["digest"] = content
+            self._dirty_manifest.add(tasklist_id)
+        if entry.get("layout") != _LAYOUT:
+            entry["layout"] = _LAYOUT
+            self._dirty_manifest.add(tasklist_id)
+        self._journal_path(tasklist_id).unlink(missing_ok=True)
+        self._versions[tasklist_id] = self._disk_version(tasklist_id)
+
+    def _save_manifest(self, tasklist_ids: set[str] | None = None) -> None:
+        """Fold the given entries (by default, every changed one) into the manifest on disk.
+
+        Other processes may have changed the manifest since it was read. Their entries are
+        adopted, unless this process has changes of its own to them still to write, and
+        lists whose entry changed are reloaded on their next read.
+        """
+        ids = set(self._dirty_manifest if tasklist_ids is None else tasklist_ids)
+        if not ids:
+            return
+        with self._lock.exclusive():
+            manifest = self._read_manifest() or {}
+            for tasklist_id in ids:
+                if tasklist_id in self._manifest:
+                    manifest[tasklist_id] = self._manifest[tasklist_id]
+                else:
+                    manifest.pop(tasklist_id, None)
+            atomic_write(self._manifest_path(), json.dumps(manifest, indent=2))
+            self._dirty_manifest -= ids
+            for other in (self._manifest.keys() | manifest.keys()) - ids - self._dirty_manifest:
+                if manifest.get(other) != self._manifest.get(other):
+                    self._data.pop(other, None)
+                    if other in manifest:
+                        self._manifest[other] = manifest[other]
+                    else:
+                        self._manifest.pop(other)
+
+    def _disk_version(self, tasklist_id: str) -> tuple[int, ...]:
+        # Snapshots are replaced rather than rewritten and journals only grow, so a file's
+        # inode, mtime and size change whenever any process writes the list.
+        version: list[int] = []
+        for path in (self._cache_path(tasklist_id), self._journal_path(tasklist_id)):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                version += [0, 0, 0]
+            else:
+                version += [st.st_ino, st.st_mtime_ns, st.st_size]
+        return tuple(version)
 
     def _cache_path(self, tasklist_id: str) -> Path:
+        return self._cache_dir / f"{tasklist_id}.rec"
+
+    def _journal_path(self, tasklist_id: str) -> Path:
+        return self._cache_dir / f"{tasklist_id}.log"
+
+    def _legacy_path(self, tasklist_id: str) -> Path:
         return self._cache_dir / f"{tasklist_id}.json"
+
+    def _manifest_path(self) -> Path:
+        return self._cache_dir / _MANIFEST_FILE
+
+
+def _record_flags(task: "Task") -> int:
+    return _COMPLETED if task.get("status") == "completed" else 0
+
+
+def _completed_at(task: "Task") -> str:
+    return task.get("completed", "")
+
+
+def _partitioned(tasks: Sequence["Task"]) -> list["Task"]:
+    # Active tasks first, in the order the API returned them, then completed ones by
+    # completion time. Timsort makes this linear on a list that is already in order.
+    return sorted(tasks, key=_order)
+
+
+def _order(task: "Task") -> tuple[int, str]:
+    flags = _record_flags(task)
+    return flags, _completed_at(task) if flags & _COMPLETED else ""
+
+
+def _applied(tasks: Sequence["Task"], entry: dict[str, Any]) -> Sequence["Task"]:
+    match entry.get("op"):
+        case "merge":
+            return _merged(tasks, entry["tasks"])
+        case "upsert":
+            return _upserted(tasks, entry["tasks"])
+        case "remove":
+            return _removed(tasks, entry["ids"])
+    return tasks
+
+
+def _high_water(tasks: Sequence["Task"], current: str | None) -> str | None:
+    # RFC 3339 timestamps from the API share one format, so they order lexicographically.
+    stamps = [t["updated"] for t in tasks if t.get("updated")]
+    if current is not None:
+        stamps.append(current)
+    return max(stamps, default=None)
+
+
+def _merged(tasks: Sequence["Task"], delta: list["Task"]) -> list["Task"]:
+    # Changed tasks replace their cached copy in place; new and moved ones are inserted by
+    # position, as in _upserted. Deleted and hidden tasks are dropped, matching what a full
+    # fetch returns. The result is kept in segment order, like a snapshot.
+    by_id = {t.get("id"): t for t in delta}
+    merged: list[Task] = []
+    placed: list[Task] = []
+    for task in tasks:
+        change = by_id.pop(task.get("id"), None)
+        if change is None:
+            merged.append(task)
+        elif _is_removed(change):
+            continue
+        elif _moved(task, change):
+            placed.append(change)
+        else:
+            merged.append(change)
+    placed.extend(t for t in by_id.values() if not _is_removed(t))
+    for task in placed:
+        merged.insert(_insert_index(merged, task), task)
+    return _partitioned(merged)
+
+
+def _upserted(tasks: Sequence["Task"], changed: list["Task"]) -> list["Task"]:
+    # Known tasks are replaced in place; new ones are inserted by position.
+    result = list(tasks)
+    index = {t.get("id"): i for i, t in enumerate(result)}
+    for task in changed:
+        i = index.get(task.get("id"))
+        if i is not None:
+            result[i] = task
+        else:
+            result.insert(_insert_index(result, task), task)
+            index = {t.get("id"): i for i, t in enumerate(result)}
+    return _partitioned(result)  # a task completed or reopened changes segment
+
+
+def _removed(tasks: Sequence["Task"], task_ids: list[str]) -> list["Task"]:
+    ids = set(task_ids)
+    return [t for t in tasks if t.get("id") not in ids]
+
+
+def _insert_index(tasks: list["Task"], task: "Task") -> int:
+    # Positions are zero-padded strings ordered among tasks sharing a parent.
+    position, parent = task.get("position"), task.get("parent")
+    if position is not None:
+        for i, other in enumerate(tasks):
+            if other.get("parent") == parent and other.get("position", "") > position:
+                return i
+    return len(tasks)
+
+
+def _moved(task: "Task", change: "Task") -> bool:
+    # A change without a position cannot be placed, so it stays where it was.
+    if change.get("position") is None:
+        return False
+    return (task.get("parent"), task.get("position")) != (
+        change.get("parent"),
+        change.get("position"),
+    )
+
+
+def _is_removed(task: "Task") -> bool:
+    return bool(task.get("deleted") or task.get("hidden"))
@@ -0,0 +1,64 @@
+"""Deferred write-back for the on-disk caches and config.
+
+Outside a session, every change is written as soon as it is made. Inside one, objects
+only record what changed and are flushed once, when the outermost session ends, so a
+command that updates the same state several times serialises and syncs it once.
+"""
+
+import hashlib
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Protocol
+
+
+class Flushable(Protocol):
+    def flush(self) -> None: ...
+
+
+_lock = threading.Lock()
+_depth = 0
+_pending: dict[int, Flushable] = {}
+
+
+def schedule(target: Flushable) -> bool:
+    """Queue target to be flushed when the session ends.
+
+    Returns False outside a session, in which case the caller should flush right away.
+    """
+    with _lock:
+        if _depth == 0:
+            return False
+        _pending.setdefault(id(target), target)
+        return True
+
+
+@contextmanager
+def session() -> Iterator[None]:
+    """Defer writes made inside the block and flush each changed object once at its end."""
+    global _depth
+    with _lock:
+        _depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _depth -= 1
+            targets = list(_pending.values()) if _depth == 0 else []
+            if _depth == 0:
+                _pending.clear()
+        errors: list[Exception] = []
+        for target in targets:
+            try:
+                target.flush()
+            except Exception as e:  # still flush the others
+                errors.append(e)
+        if errors:
+            raise ExceptionGroup("Failed to write back cached state", errors)
+
+
+def digest(data: bytes | str) -> str:
+    """Return a short content hash, used to skip writes that would change nothing."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
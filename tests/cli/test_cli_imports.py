@@ -0,0 +1,62 @@
+"""Import-time regression tests: each subcommand should load only its own module."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from gtasks.cli.cli import _COMMANDS
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Heavy third-party packages that no subcommand should load while building the parser.
+HEAVY_MODULES = {
+    "dateparser",
+    "google.auth",
+    "google.oauth2",
+    "google_auth_oauthlib",
+    "googleapiclient",
+}
+
+_PROBE = """
+import sys
+from unittest.mock import Mock
+
+from gtasks.cli.cli import build_parser
+
+build_parser(Mock(), Mock(), sys.argv[1:])
+print("\\n".join(sys.modules))
+"""
+
+
+def _modules_loaded_for(argv: list[str]) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *argv],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def _parser_modules(modules: set[str]) -> set[str]:
+    return {m for m in modules if m.startswith("gtasks.cli.parsers.")}
+
+
+class TestSubcommandImports:
+    @pytest.mark.parametrize("command", list(_COMMANDS))
+    def test_build_parser_GIVEN_subcommand_THEN_imports_only_its_module(
+        self, command: str
+    ) -> None:
+        modules = _modules_loaded_for([command])
+
+        assert _parser_modules(modules) == {_COMMANDS[command].module}
+        assert modules & HEAVY_MODULES == set()
+
+    def test_build_parser_GIVEN_no_subcommand_THEN_imports_no_parser_modules(self) -> None:
+        modules = _modules_loaded_for([])
+
+        assert _parser_modules(modules) == set()
+        assert modules & HEAVY_MODULES == set()
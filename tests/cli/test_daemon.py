@@ -0,0 +1,123 @@
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest import CaptureFixture
+
+from gtasks.cli import daemon
+from gtasks.cli.daemon import DaemonServer
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # Unix socket paths are capped at ~100 bytes, too short for pytest's tmp_path.
+    with tempfile.TemporaryDirectory(dir="/tmp") as d:
+        yield Path(d) / "d.sock"
+
+
+@pytest.fixture
+def mock_client() -> Mock:
+    client = Mock()
+    client.get_tasklists.return_value = [{"id": "list1", "title": "Work"}]
+    return client
+
+
+@pytest.fixture
+def client_factory(mock_client: Mock) -> Mock:
+    return Mock(return_value=mock_client)
+
+
+@pytest.fixture
+def server(
+    socket_path: Path, client_factory: Mock, tmp_path: Path
+) -> Iterator[DaemonServer]:
+    srv = DaemonServer(socket_path, client_factory, tmp_path / "config.toml")
+    thread = threading.Thread(target=srv.serve_forever)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    thread.join()
+    srv.server_close()
+
+
+class TestForward:
+    def test_forward_GIVEN_no_daemon_THEN_returns_none(self, socket_path: Path) -> None:
+        assert daemon.forward(["lists"], socket_path) is None
+
+    def test_forward_GIVEN_stale_socket_file_THEN_returns_none(self, socket_path: Path) -> None:
+        socket_path.touch()
+
+        assert daemon.forward(["lists"], socket_path) is None
+
+    def test_forward_GIVEN_daemon_THEN_runs_command_on_its_client(
+        self,
+        server: DaemonServer,
+        socket_path: Path,
+        mock_client: Mock,
+        capsys: CaptureFixture[str],
+    ) -> None:
+        code = daemon.forward(["lists"], socket_path)
+
+        assert code == 0
+        assert "Work" in capsys.readouterr().out
+        mock_client.get_tasklists.assert_called_once()
+
+    def test_forward_GIVEN_repeated_calls_THEN_reuses_one_client(
+        self, server: DaemonServer, socket_path: Path, client_factory: Mock
+    ) -> None:
+        daemon.forward(["lists"], socket_path)
+        daemon.forward(["lists"], socket_path)
+
+        client_factory.assert_called_once()
+
+    def test_forward_GIVEN_command_error_THEN_returns_exit_code_and_output(
+        self, server: DaemonServer, socket_path: Path, capsys: CaptureFixture[str]
+    ) -> None:
+        code = daemon.forward(["config", "nonexistent"], socket_path)
+
+        assert code == 1
+        assert "Unknown key" in capsys.readouterr().out
+
+    def test_forward_GIVEN_prompting_command_THEN_falls_back_and_reloads_client(
+        self,
+        server: DaemonServer,
+        socket_path: Path,
+        client_factory: Mock,
+        mock_client: Mock,
+        capsys: CaptureFixture[str],
+    ) -> None:
+        mock_client.get_tasklists.return_value = [
+            {"id": "list1", "title": "Work"},
+            {"id": "list2", "title": "Personal"},
+        ]
+
+        code = daemon.forward(["use"], socket_path)  # interactive picker reads stdin
+
+        assert code is None
+        assert capsys.readouterr().out == ""
+        daemon.forward(["lists"], socket_path)
+        assert client_factory.call_count == 2
+
+
+class TestStop:
+    def test_stop_GIVEN_running_daemon_THEN_shuts_down(
+        self, socket_path: Path, client_factory: Mock, tmp_path: Path
+    ) -> None:
+        thread = threading.Thread(
+            target=daemon.serve, args=(socket_path, client_factory, tmp_path / "config.toml")
+        )
+        thread.start()
+        while not daemon.is_running(socket_path):
+            pass
+
+        assert daemon.stop(socket_path) is True
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert not socket_path.exists()
+
+    def test_stop_GIVEN_no_daemon_THEN_returns_false(self, socket_path: Path) -> None:
+        assert daemon.stop(socket_path) is False
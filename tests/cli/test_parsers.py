@@ -14,7 +14,10 @@ from gtasks.cli.parsers.config_parser import cmd_config
 from gtasks.cli.parsers.delete_parser import cmd_delete
 from gtasks.cli.parsers.done_parser import cmd_done
 from gtasks.cli.parsers.lists_parser import cmd_list_tasklists
+from gtasks.cli.parsers.refresh_parser import cmd_refresh
 from gtasks.cli.parsers.tasks_parser import cmd_list_tasks
+from gtasks.client.batch import BatchError, ItemResult
+from gtasks.client.cached_api_client import CachedApiClient
 from gtasks.utils.config import Config, ConfigKey
 
 # =============================================================================
@@ -45,6 +48,39 @@ def parser(mock_client: Mock, config: Config) -> argparse.ArgumentParser:
 # =============================================================================
 
 
+class TestBuildParserDispatch:
+    """Test that build_parser only fully registers the dispatched subcommand."""
+
+    def test_build_parser_GIVEN_argv_THEN_parses_dispatched_subcommand(
+        self, mock_client: Mock, config: Config
+    ) -> None:
+        argv = ["lists", "-n", "3", "--show-ids"]
+
+        args = build_parser(mock_client, config, argv).parse_args(argv)
+
+        assert args.command == "lists"
+        assert args.limit == 3
+        assert args.show_ids is True
+
+    def test_build_parser_GIVEN_argv_THEN_other_subcommands_are_stubs(
+        self, mock_client: Mock, config: Config
+    ) -> None:
+        parser = build_parser(mock_client, config, ["lists"])
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["add", "Task", "-l", "Work"])
+
+    def test_build_parser_GIVEN_no_subcommand_THEN_defaults_to_listing_tasks(
+        self, mock_client: Mock, config: Config
+    ) -> None:
+        args = build_parser(mock_client, config, []).parse_args([])
+
+        with patch("gtasks.cli.parsers.tasks_parser.cmd_list_tasks") as mock_cmd:
+            args.func(args)
+
+        mock_cmd.assert_called_once_with(args, client=mock_client, cfg=config)
+
+
 class TestAddParserArgs:
     """Test argument parsing for the 'add' subcommand."""
 
@@ -275,6 +311,16 @@ class TestConfigParserArgs:
         assert args.value == "Work"
 
 
+class TestRefreshParserArgs:
+    """Test argument parsing for the 'refresh' subcommand."""
+
+    def test_refresh_GIVEN_all_flag_THEN_all_is_true(self, parser: argparse.ArgumentParser) -> None:
+        args = parser.parse_args(["refresh", "--all"])
+
+        assert args.all is True
+        assert args.full is False
+
+
 # =============================================================================
 # Command Handler Tests
 # =============================================================================
@@ -443,7 +489,7 @@ class TestCmdListTasks:
         base_args: dict,
         sample_tasks: list[dict],
     ) -> None:
-        mock_client.get_tasks.return_value = sample_tasks
+        mock_client.iter_tasks.return_value = iter(sample_tasks)
         base_args["tasklist_title"] = "Work"
         args = argparse.Namespace(**base_args)
 
@@ -451,7 +497,7 @@ class TestCmdListTasks:
             mock_prompt.return_value = "list1"
             cmd_list_tasks(args, mock_client, config)
 
-        mock_client.get_tasks.assert_called_once_with("list1", None, show_completed=False)
+        mock_client.iter_tasks.assert_called_once_with("list1", None, show_completed=False)
 
     def test_cmd_list_tasks_GIVEN_no_title_but_config_default_THEN_uses_config(
         self,
@@ -461,7 +507,7 @@ class TestCmdListTasks:
         sample_tasks: list[dict],
     ) -> None:
         config.set(ConfigKey.DEFAULT_TASKLIST_TITLE, "Work")
-        mock_client.get_tasks.return_value = sample_tasks
+        mock_client.iter_tasks.return_value = iter(sample_tasks)
         args = argparse.Namespace(**base_args)
 
         with patch(
@@ -470,7 +516,7 @@ class TestCmdListTasks:
             mock_prompt.return_value = "list1"
             cmd_list_tasks(args, mock_client, config)
 
-        mock_client.get_tasks.assert_called_once()
+        mock_client.iter_tasks.assert_called_once()
 
     def test_cmd_list_tasks_GIVEN_show_ids_THEN_includes_ids_in_output(
         self,
@@ -480,7 +526,7 @@ class TestCmdListTasks:
         sample_tasks: list[dict],
         capsys: CaptureFixture[str],
     ) -> None:
-        mock_client.get_tasks.return_value = sample_tasks
+        mock_client.iter_tasks.return_value = iter(sample_tasks)
         base_args["tasklist_title"] = "Work"
         base_args["show_ids"] = True
         args = argparse.Namespace(**base_args)
@@ -503,7 +549,7 @@ class TestCmdListTasks:
         sample_tasks: list[dict],
         capsys: CaptureFixture[str],
     ) -> None:
-        mock_client.get_tasks.return_value = sample_tasks
+        mock_client.iter_tasks.return_value = iter(sample_tasks)
         base_args["tasklist_title"] = "Work"
         args = argparse.Namespace(**base_args)
 
@@ -682,6 +728,29 @@ class TestCmdConfig:
         assert exc.value.code == 1
         assert "Unknown key" in capsys.readouterr().out
 
+    @pytest.mark.parametrize(
+        ("key", "value"),
+        [("http_pool_size", "ten"), ("api_rate_limit", "fast"), ("cache_backend", "redis")],
+    )
+    def test_cmd_config_GIVEN_invalid_value_THEN_exits_without_setting(
+        self, config: Config, capsys: CaptureFixture[str], key: str, value: str
+    ) -> None:
+        args = argparse.Namespace(key=key, value=value)
+
+        with pytest.raises(SystemExit) as exc:
+            cmd_config(args, config)
+
+        assert exc.value.code == 1
+        assert "Invalid value" in capsys.readouterr().out
+        assert config.get(ConfigKey(key)) is None
+
+    def test_cmd_config_GIVEN_valid_numeric_value_THEN_sets(self, config: Config) -> None:
+        args = argparse.Namespace(key="cache_fresh_ttl", value="30")
+
+        cmd_config(args, config)
+
+        assert config.get(ConfigKey.CACHE_FRESH_TTL) == "30"
+
 
 class TestCmdDone:
     """Test the cmd_done command handler."""
@@ -777,6 +846,25 @@ class TestCmdDelete:
         assert "Buy milk" in output
         assert "Walk dog" in output
 
+    def test_cmd_delete_GIVEN_partial_failure_THEN_prints_deleted_and_raises(
+        self, mock_client: Mock, config: Config, capsys: CaptureFixture[str]
+    ) -> None:
+        config.set(ConfigKey.DEFAULT_TASKLIST_TITLE, "Work")
+        mock_client.resolve_tasklist_from_title.return_value = [{"id": "list1", "title": "Work"}]
+        mock_client.get_tasks.return_value = self.SAMPLE_TASKS
+        mock_client.delete_tasks.side_effect = BatchError(
+            "batch delete_tasks failed",
+            [ItemResult(self.SAMPLE_TASKS[0]), ItemResult(self.SAMPLE_TASKS[1], error=OSError())],
+        )
+        args = argparse.Namespace(tasks=["1", "2"], tasklist_title=None)
+
+        with pytest.raises(BatchError):
+            cmd_delete(args, mock_client, config)
+
+        output = capsys.readouterr().out
+        assert "Deleted: Buy milk" in output
+        assert "Walk dog" not in output
+
     def test_cmd_delete_GIVEN_no_tasklist_THEN_exits(
         self, mock_client: Mock, config: Config
     ) -> None:
@@ -786,3 +874,27 @@ class TestCmdDelete:
             cmd_delete(args, mock_client, config)
 
         assert exc.value.code == 1
+
+
+class TestCmdRefresh:
+    """Test the cmd_refresh command handler."""
+
+    def test_cmd_refresh_GIVEN_all_THEN_prefetches_every_list_with_progress_on_stderr(
+        self, capsys: CaptureFixture[str]
+    ) -> None:
+        client = Mock(spec=CachedApiClient)
+
+        def refresh_all(full: bool, on_progress) -> list[dict]:
+            for done in (1, 2):
+                on_progress(done, 2)
+            return [{"id": "list1"}, {"id": "list2"}]
+
+        client.refresh_all.side_effect = refresh_all
+        args = argparse.Namespace(full=False, all=True)
+
+        cmd_refresh(args, client)
+
+        client.refresh_cache.assert_not_called()
+        captured = capsys.readouterr()
+        assert "2 task list(s) loaded" in captured.out
+        assert "Fetching tasks: 2/2 list(s)" in captured.err
@@ -0,0 +1,167 @@
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+
+class FakeTasksServer:
+    """In-memory stand-in for the Tasks REST API, served over HTTP on localhost.
+
+    Lists are paged maxResults at a time, with the offset of the next page as its token,
+    and answer 304 to an If-None-Match matching their etag. Tests can queue error statuses
+    with fail, slow every response down with delay, or hold responses until release is set.
+    """
+
+    def __init__(self) -> None:
+        self.tasklists: dict[str, dict] = {}
+        self.tasks: dict[str, dict[str, dict]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.failures: list[int] = []
+        self.delay = 0.0
+        self.release = threading.Event()
+        self.release.set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}/tasks/v1/"
+
+    def add_tasklist(self, title: str) -> str:
+        list_id = self._new_id("list")
+        self.tasklists[list_id] = {"id": list_id, "title": title, "updated": "2026-01-01"}
+        self.tasks[list_id] = {}
+        return list_id
+
+    def add_task(self, list_id: str, title: str, **fields) -> str:
+        task_id = self._new_id("task")
+        self.tasks[list_id][task_id] = {
+            "id": task_id,
+            "title": title,
+            "status": "needsAction",
+            "updated": "2026-01-01T00:00:00.000Z",
+            **fields,
+        }
+        return task_id
+
+    def fail(self, *statuses: int) -> None:
+        """Answer the next requests with these error statuses, in order."""
+        self.failures.extend(statuses)
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self.release.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"{prefix}{self._next_id}"
+
+    def handle(self, method: str, url: str, headers, body: bytes) -> tuple[int, dict | None]:
+        parts = urlsplit(url)
+        path = [unquote(p) for p in parts.path.removeprefix("/tasks/v1/").split("/")]
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        with self._lock:
+            self.requests.append((method, "/".join(path)))
+            if self.failures:
+                return self.failures.pop(0), {"error": {"message": "injected"}}
+        match method, path:
+            case "GET", ["users", "@me", "lists"]:
+                return self._listing(list(self.tasklists.values()), query, headers)
+            case "GET", ["lists", list_id, "tasks"]:
+                tasks = [
+                    t
+                    for t in self.tasks[list_id].values()
+                    if query.get("showCompleted") != "false" or t["status"] != "completed"
+                ]
+                return self._listing(tasks, query, headers)
+            case "POST", ["lists", list_id, "tasks"]:
+                task_id = self.add_task(list_id, **json.loads(body))
+                return 200, self.tasks[list_id][task_id]
+            case "PATCH", ["lists", list_id, "tasks", task_id]:
+                if task_id not in self.tasks[list_id]:
+                    return 404, {"error": {"message": "not found"}}
+                self.tasks[list_id][task_id].update(json.loads(body))
+                return 200, self.tasks[list_id][task_id]
+            case "DELETE", ["lists", list_id, "tasks", task_id]:
+                if self.tasks[list_id].pop(task_id, None) is None:
+                    return 404, {"error": {"message": "not found"}}
+                return 204, None
+        return 404, {"error": {"message": "no such endpoint"}}
+
+    def _listing(self, items: list[dict], query: dict[str, str], headers) -> tuple[int, dict]:
+        etag = f'"{hash(json.dumps(items, sort_keys=True))}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, None
+        start = int(query.get("pageToken", 0))
+        end = start + int(query.get("maxResults", 100))
+        page: dict = {"etag": etag, "items": items[start:end]}
+        if end < len(items):
+            page["nextPageToken"] = str(end)
+        return 200, page
+
+
+def _handler(server: FakeTasksServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def _serve(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            with server._lock:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            try:
+                server.release.wait()
+                if server.delay:
+                    threading.Event().wait(server.delay)
+                status, payload = server.handle(self.command, self.path, self.headers, body)
+            finally:
+                with server._lock:
+                    server.in_flight -= 1
+            content = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            if content:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+    return Handler
+
+
+@pytest.fixture
+def tasks_server() -> Iterator[FakeTasksServer]:
+    server = FakeTasksServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def tasks_service(tasks_server: FakeTasksServer) -> Any:
+    """A discovery Tasks resource, over its default httplib2 transport, aimed at tasks_server."""
+    from google.auth.credentials import AnonymousCredentials
+    from googleapiclient.discovery import build
+
+    return build(
+        "tasks",
+        "v1",
+        credentials=AnonymousCredentials(),
+        client_options={"api_endpoint": tasks_server.base_url.removesuffix("tasks/v1/")},
+    )
@@ -1,8 +1,21 @@
-from unittest.mock import MagicMock
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
 
+import httplib2
 import pytest
+from googleapiclient.errors import HttpError
 
 from gtasks.client.api_client import ApiClient
+from gtasks.client.batch import BatchError
+from gtasks.client.retry import RateLimiter, RequestExecutor
+
+if TYPE_CHECKING:
+    from tests.client.conftest import FakeTasksServer
+
+TASKS_MASK = "nextPageToken,items(id,title,status,due,notes,parent,position,updated,completed)"
+TASKLISTS_MASK = "nextPageToken,items(id,title,updated,etag)"
 
 
 @pytest.fixture
@@ -15,6 +28,30 @@ def api_client(service: MagicMock) -> ApiClient:
     return ApiClient(service)
 
 
+class TestLazyService:
+    def test_init_GIVEN_no_service_or_provider_THEN_raises(self) -> None:
+        with pytest.raises(ValueError):
+            ApiClient()
+
+    def test_init_GIVEN_provider_THEN_does_not_build_service(self) -> None:
+        provider = MagicMock()
+
+        ApiClient(service_provider=provider)
+
+        provider.assert_not_called()
+
+    def test_request_GIVEN_provider_THEN_builds_service_once(self) -> None:
+        service = MagicMock()
+        service.tasklists().list().execute.return_value = {"items": []}
+        provider = MagicMock(return_value=service)
+        api_client = ApiClient(service_provider=provider)
+
+        api_client.get_tasklists()
+        api_client.get_tasklists()
+
+        provider.assert_called_once_with()
+
+
 class TestGetTasklists:
     MAX_TASKLISTS = 3
     PAGE1_ITEMS = [{"id": "list1", "title": "My Tasks"}]
@@ -91,6 +128,15 @@ class TestGetTasklists:
         assert len(result) == 2
         assert service.tasklists().list.call_count == 2  # page 3 not reached
 
+    def test_get_tasklists_THEN_requests_partial_response(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasklists().list().execute.return_value = {"items": []}
+
+        api_client.get_tasklists()
+
+        service.tasklists().list.assert_called_with(fields=TASKLISTS_MASK, maxResults=1000)
+
 
 class TestGetTasks:
     TASKLIST_ID = "tasklist123"
@@ -130,7 +176,9 @@ class TestGetTasks:
         result = api_client.get_tasks(self.TASKLIST_ID)
 
         assert result == expected_tasks
-        service.tasks().list.assert_called_with(tasklist=self.TASKLIST_ID, showCompleted=True)
+        service.tasks().list.assert_called_with(
+            tasklist=self.TASKLIST_ID, showCompleted=True, fields=TASKS_MASK, maxResults=100
+        )
 
     def test_get_tasks_GIVEN_empty_items_THEN_returns_empty_list(
         self, service: MagicMock, api_client: ApiClient
@@ -181,7 +229,7 @@ class TestGetTasks:
         api_client.get_tasks(self.TASKLIST_ID, show_completed=False)
 
         service.tasks().list.assert_called_with(
-            tasklist=self.TASKLIST_ID, showCompleted=False
+            tasklist=self.TASKLIST_ID, showCompleted=False, fields=TASKS_MASK, maxResults=100
         )
 
     def test_get_tasks_GIVEN_completed_min_THEN_passes_to_api(
@@ -193,7 +241,11 @@ class TestGetTasks:
         api_client.get_tasks(self.TASKLIST_ID, completed_min=cutoff)
 
         service.tasks().list.assert_called_with(
-            tasklist=self.TASKLIST_ID, showCompleted=True, completedMin=cutoff
+            tasklist=self.TASKLIST_ID,
+            showCompleted=True,
+            completedMin=cutoff,
+            fields=TASKS_MASK,
+            maxResults=100,
         )
 
     def test_get_tasks_GIVEN_no_completed_min_THEN_omits_from_api(
@@ -206,6 +258,170 @@ class TestGetTasks:
         call_kwargs = service.tasks().list.call_args.kwargs
         assert "completedMin" not in call_kwargs
 
+    def test_get_tasks_GIVEN_fields_THEN_requests_only_those_fields(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": []}
+
+        api_client.get_tasks(self.TASKLIST_ID, fields=("id", "title"))
+
+        assert service.tasks().list.call_args.kwargs["fields"] == "nextPageToken,items(id,title)"
+
+    def test_get_tasks_GIVEN_updated_min_THEN_passes_delta_params_to_api(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        since = "2026-04-22T00:00:00.000Z"
+        service.tasks().list().execute.return_value = {"items": []}
+
+        api_client.get_tasks(
+            self.TASKLIST_ID, updated_min=since, show_deleted=True, show_hidden=True
+        )
+
+        call_kwargs = service.tasks().list.call_args.kwargs
+        assert call_kwargs["updatedMin"] == since
+        assert call_kwargs["showDeleted"] is True
+        assert call_kwargs["showHidden"] is True
+
+    def test_get_tasks_GIVEN_no_updated_min_THEN_omits_delta_params(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": []}
+
+        api_client.get_tasks(self.TASKLIST_ID)
+
+        call_kwargs = service.tasks().list.call_args.kwargs
+        assert not {"updatedMin", "showDeleted", "showHidden"} & call_kwargs.keys()
+
+
+class TestIterTasks:
+    TASKLIST_ID = "tasklist123"
+    PAGES = {
+        None: {"items": [{"id": "task1"}, {"id": "task2"}], "nextPageToken": "token1"},
+        "token1": {"items": [{"id": "task3"}], "nextPageToken": "token2"},
+        "token2": {"items": [{"id": "task4"}]},
+    }
+
+    def _mock_paginated_list(self, **kwargs) -> MagicMock:
+        mock = MagicMock()
+        mock.execute.return_value = self.PAGES[kwargs.get("pageToken")]
+        return mock
+
+    def test_iter_tasks_GIVEN_multiple_pages_THEN_yields_all_items_in_order(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list.side_effect = self._mock_paginated_list
+
+        result = list(api_client.iter_tasks(self.TASKLIST_ID))
+
+        assert [t["id"] for t in result] == ["task1", "task2", "task3", "task4"]
+
+    def test_iter_tasks_GIVEN_no_limit_THEN_requests_max_page_size(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list.side_effect = self._mock_paginated_list
+
+        list(api_client.iter_tasks(self.TASKLIST_ID))
+
+        page_sizes = {c.kwargs["maxResults"] for c in service.tasks().list.call_args_list}
+        assert page_sizes == {100}
+
+    def test_iter_tasks_GIVEN_limit_THEN_requests_only_remainder(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list.side_effect = self._mock_paginated_list
+
+        list(api_client.iter_tasks(self.TASKLIST_ID, max_results=3))
+
+        first_call = service.tasks().list.call_args_list[0]
+        second_call = service.tasks().list.call_args_list[1]
+        assert first_call.kwargs["maxResults"] == 3
+        assert second_call.kwargs["maxResults"] == 1  # 2 items already received
+
+    def test_iter_tasks_GIVEN_limit_reached_THEN_stops_fetching(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list.side_effect = self._mock_paginated_list
+
+        result = list(api_client.iter_tasks(self.TASKLIST_ID, max_results=2))
+
+        assert len(result) == 2
+        assert service.tasks().list.call_count == 1
+
+    def test_iter_tasks_GIVEN_consumer_stops_early_THEN_fetches_at_most_one_page_ahead(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service.tasks().list.side_effect = self._mock_paginated_list
+
+        it = api_client.iter_tasks(self.TASKLIST_ID)
+        next(it)
+        it.close()
+
+        assert service.tasks().list.call_count <= 2
+
+
+class TestListIfChanged:
+    TASKLIST_ID = "tasklist123"
+
+    @pytest.fixture
+    def request_mock(self, service: MagicMock) -> MagicMock:
+        request = MagicMock()
+        request.headers = {}
+        service.tasks().list.return_value = request
+        return request
+
+    def test_list_tasks_if_changed_GIVEN_etag_THEN_sends_if_none_match(
+        self, api_client: ApiClient, request_mock: MagicMock
+    ) -> None:
+        request_mock.execute.return_value = {"items": [], "etag": '"v2"'}
+
+        api_client.list_tasks_if_changed(self.TASKLIST_ID, etag='"v1"')
+
+        assert request_mock.headers["If-None-Match"] == '"v1"'
+
+    def test_list_tasks_if_changed_GIVEN_single_page_THEN_returns_items_and_etag(
+        self, api_client: ApiClient, request_mock: MagicMock, service: MagicMock
+    ) -> None:
+        request_mock.execute.return_value = {"items": [{"id": "task1"}], "etag": '"v2"'}
+
+        listing = api_client.list_tasks_if_changed(self.TASKLIST_ID)
+
+        assert listing.items == [{"id": "task1"}]
+        assert listing.etag == '"v2"'
+        assert service.tasks().list.call_args.kwargs["fields"].startswith("etag,")
+
+    def test_list_tasks_if_changed_GIVEN_not_modified_THEN_returns_none(
+        self, api_client: ApiClient, request_mock: MagicMock
+    ) -> None:
+        request_mock.execute.side_effect = HttpError(httplib2.Response({"status": 304}), b"")
+
+        assert api_client.list_tasks_if_changed(self.TASKLIST_ID, etag='"v1"') is None
+
+    def test_list_tasks_if_changed_GIVEN_other_http_error_THEN_raises(
+        self, api_client: ApiClient, request_mock: MagicMock
+    ) -> None:
+        request_mock.execute.side_effect = HttpError(httplib2.Response({"status": 403}), b"")
+
+        with pytest.raises(HttpError):
+            api_client.list_tasks_if_changed(self.TASKLIST_ID, etag='"v1"')
+
+    def test_list_tasks_if_changed_GIVEN_multiple_pages_THEN_returns_all_items_without_etag(
+        self, api_client: ApiClient, service: MagicMock
+    ) -> None:
+        first_page = MagicMock(headers={})
+        first_page.execute.return_value = {
+            "items": [{"id": "task1"}],
+            "nextPageToken": "token1",
+            "etag": '"v2"',
+        }
+        second_page = MagicMock()
+        second_page.execute.return_value = {"items": [{"id": "task2"}]}
+        service.tasks().list.side_effect = [first_page, second_page]
+
+        listing = api_client.list_tasks_if_changed(self.TASKLIST_ID)
+
+        assert [t["id"] for t in listing.items] == ["task1", "task2"]
+        assert listing.etag is None
+
 
 class TestAddTask:
     TASKLIST_ID = "tasklist123"
@@ -338,8 +554,153 @@ class TestDeleteTasks:
         batch_mock.execute.side_effect = fake_execute_with_error
         service.new_batch_http_request.return_value = batch_mock
 
-        with pytest.raises(ExceptionGroup):
-            api_client.delete_tasks(self.TASKLIST_ID, self.SAMPLE_TASKS[:1])
+        with pytest.raises(BatchError) as exc:
+            api_client.delete_tasks(self.TASKLIST_ID, self.SAMPLE_TASKS)
+
+        assert [r.ok for r in exc.value.results] == [False, True, True]
+
+    def test_delete_tasks_GIVEN_single_task_THEN_sends_plain_request(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        result = api_client.delete_tasks(self.TASKLIST_ID, self.SAMPLE_TASKS[:1])
+
+        service.new_batch_http_request.assert_not_called()
+        service.tasks().delete.assert_called_with(tasklist=self.TASKLIST_ID, task="task1")
+        assert result == self.SAMPLE_TASKS[:1]
+
+
+class TestRetries:
+    @pytest.fixture
+    def api_client(self, service: MagicMock) -> ApiClient:
+        return ApiClient(service, executor=RequestExecutor(base_delay=0))
+
+    def test_GIVEN_transient_error_THEN_retries_request(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        request = service.tasks().patch.return_value
+        request.execute.side_effect = [
+            HttpError(httplib2.Response({"status": 503}), b""),
+            {"id": "task1", "status": "completed"},
+        ]
+
+        assert api_client.complete_task("list1", "task1")["status"] == "completed"
+        assert request.execute.call_count == 2
+
+    def test_GIVEN_dns_failure_over_httplib2_THEN_retries_request(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        request = service.tasks().delete.return_value
+        request.execute.side_effect = [httplib2.ServerNotFoundError("no DNS"), None]
+
+        api_client.delete_task("list1", "task1")
+
+        assert request.execute.call_count == 2
+
+    def test_add_task_GIVEN_server_error_THEN_does_not_retry_insert(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        request = service.tasks().insert.return_value
+        request.execute.side_effect = HttpError(httplib2.Response({"status": 503}), b"")
+
+        with pytest.raises(HttpError):
+            api_client.add_task("list1", "Buy milk")
+
+        request.execute.assert_called_once()
+
+    def test_add_task_GIVEN_rate_limited_THEN_retries_insert(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        request = service.tasks().insert.return_value
+        request.execute.side_effect = [
+            HttpError(httplib2.Response({"status": 429}), b""),
+            {"id": "task1"},
+        ]
+
+        assert api_client.add_task("list1", "Buy milk") == {"id": "task1"}
+
+    def test_delete_tasks_GIVEN_failing_task_THEN_sends_it_max_retries_plus_one_times(
+        self, service: MagicMock
+    ) -> None:
+        limiter = RateLimiter(rate=1000, burst=1000)
+        api_client = ApiClient(
+            service, executor=RequestExecutor(max_retries=2, base_delay=0, limiter=limiter)
+        )
+        request = service.tasks().delete.return_value
+        request.execute.side_effect = HttpError(httplib2.Response({"status": 429}), b"")
+
+        with patch("gtasks.client.batch.time.sleep"), pytest.raises(BatchError):
+            api_client.delete_tasks("list1", [{"id": "task1"}])
+
+        assert request.execute.call_count == 3
+        assert limiter.rate == 1000 * 0.5**3  # halved once per 429
+
+
+class TestThreadSafeTransport:
+    def test_GIVEN_thread_safe_transport_THEN_requests_skip_the_io_lock(
+        self, service: MagicMock, api_client: ApiClient
+    ) -> None:
+        service._http.thread_safe = True
+
+        with api_client._io_lock:  # would deadlock if the request waited for it
+            api_client.delete_task("list1", "task1")
+
+        service.tasks().delete().execute.assert_called_once()
+
+
+class TestConcurrentCallers:
+    @pytest.fixture
+    def client(self, tasks_service: Any) -> ApiClient:
+        return ApiClient(tasks_service, executor=RequestExecutor(base_delay=0))
+
+    def _wait_for_in_flight(self, server: FakeTasksServer, count: int) -> None:
+        for _ in range(500):
+            if server.in_flight >= count:
+                return
+            threading.Event().wait(0.01)
+        raise AssertionError(f"{count} request(s) never reached the server")
+
+    def test_GIVEN_threads_reading_different_lists_THEN_requests_overlap(
+        self, client: ApiClient, tasks_server: FakeTasksServer
+    ) -> None:
+        list_ids = [tasks_server.add_tasklist(f"List {i}") for i in range(4)]
+        for list_id in list_ids:
+            tasks_server.add_task(list_id, "Task")
+        tasks_server.delay = 0.1
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(client.get_tasks, list_ids))
+
+        assert [len(tasks) for tasks in results] == [1, 1, 1, 1]
+        assert tasks_server.max_in_flight > 1
+
+    def test_GIVEN_threads_reading_same_list_THEN_sends_one_request(
+        self, client: ApiClient, tasks_server: FakeTasksServer
+    ) -> None:
+        list_id = tasks_server.add_tasklist("Inbox")
+        tasks_server.add_task(list_id, "Task")
+        tasks_server.release.clear()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(client.get_tasks, list_id)
+            self._wait_for_in_flight(tasks_server, 1)
+            second = pool.submit(client.get_tasks, list_id)
+            threading.Event().wait(0.2)  # let the second caller join the request
+            tasks_server.release.set()
+
+        assert len(tasks_server.requests) == 1
+        first.result()[0]["title"] = "Changed"
+        assert second.result()[0]["title"] == "Task"  # callers don't share a response
+
+    def test_GIVEN_concurrent_writes_THEN_sends_each(
+        self, client: ApiClient, tasks_server: FakeTasksServer
+    ) -> None:
+        list_id = tasks_server.add_tasklist("Inbox")
+        tasks_server.delay = 0.05
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda i: client.add_task(list_id, "Same"), range(3)))
+
+        assert len(tasks_server.tasks[list_id]) == 3
 
 
 class TestCompleteTasks:
@@ -396,4 +757,4 @@ class TestCompleteTasks:
         service.new_batch_http_request.return_value = batch_mock
 
         with pytest.raises(ExceptionGroup):
-            api_client.complete_tasks(self.TASKLIST_ID, self.SAMPLE_TASKS[:1])
+            api_client.complete_tasks(self.TASKLIST_ID, self.SAMPLE_TASKS)
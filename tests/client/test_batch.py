@@ -0,0 +1,204 @@
+import threading
+from collections import Counter
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from gtasks.client.batch import BatchError, ItemResult, run_batch
+from gtasks.client.retry import status_of
+
+
+def _http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class FakeRequest:
+    def __init__(self, item: int, responder) -> None:
+        self.item = item
+        self._responder = responder
+
+    def execute(self):
+        return self._responder(self.item)
+
+
+class FakeBatch:
+    def __init__(self, callback, on_execute=None) -> None:
+        self.requests: list[tuple[str, FakeRequest]] = []
+        self._callback = callback
+        self._on_execute = on_execute
+
+    def add(self, request: FakeRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        if self._on_execute is not None:
+            self._on_execute(self)
+        for request_id, request in self.requests:
+            try:
+                response, error = request.execute(), None
+            except Exception as e:
+                response, error = None, e
+            self._callback(request_id, response, error)
+
+
+class Harness:
+    """Records every batch and request sent, answering each item via responder."""
+
+    def __init__(self, responder=lambda item: {"id": item}, on_execute=None) -> None:
+        self.batches: list[FakeBatch] = []
+        self.sent: Counter[int] = Counter()
+        self._responder = responder
+        self._on_execute = on_execute
+        self._lock = threading.Lock()
+
+    def build_request(self, item: int) -> FakeRequest:
+        return FakeRequest(item, self._respond)
+
+    def new_batch(self, callback) -> FakeBatch:
+        batch = FakeBatch(callback, self._on_execute)
+        with self._lock:
+            self.batches.append(batch)
+        return batch
+
+    def run(self, items, **kwargs) -> list[ItemResult[int]]:
+        return run_batch(
+            items, self.build_request, self.new_batch, lambda r, cost=1: r.execute(), **kwargs
+        )
+
+    def _respond(self, item: int):
+        with self._lock:
+            self.sent[item] += 1
+        return self._responder(item)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("gtasks.client.batch.time.sleep") as sleep:
+        yield sleep
+
+
+class TestRunBatch:
+    def test_GIVEN_many_items_THEN_splits_into_capped_chunks_and_keeps_order(self) -> None:
+        harness = Harness()
+
+        results = harness.run(list(range(120)), batch_size=50)
+
+        assert sorted(len(b.requests) for b in harness.batches) == [20, 50, 50]
+        assert [r.response for r in results] == [{"id": i} for i in range(120)]
+        assert all(r.ok for r in results)
+
+    def test_GIVEN_single_item_THEN_sends_plain_request(self) -> None:
+        harness = Harness()
+
+        results = harness.run([7])
+
+        assert harness.batches == []
+        assert results == [ItemResult(7, {"id": 7})]
+
+    def test_GIVEN_several_chunks_THEN_sends_them_concurrently(self) -> None:
+        # Both chunks must be in flight at once to get past the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+        harness = Harness(on_execute=lambda batch: barrier.wait())
+
+        results = harness.run(list(range(4)), batch_size=2, max_workers=2)
+
+        assert all(r.ok for r in results)
+
+    def test_GIVEN_transient_failure_THEN_resends_only_failed_items(self, no_sleep) -> None:
+        failures = {3: [_http_error(503)], 5: [_http_error(429), _http_error(500)]}
+
+        def responder(item: int):
+            if failures.get(item):
+                raise failures[item].pop(0)
+            return {"id": item}
+
+        harness = Harness(responder)
+
+        results = harness.run(list(range(8)))
+
+        assert all(r.ok for r in results)
+        assert harness.sent == Counter({**{i: 1 for i in range(8)}, 3: 2, 5: 3})
+        assert no_sleep.call_count == 2
+
+    def test_GIVEN_permanent_failure_THEN_reports_it_without_resending(self) -> None:
+        not_found = _http_error(404)
+
+        def responder(item: int):
+            if item == 1:
+                raise not_found
+            return {"id": item}
+
+        harness = Harness(responder)
+
+        results = harness.run([0, 1, 2])
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].error is not_found
+        assert harness.sent[1] == 1
+
+    def test_GIVEN_failed_batch_THEN_leaves_resending_it_to_execute(self) -> None:
+        def on_execute(batch: FakeBatch) -> None:
+            raise ConnectionError("reset")
+
+        harness = Harness(on_execute=on_execute)
+
+        results = harness.run([0, 1], attempts=2)
+
+        assert len(harness.batches) == 1
+        assert all(isinstance(r.error, ConnectionError) for r in results)
+
+    def test_GIVEN_single_item_transient_failure_THEN_leaves_resending_it_to_execute(
+        self,
+    ) -> None:
+        def responder(item: int):
+            raise _http_error(503)
+
+        harness = Harness(responder)
+
+        results = harness.run([0])
+
+        assert status_of(results[0].error) == 503
+        assert harness.sent[0] == 1
+
+    def test_GIVEN_rate_limited_sub_requests_THEN_reports_throttling_once_per_round(
+        self,
+    ) -> None:
+        failures = {1: [_http_error(429)], 2: [_http_error(429)]}
+
+        def responder(item: int):
+            if failures.get(item):
+                raise failures[item].pop(0)
+            return {"id": item}
+
+        throttled = []
+        harness = Harness(responder)
+
+        results = harness.run([0, 1, 2], on_throttled=lambda: throttled.append(True))
+
+        assert all(r.ok for r in results)
+        assert throttled == [True]
+
+    def test_GIVEN_rate_limited_plain_request_THEN_leaves_throttling_to_execute(self) -> None:
+        def responder(item: int):
+            raise _http_error(429)
+
+        throttled = []
+        harness = Harness(responder)
+
+        harness.run([0], on_throttled=lambda: throttled.append(True))
+
+        assert throttled == []
+
+
+class TestBatchError:
+    def test_THEN_groups_failures_and_keeps_every_result(self) -> None:
+        error = ValueError("boom")
+        results = [ItemResult(0, {"id": 0}), ItemResult(1, error=error)]
+
+        exc = BatchError("batch failed", results)
+
+        assert isinstance(exc, ExceptionGroup)
+        assert exc.exceptions == (error,)
+        assert exc.results == results
@@ -1,11 +1,24 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, patch
 
+import httplib2
 import pytest
+from googleapiclient.errors import HttpError
 
+from gtasks.client.batch import BatchError
 from gtasks.client.cached_api_client import CachedApiClient
+from gtasks.client.retry import RequestExecutor
+from gtasks.utils import write_back
 from gtasks.utils.bidict_cache import BidictCache
-from gtasks.utils.tasks_cache import TasksCache
+from gtasks.utils.cache_policy import CachePolicy
+from gtasks.utils.sqlite_cache import SqliteBidictCache, SqliteStore, SqliteTasksCache
+from gtasks.utils.tasks_cache import ALL_HISTORY, TasksCache
+
+if TYPE_CHECKING:
+    from tests.client.conftest import FakeTasksServer
 
 
 @pytest.fixture
@@ -89,7 +102,9 @@ class TestCachedGetTasklists:
             result = client_empty_cache.get_tasklists(max_results=1)
 
         # Fetched with max_results=None to fully populate the cache
-        service.tasklists().list.assert_called_with()
+        service.tasklists().list.assert_called_with(
+            fields="etag,nextPageToken,items(id,title,updated,etag)", maxResults=1000
+        )
         assert len(result) == 1
         # Cache has all items, not just the truncated result
         assert len(empty_cache) == 2
@@ -145,68 +160,391 @@ class TestCachedGetTasks:
 
         assert len(result) == 1
 
-    def test_GIVEN_completed_min_THEN_bypasses_cache(
+    def test_GIVEN_completed_min_within_cached_history_THEN_serves_from_index(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
-        service.tasks().list().execute.return_value = {"items": []}
+        tasks = [
+            {"id": "task1", "title": "Buy milk", "status": "needsAction"},
+            {"id": "task2", "status": "completed", "completed": "2026-03-01T00:00:00.000Z"},
+            {"id": "task3", "status": "completed", "completed": "2025-12-01T00:00:00.000Z"},
+            {"id": "task4", "status": "completed", "completed": "2026-02-01T00:00:00.000Z"},
+        ]
+        tasks_cache.set("list1", tasks)
 
-        client_empty_cache.get_tasks("list1", completed_min="2026-01-01T00:00:00Z")
+        result = client_empty_cache.get_tasks("list1", completed_min="2026-01-01T00:00:00Z")
 
-        service.tasks().list.assert_called()
+        service.tasks().list.assert_not_called()
+        assert [t["id"] for t in result] == ["task4", "task2"]
+
+    @pytest.mark.parametrize(
+        "completed_min",
+        ["2026-03-01T00:00:00Z", "2026-03-01T00:00:00+01:00"],
+        ids=["exact-bound", "offset-bound"],
+    )
+    def test_GIVEN_completed_min_not_in_api_form_THEN_matches_as_the_api_would(
+        self,
+        client_empty_cache: CachedApiClient,
+        service: MagicMock,
+        tasks_cache: TasksCache,
+        completed_min: str,
+    ) -> None:
+        tasks = [
+            {"id": "before", "status": "completed", "completed": "2026-02-28T22:59:59.999Z"},
+            {"id": "late", "status": "completed", "completed": "2026-02-28T23:30:00.000Z"},
+            {"id": "bound", "status": "completed", "completed": "2026-03-01T00:00:00.000Z"},
+        ]
+        tasks_cache.set("list1", tasks)
+        # An hour earlier in UTC, the offset bound also takes in the late-February task.
+        expected = ["bound"] if completed_min.endswith("Z") else ["late", "bound"]
 
+        result = client_empty_cache.get_tasks("list1", completed_min=completed_min)
 
-class TestCachedGetTasksMutationInvalidation:
-    SAMPLE_TASKS = [
+        service.tasks().list.assert_not_called()
+        assert [t["id"] for t in result] == expected
+
+
+class TestCachedCompletedHistory:
+    ACTIVE = [{"id": "task1", "title": "Buy milk", "status": "needsAction"}]
+    DONE = [{"id": "task2", "status": "completed", "completed": "2025-12-01T00:00:00.000Z"}]
+
+    def test_GIVEN_cache_miss_and_active_view_THEN_fetches_active_tasks_only(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": self.ACTIVE}
+
+        result = client_empty_cache.get_tasks("list1", show_completed=False)
+
+        assert service.tasks().list.call_args.kwargs["showCompleted"] is False
+        assert result == self.ACTIVE
+        assert tasks_cache.history("list1") is None
+
+    def test_GIVEN_active_only_cache_THEN_completed_view_fetches_history_once(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.ACTIVE, completed_min=None)
+        service.tasks().list().execute.return_value = {"items": self.DONE}
+        service.tasks().list.reset_mock()
+
+        client_empty_cache.get_tasks("list1")
+        result = client_empty_cache.get_tasks("list1")
+
+        service.tasks().list.assert_called_once()
+        kwargs = service.tasks().list.call_args.kwargs
+        assert kwargs["showCompleted"] is True
+        assert "completedMin" not in kwargs and "completedMax" not in kwargs
+        assert result == self.ACTIVE + self.DONE
+        assert tasks_cache.history("list1") == ALL_HISTORY
+
+    def test_GIVEN_partial_history_THEN_fetches_only_the_older_window(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.ACTIVE, completed_min=None)
+        tasks_cache.add_history("list1", [], "2026-01-01T00:00:00Z")
+        service.tasks().list().execute.return_value = {"items": self.DONE}
+        service.tasks().list.reset_mock()
+
+        result = client_empty_cache.get_tasks("list1", completed_min="2025-06-01T00:00:00Z")
+
+        kwargs = service.tasks().list.call_args.kwargs
+        assert kwargs["completedMin"] == "2025-06-01T00:00:00.000Z"
+        assert kwargs["completedMax"] == "2026-01-01T00:00:00Z"
+        assert result == self.DONE
+        assert tasks_cache.history("list1") == "2025-06-01T00:00:00.000Z"
+
+
+class TestCachedIterTasks:
+    ACTIVE = [
         {"id": "task1", "title": "Buy milk", "status": "needsAction"},
+        {"id": "task2", "title": "Walk dog", "status": "needsAction"},
     ]
 
-    def test_add_task_THEN_invalidates_cache(
+    def test_GIVEN_cache_miss_THEN_streams_pages_then_caches_active_tasks(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
-        service.tasks().insert().execute.return_value = {"id": "task2", "title": "New"}
+        service.tasks().list().execute.side_effect = [
+            {"items": self.ACTIVE[:1], "nextPageToken": "p2"},
+            {"items": self.ACTIVE[1:]},
+        ]
 
-        client_empty_cache.add_task("list1", "New")
+        it = client_empty_cache.iter_tasks("list1", show_completed=False)
 
-        assert tasks_cache.get("list1") is None
+        assert next(it) == self.ACTIVE[0]
+        assert tasks_cache.get("list1") is None  # cached only once the listing ends
+        assert list(it) == self.ACTIVE[1:]
+        assert service.tasks().list.call_args.kwargs["showCompleted"] is False
+        assert tasks_cache.get("list1", show_completed=False) == self.ACTIVE
+        assert tasks_cache.history("list1") is None
 
-    def test_complete_task_THEN_invalidates_cache(
+    def test_GIVEN_cache_miss_and_max_results_THEN_yields_limit_and_caches_all(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
+        service.tasks().list().execute.return_value = {"items": self.ACTIVE}
+
+        result = list(client_empty_cache.iter_tasks("list1", 1, show_completed=False))
+
+        assert result == self.ACTIVE[:1]
+        assert tasks_cache.get("list1", show_completed=False) == self.ACTIVE
+
+    def test_GIVEN_cache_hit_THEN_serves_cache_without_api_call(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.ACTIVE, completed_min=None)
+
+        result = list(client_empty_cache.iter_tasks("list1", 1, show_completed=False))
+
+        service.tasks().list.assert_not_called()
+        assert result == self.ACTIVE[:1]
+
+
+class TestCachedGetTasksDeltaSync:
+    SYNCED_TASKS = [
+        {"id": "task1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"},
+        {"id": "task2", "title": "Walk dog", "updated": "2026-01-02T10:00:00.000Z"},
+    ]
+
+    def test_GIVEN_stale_list_THEN_requests_only_changes_since_high_water_mark(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.SYNCED_TASKS)
+        tasks_cache.mark_stale("list1")
+        service.tasks().list().execute.return_value = {"items": []}
+
+        client_empty_cache.get_tasks("list1")
+
+        kwargs = service.tasks().list.call_args.kwargs
+        assert kwargs["updatedMin"] == "2026-01-02T10:00:00.000Z"
+        assert kwargs["showDeleted"] is True
+        assert kwargs["showHidden"] is True
+        assert "deleted" in kwargs["fields"] and "hidden" in kwargs["fields"]
+
+    def test_GIVEN_stale_list_THEN_merges_delta_into_cache(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.SYNCED_TASKS)
+        tasks_cache.mark_stale("list1")
+        service.tasks().list().execute.return_value = {
+            "items": [
+                {"id": "task1", "deleted": True, "updated": "2026-01-03T10:00:00.000Z"},
+                {"id": "task3", "title": "New", "updated": "2026-01-03T11:00:00.000Z"},
+            ]
+        }
+
+        result = client_empty_cache.get_tasks("list1")
+
+        assert [t["id"] for t in result] == ["task2", "task3"]
+        assert tasks_cache.get("list1") == result
+
+    def test_GIVEN_mutation_THEN_next_read_is_delta_sync(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        tasks_cache.set("list1", self.SYNCED_TASKS)
         service.tasks().patch().execute.return_value = {}
+        service.tasks().list().execute.return_value = {"items": []}
 
         client_empty_cache.complete_task("list1", "task1")
+        client_empty_cache.get_tasks("list1")
+
+        assert "updatedMin" in service.tasks().list.call_args.kwargs
 
-        assert tasks_cache.get("list1") is None
 
-    def test_delete_task_THEN_invalidates_cache(
+class TestCachedConditionalRevalidation:
+    SYNCED_TASKS = [{"id": "task1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"}]
+    NOT_MODIFIED = HttpError(httplib2.Response({"status": 304}), b"")
+
+    def test_GIVEN_stale_list_with_etag_THEN_sends_if_none_match(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
-        service.tasks().delete().execute.return_value = None
+        tasks_cache.set("list1", self.SYNCED_TASKS, etag='"v1"')
+        tasks_cache.mark_stale("list1")
+        request = MagicMock(headers={})
+        request.execute.return_value = {"items": [], "etag": '"v2"'}
+        service.tasks().list.return_value = request
 
-        client_empty_cache.delete_task("list1", "task1")
+        client_empty_cache.get_tasks("list1")
 
-        assert tasks_cache.get("list1") is None
+        assert request.headers["If-None-Match"] == '"v1"'
+        assert tasks_cache.etag("list1") == '"v2"'
 
-    def test_complete_tasks_THEN_invalidates_cache(
+    def test_GIVEN_not_modified_THEN_serves_cache_without_rewriting_list_file(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
-        batch_mock = MagicMock()
-        service.new_batch_http_request.return_value = batch_mock
+        tasks_cache.set("list1", self.SYNCED_TASKS, etag='"v1"')
+        tasks_cache.mark_stale("list1")
+        service.tasks().list.return_value = MagicMock(headers={})
+        service.tasks().list().execute.side_effect = self.NOT_MODIFIED
 
-        client_empty_cache.complete_tasks("list1", self.SAMPLE_TASKS)
+        with patch.object(tasks_cache, "_save") as save:
+            result = client_empty_cache.get_tasks("list1")
 
-        assert tasks_cache.get("list1") is None
+        assert result == self.SYNCED_TASKS
+        assert tasks_cache.get("list1") == self.SYNCED_TASKS
+        save.assert_not_called()
 
-    def test_complete_tasks_GIVEN_batch_error_THEN_still_invalidates_cache(
-        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    def test_sync_tasklists_GIVEN_not_modified_THEN_marks_nothing_stale(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
+        title_cache: BidictCache[str, str] = BidictCache(tmp_path / "tasklists.json")
+        title_cache.overwrite({"Work": "list1"}, {"list1": {"updated": "2026-01-01"}}, '"v1"')
+        tasks_cache.set("list1", self.SYNCED_TASKS)
+        client = CachedApiClient(service, title_cache, tasks_cache)
+        service.tasklists().list.return_value = MagicMock(headers={})
+        service.tasklists().list().execute.side_effect = self.NOT_MODIFIED
+
+        assert client.sync_tasklists() == []
+        assert service.tasklists().list().headers["If-None-Match"] == '"v1"'
+        assert tasks_cache.get("list1") == self.SYNCED_TASKS
+
+
+class TestCachedPolicy:
+    SYNCED_TASKS = [{"id": "task1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"}]
+    # Negative thresholds make a just-written entry land in the band under test.
+    STALE = CachePolicy(fresh_ttl=-1, stale_window=3600, max_age=86400)
+    MUST_REVALIDATE = CachePolicy(fresh_ttl=-1, stale_window=0, max_age=86400)
+    EXPIRED = CachePolicy(fresh_ttl=-1, stale_window=0, max_age=-1)
+
+    def _client(
+        self,
+        service: MagicMock,
+        tmp_path: Path,
+        tasks_cache: TasksCache,
+        policy: CachePolicy,
+        background_revalidation: bool = True,
+    ) -> CachedApiClient:
+        title_cache: BidictCache[str, str] = BidictCache(tmp_path / "tasklists.json")
+        title_cache.overwrite({"Work": "list1"}, {"list1": {"updated": "2026-01-01"}})
+        tasks_cache.set("list1", [dict(t) for t in self.SYNCED_TASKS])
+        service.tasks().list.reset_mock()
+        service.tasklists().list.reset_mock()
+        return CachedApiClient(
+            service,
+            title_cache,
+            tasks_cache,
+            policy=policy,
+            background_revalidation=background_revalidation,
+        )
+
+    def test_GIVEN_fresh_entry_THEN_serves_cache_without_api_call(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        policy = CachePolicy(fresh_ttl=3600, stale_window=0, max_age=86400)
+        client = self._client(service, tmp_path, tasks_cache, policy)
+
+        client.get_tasks("list1")
+        client.get_tasklists()
+
+        service.tasks().list.assert_not_called()
+        service.tasklists().list.assert_not_called()
+
+    def test_GIVEN_stale_entry_THEN_serves_cache_and_revalidates_in_background(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(service, tmp_path, tasks_cache, self.STALE)
+        new_task = {"id": "task2", "title": "New", "updated": "2026-01-02T10:00:00.000Z"}
+        service.tasks().list().execute.return_value = {"items": [new_task]}
+
+        result = client.get_tasks("list1")
+        client.wait_for_revalidations()
+
+        assert result == self.SYNCED_TASKS
+        assert "updatedMin" in service.tasks().list.call_args.kwargs
+        assert tasks_cache.get("list1") == [*self.SYNCED_TASKS, new_task]
+
+    def test_GIVEN_stale_entry_and_failing_revalidation_THEN_keeps_cache(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(service, tmp_path, tasks_cache, self.STALE)
+        service.tasks().list().execute.side_effect = OSError("offline")
+
+        result = client.get_tasks("list1")
+        client.wait_for_revalidations()
+
+        assert result == self.SYNCED_TASKS
+        assert tasks_cache.get("list1") == self.SYNCED_TASKS
+
+    def test_GIVEN_stale_entry_without_background_revalidation_THEN_next_read_syncs(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(
+            service, tmp_path, tasks_cache, self.STALE, background_revalidation=False
+        )
+        new_task = {"id": "task2", "title": "New", "updated": "2026-01-02T10:00:00.000Z"}
+        service.tasks().list().execute.return_value = {"items": [new_task]}
+        service.tasks().list.reset_mock()
+
+        first = client.get_tasks("list1")
+
+        assert first == self.SYNCED_TASKS
+        assert client._revalidations == {}
+        service.tasks().list.assert_not_called()
+        assert client.get_tasks("list1") == [*self.SYNCED_TASKS, new_task]
+        assert "updatedMin" in service.tasks().list.call_args.kwargs
+
+    def test_GIVEN_stale_tasklists_without_background_revalidation_THEN_next_read_syncs(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(
+            service, tmp_path, tasks_cache, self.STALE, background_revalidation=False
+        )
+        service.tasklists().list().execute.return_value = {
+            "items": [{"id": "list1", "title": "Work", "updated": "2026-01-01"}]
+        }
+        service.tasklists().list.reset_mock()
+
+        assert client.get_tasklists() == [{"title": "Work", "id": "list1"}]
+        service.tasklists().list.assert_not_called()
+        client.get_tasklists()
+        service.tasklists().list.assert_called()
 
+    def test_GIVEN_entry_past_stale_window_THEN_syncs_before_serving(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(service, tmp_path, tasks_cache, self.MUST_REVALIDATE)
+        new_task = {"id": "task2", "title": "New", "updated": "2026-01-02T10:00:00.000Z"}
+        service.tasks().list().execute.return_value = {"items": [new_task]}
+
+        result = client.get_tasks("list1")
+
+        assert result == [*self.SYNCED_TASKS, new_task]
+        assert "updatedMin" in service.tasks().list.call_args.kwargs
+
+    def test_GIVEN_expired_entry_THEN_refetches_in_full(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(service, tmp_path, tasks_cache, self.EXPIRED)
+        service.tasks().list().execute.return_value = {"items": []}
+
+        result = client.get_tasks("list1")
+
+        assert result == []
+        assert "updatedMin" not in service.tasks().list.call_args.kwargs
+
+    def test_GIVEN_stale_tasklists_THEN_revalidates_in_background(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> None:
+        client = self._client(service, tmp_path, tasks_cache, self.STALE)
+        service.tasklists().list().execute.return_value = {
+            "items": [{"id": "list1", "title": "Work", "updated": "2026-02-01"}]
+        }
+
+        result = client.get_tasklists()
+        client.wait_for_revalidations()
+
+        assert result == [{"title": "Work", "id": "list1"}]
+        service.tasklists().list().execute.assert_called()
+        assert tasks_cache.get("list1") is None  # list changed, so its tasks went stale
+
+
+class TestCachedGetTasksWriteThrough:
+    SAMPLE_TASKS = [
+        {"id": "task1", "title": "Buy milk", "status": "needsAction", "position": "001"},
+        {"id": "task2", "title": "Walk dog", "status": "needsAction", "position": "003"},
+    ]
+
+    @pytest.fixture(autouse=True)
+    def warm_cache(self, tasks_cache: TasksCache) -> None:
+        tasks_cache.set("list1", [dict(t) for t in self.SAMPLE_TASKS])
+
+    def _fail_batch(self, service: MagicMock) -> None:
         def fake_execute_with_error():
             cb = service.new_batch_http_request.call_args.kwargs.get("callback")
             if cb:
@@ -216,41 +554,368 @@ class TestCachedGetTasksMutationInvalidation:
         batch_mock.execute.side_effect = fake_execute_with_error
         service.new_batch_http_request.return_value = batch_mock
 
-        with pytest.raises(ExceptionGroup):
-            client_empty_cache.complete_tasks("list1", self.SAMPLE_TASKS)
+    def test_add_task_THEN_inserts_task_at_its_position(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        created = {"id": "task3", "title": "New", "status": "needsAction", "position": "002"}
+        service.tasks().insert().execute.return_value = created
+
+        client_empty_cache.add_task("list1", "New")
+
+        assert [t["id"] for t in tasks_cache.get("list1")] == ["task1", "task3", "task2"]
+
+    def test_add_task_THEN_next_read_makes_no_api_call(
+        self, client_empty_cache: CachedApiClient, service: MagicMock
+    ) -> None:
+        service.tasks().insert().execute.return_value = {"id": "task3", "title": "New"}
+        service.tasks().list.reset_mock()
+
+        client_empty_cache.add_task("list1", "New")
+        result = client_empty_cache.get_tasks("list1")
+
+        service.tasks().list.assert_not_called()
+        assert [t["id"] for t in result] == ["task1", "task2", "task3"]
+
+    def test_complete_task_THEN_moves_task_to_completed_segment(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasks().patch().execute.return_value = {
+            **self.SAMPLE_TASKS[0], "status": "completed"
+        }
+
+        client_empty_cache.complete_task("list1", "task1")
+
+        assert [(t["id"], t["status"]) for t in tasks_cache.get("list1")] == [
+            ("task2", "needsAction"),
+            ("task1", "completed"),
+        ]
+
+    def test_complete_task_GIVEN_no_task_returned_THEN_invalidates_cache(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasks().patch().execute.return_value = {}
+
+        client_empty_cache.complete_task("list1", "task1")
 
         assert tasks_cache.get("list1") is None
 
-    def test_delete_tasks_THEN_invalidates_cache(
+    def test_delete_task_THEN_removes_task_from_cache(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
+        service.tasks().delete().execute.return_value = None
+
+        client_empty_cache.delete_task("list1", "task1")
+
+        assert [t["id"] for t in tasks_cache.get("list1")] == ["task2"]
+
+    def test_complete_tasks_THEN_replaces_tasks_in_place(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        completed = [{**t, "status": "completed"} for t in self.SAMPLE_TASKS]
+        responses = iter(completed)
+
+        def fake_execute():
+            cb = service.new_batch_http_request.call_args.kwargs["callback"]
+            for i, _ in enumerate(self.SAMPLE_TASKS):
+                cb(str(i), next(responses), None)
+
         batch_mock = MagicMock()
+        batch_mock.execute.side_effect = fake_execute
         service.new_batch_http_request.return_value = batch_mock
 
-        client_empty_cache.delete_tasks("list1", self.SAMPLE_TASKS)
+        client_empty_cache.complete_tasks("list1", self.SAMPLE_TASKS)
+
+        assert tasks_cache.get("list1") == completed
+
+    def test_complete_tasks_GIVEN_batch_error_THEN_invalidates_cache(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        self._fail_batch(service)
+
+        with pytest.raises(ExceptionGroup):
+            client_empty_cache.complete_tasks("list1", self.SAMPLE_TASKS)
 
         assert tasks_cache.get("list1") is None
 
-    def test_delete_tasks_GIVEN_batch_error_THEN_still_invalidates_cache(
+    def test_delete_tasks_THEN_removes_tasks_from_cache(
         self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
     ) -> None:
-        tasks_cache.set("list1", self.SAMPLE_TASKS)
+        service.new_batch_http_request.return_value = MagicMock()
 
-        def fake_execute_with_error():
-            cb = service.new_batch_http_request.call_args.kwargs.get("callback")
-            if cb:
-                cb("0", None, Exception("API error"))
+        client_empty_cache.delete_tasks("list1", self.SAMPLE_TASKS[:1])
 
-        batch_mock = MagicMock()
-        batch_mock.execute.side_effect = fake_execute_with_error
-        service.new_batch_http_request.return_value = batch_mock
+        assert [t["id"] for t in tasks_cache.get("list1")] == ["task2"]
+
+    def test_delete_tasks_GIVEN_batch_error_THEN_invalidates_cache(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        self._fail_batch(service)
 
         with pytest.raises(ExceptionGroup):
             client_empty_cache.delete_tasks("list1", self.SAMPLE_TASKS)
 
         assert tasks_cache.get("list1") is None
 
+    def test_delete_tasks_GIVEN_partial_failure_THEN_keeps_deletions_that_landed(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        synced = [{**t, "updated": "2026-01-01T10:00:00.000Z"} for t in self.SAMPLE_TASKS]
+        tasks_cache.set("list1", synced)
+        self._fail_batch(service)  # task1 fails, task2 is deleted
+
+        with pytest.raises(BatchError) as exc:
+            client_empty_cache.delete_tasks("list1", synced)
+        tasks_cache.revalidate("list1")
+
+        assert [r.ok for r in exc.value.results] == [False, True]
+        assert [t["id"] for t in tasks_cache.get("list1")] == ["task1"]
+
+
+class TestCachedSyncTasklists:
+    SYNCED_TASKS = [{"id": "task1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"}]
+
+    @pytest.fixture
+    def synced_client(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> CachedApiClient:
+        title_cache: BidictCache[str, str] = BidictCache(tmp_path / "tasklists.json")
+        title_cache.overwrite(
+            {"Work": "list1", "Personal": "list2"},
+            {"list1": {"updated": "2026-01-01"}, "list2": {"updated": "2026-01-01"}},
+        )
+        tasks_cache.set("list1", self.SYNCED_TASKS)
+        tasks_cache.set("list2", self.SYNCED_TASKS)
+        return CachedApiClient(service, title_cache, tasks_cache)
+
+    def test_GIVEN_one_list_changed_THEN_marks_only_it_stale(
+        self, synced_client: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasklists().list().execute.return_value = {
+            "items": [
+                {"id": "list1", "title": "Work", "updated": "2026-02-01"},
+                {"id": "list2", "title": "Personal", "updated": "2026-01-01"},
+            ]
+        }
+
+        changed = synced_client.sync_tasklists()
+
+        assert changed == ["list1"]
+        assert tasks_cache.get("list1") is None
+        assert tasks_cache.get("list2") == self.SYNCED_TASKS
+
+    def test_GIVEN_list_removed_THEN_drops_its_tasks(
+        self, synced_client: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasklists().list().execute.return_value = {
+            "items": [{"id": "list1", "title": "Work", "updated": "2026-01-01"}]
+        }
+
+        synced_client.sync_tasklists()
+
+        assert tasks_cache.get("list2") is None
+        assert tasks_cache.sync_base("list2") is None
+
+    def test_refresh_cache_THEN_resyncs_only_changed_lists(
+        self, synced_client: CachedApiClient, service: MagicMock
+    ) -> None:
+        service.tasklists().list().execute.return_value = {
+            "items": [
+                {"id": "list1", "title": "Work", "updated": "2026-02-01"},
+                {"id": "list2", "title": "Personal", "updated": "2026-01-01"},
+            ]
+        }
+        service.tasks().list().execute.return_value = {"items": []}
+        service.tasks().list.reset_mock()
+
+        synced_client.refresh_cache()
+
+        service.tasks().list.assert_called_once()
+        assert service.tasks().list.call_args.kwargs["tasklist"] == "list1"
+        assert "updatedMin" in service.tasks().list.call_args.kwargs
+
+    def test_refresh_cache_GIVEN_full_THEN_clears_task_caches(
+        self, synced_client: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasklists().list().execute.return_value = {
+            "items": [{"id": "list1", "title": "Work", "updated": "2026-01-01"}]
+        }
+
+        synced_client.refresh_cache(full=True)
+
+        assert tasks_cache.get("list1") is None
+        assert tasks_cache.get("list2") is None
+
+
+class TestCachedRefreshAll:
+    UPDATED = "2026-01-01T10:00:00.000Z"
+    TASKLISTS = [
+        {"id": f"list{i}", "title": f"List {i}", "updated": "2026-01-01"} for i in range(3)
+    ]
+
+    @pytest.fixture
+    def client(
+        self, service: MagicMock, tmp_path: Path, tasks_cache: TasksCache
+    ) -> CachedApiClient:
+        service.tasklists().list().execute.return_value = {"items": self.TASKLISTS}
+        return CachedApiClient(service, BidictCache(tmp_path / "tasklists.json"), tasks_cache)
+
+    def _serve_tasks(self, service: MagicMock, failing: str | None = None) -> None:
+        def list_tasks(tasklist: str, **kwargs) -> MagicMock:
+            request = MagicMock()
+            if tasklist == failing:
+                request.execute.side_effect = HttpError(httplib2.Response({"status": 403}), b"")
+            else:
+                task = {"id": f"{tasklist}-task", "title": "Task", "updated": self.UPDATED}
+                request.execute.return_value = {"items": [task]}
+            return request
+
+        service.tasks().list.side_effect = list_tasks
+
+    def test_refresh_all_THEN_writes_each_list_before_the_session_ends(
+        self, client: CachedApiClient, service: MagicMock, tmp_path: Path
+    ) -> None:
+        self._serve_tasks(service)
+        progress: list[tuple[int, int]] = []
+
+        with write_back.session():
+            client.refresh_all(on_progress=lambda done, total: progress.append((done, total)))
+            on_disk = TasksCache(tmp_path / "tasks")
+            assert all(on_disk.get(tl["id"]) for tl in self.TASKLISTS)
+
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    def test_refresh_all_GIVEN_fresh_list_THEN_does_not_refetch_it(
+        self, client: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        client.get_tasklists()
+        tasks_cache.set("list0", [{"id": "cached", "updated": self.UPDATED}])
+        self._serve_tasks(service)
+
+        client.refresh_all()
+
+        fetched = {c.kwargs["tasklist"] for c in service.tasks().list.call_args_list}
+        assert fetched == {"list1", "list2"}
+        assert [t["id"] for t in tasks_cache.get("list0")] == ["cached"]
+
+    def test_refresh_all_GIVEN_failing_list_THEN_caches_the_rest_and_raises(
+        self, client: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        self._serve_tasks(service, failing="list1")
+
+        with pytest.raises(BatchError) as exc:
+            client.refresh_all()
+
+        assert [r.item for r in exc.value.results if not r.ok] == ["list1"]
+        assert tasks_cache.get("list0") is not None
+        assert tasks_cache.get("list2") is not None
+
+
+class TestCachedConcurrentCallers:
+    @pytest.fixture
+    def client(
+        self, tasks_service: Any, tmp_path: Path, tasks_cache: TasksCache
+    ) -> CachedApiClient:
+        return CachedApiClient(
+            tasks_service,
+            BidictCache(tmp_path / "tasklists.json"),
+            tasks_cache,
+            executor=RequestExecutor(base_delay=0),
+        )
+
+    def test_GIVEN_threads_missing_same_list_THEN_fetches_it_once(
+        self, client: CachedApiClient, tasks_server: FakeTasksServer, tasks_cache: TasksCache
+    ) -> None:
+        list_id = tasks_server.add_tasklist("Inbox")
+        tasks_server.add_task(list_id, "Task")
+        tasks_server.release.clear()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(client.get_tasks, list_id, show_completed=False)
+            while tasks_server.in_flight < 1:
+                threading.Event().wait(0.01)
+            second = pool.submit(client.get_tasks, list_id, show_completed=False)
+            threading.Event().wait(0.2)  # let the second caller join the request
+            tasks_server.release.set()
+
+        assert first.result() == second.result()
+        assert len(tasks_server.requests) == 1
+        assert [t["title"] for t in tasks_cache.get(list_id)] == ["Task"]
+
+    def test_GIVEN_threads_reading_every_list_THEN_caches_each(
+        self, client: CachedApiClient, tasks_server: FakeTasksServer, tasks_cache: TasksCache
+    ) -> None:
+        list_ids = [tasks_server.add_tasklist(f"List {i}") for i in range(6)]
+        for list_id in list_ids:
+            tasks_server.add_task(list_id, f"Task in {list_id}")
+        tasks_server.delay = 0.02
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            pool.submit(client.get_tasklists)
+            list(pool.map(lambda i: client.get_tasks(i, show_completed=False), list_ids))
+
+        for list_id in list_ids:
+            assert [t["title"] for t in tasks_cache.get(list_id)] == [f"Task in {list_id}"]
+        assert {tl["id"] for tl in client.get_tasklists()} == set(list_ids)
+
+
+class TestCachedSqliteBackend:
+    SAMPLE_TASKS = [
+        {"id": "task1", "title": "Buy milk", "status": "needsAction"},
+        {"id": "task2", "title": "Walk dog", "status": "completed"},
+    ]
+
+    @pytest.fixture
+    def sqlite_client(self, service: MagicMock, tmp_path: Path) -> CachedApiClient:
+        store = SqliteStore(tmp_path / "cache.sqlite3")
+        return CachedApiClient(service, SqliteBidictCache(store), SqliteTasksCache(store))
+
+    def test_GIVEN_cache_miss_THEN_fetches_once_then_serves_filtered_from_cache(
+        self, sqlite_client: CachedApiClient, service: MagicMock
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": self.SAMPLE_TASKS}
+
+        sqlite_client.get_tasks("list1")
+        service.tasks().list.reset_mock()
+        result = sqlite_client.get_tasks("list1", show_completed=False)
+
+        service.tasks().list.assert_not_called()
+        assert result == self.SAMPLE_TASKS[:1]
+
+    def test_resolve_task_from_title_GIVEN_cached_list_THEN_uses_title_lookup(
+        self, sqlite_client: CachedApiClient, service: MagicMock
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": self.SAMPLE_TASKS}
+        sqlite_client.get_tasks("list1")
+
+        assert sqlite_client.resolve_task_from_title("walk DOG", "list1") == [
+            self.SAMPLE_TASKS[1]
+        ]
+
+
+class TestCachedLazyService:
+    def test_GIVEN_warm_caches_THEN_never_builds_service(
+        self, populated_cache: BidictCache, tasks_cache: TasksCache
+    ) -> None:
+        provider = MagicMock()
+        client = CachedApiClient(None, populated_cache, tasks_cache, service_provider=provider)
+        tasks_cache.set("list1", [{"id": "task1", "title": "Buy milk"}])
+
+        client.resolve_tasklist_from_title("Work")
+        client.get_tasks("list1")
+
+        provider.assert_not_called()
+
+    def test_GIVEN_cache_miss_THEN_builds_service_on_demand(
+        self, service: MagicMock, empty_cache: BidictCache, tasks_cache: TasksCache
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": []}
+        provider = MagicMock(return_value=service)
+        client = CachedApiClient(None, empty_cache, tasks_cache, service_provider=provider)
+
+        client.get_tasks("list1")
+
+        provider.assert_called_once_with()
+
 
 class TestCachedResolveTasklistId:
     def test_GIVEN_title_in_cache_THEN_returns_matching_dict(
@@ -319,3 +984,45 @@ class TestCachedResolveTaskFromTitle:
 
         service.tasks().list.assert_not_called()
         assert result == [{"id": "task1", "title": "Buy milk", "status": "needsAction"}]
+
+    def test_GIVEN_active_only_cache_and_completed_title_THEN_loads_history_and_returns_it(
+        self, client_empty_cache: CachedApiClient, service: MagicMock
+    ) -> None:
+        old = {"id": "task3", "title": "Old", "status": "completed",
+               "completed": "2025-12-01T00:00:00.000Z"}
+
+        def list_tasks(showCompleted: bool, **kwargs) -> MagicMock:
+            request = MagicMock()
+            request.execute.return_value = {"items": [old] if showCompleted else self.SAMPLE_TASKS}
+            return request
+
+        service.tasks().list.side_effect = list_tasks
+        client_empty_cache.get_tasks("list1", show_completed=False)
+
+        assert client_empty_cache.resolve_task_from_title("Old", "list1") == [old]
+
+    def test_GIVEN_cache_miss_and_active_match_THEN_fetches_active_tasks_only(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        service.tasks().list().execute.return_value = {"items": self.SAMPLE_TASKS}
+        service.tasks().list.reset_mock()
+
+        result = client_empty_cache.resolve_task_from_title("Walk dog", "list1")
+
+        assert result == [self.SAMPLE_TASKS[1]]
+        service.tasks().list.assert_called_once()
+        assert service.tasks().list.call_args.kwargs["showCompleted"] is False
+        assert tasks_cache.history("list1") is None
+
+    def test_GIVEN_match_in_cached_history_THEN_does_not_fetch_older_history(
+        self, client_empty_cache: CachedApiClient, service: MagicMock, tasks_cache: TasksCache
+    ) -> None:
+        recent = {"id": "task3", "title": "Recent", "status": "completed",
+                  "completed": "2026-03-01T00:00:00.000Z"}
+        tasks_cache.set("list1", [*self.SAMPLE_TASKS, recent],
+                        completed_min="2026-01-01T00:00:00.000Z")
+
+        result = client_empty_cache.resolve_task_from_title("Recent", "list1")
+
+        service.tasks().list.assert_not_called()
+        assert result == [recent]
@@ -3,7 +3,134 @@ from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
-from gtasks.client.client_factory import auth_from_file
+from gtasks.client.client_factory import (
+    auth_from_file,
+    build_cached_client,
+    build_tasks_resource,
+    cache_backend,
+    cache_policy,
+    request_executor,
+)
+from gtasks.defaults import (
+    API_MAX_RETRIES,
+    CACHE_BACKEND,
+    CACHE_FRESH_TTL,
+    CACHE_MAX_AGE,
+    CACHE_STALE_WINDOW,
+)
+from gtasks.utils.cache_policy import CachePolicy
+from gtasks.utils.config import Config, ConfigKey
+from gtasks.utils.sqlite_cache import SqliteTasksCache
+
+
+class TestBuildTasksResource:
+    @patch("gtasks.client.client_factory.auth_from_file")
+    def test_build_tasks_resource_GIVEN_transport_THEN_builds_over_its_http(
+        self, mock_auth: MagicMock
+    ) -> None:
+        transport = MagicMock()
+
+        with patch("googleapiclient.discovery.build") as mock_build:
+            build_tasks_resource(Path("/t"), Path("/c"), transport=transport)
+
+        transport.assert_called_once_with(mock_auth.return_value)
+        mock_build.assert_called_once_with("tasks", "v1", http=transport.return_value)
+
+    @patch("gtasks.client.client_factory.auth_from_file")
+    def test_build_tasks_resource_GIVEN_no_transport_THEN_uses_credentials(
+        self, mock_auth: MagicMock
+    ) -> None:
+        with patch("googleapiclient.discovery.build") as mock_build:
+            build_tasks_resource(Path("/t"), Path("/c"))
+
+        mock_build.assert_called_once_with("tasks", "v1", credentials=mock_auth.return_value)
+
+
+class TestBuildCachedClient:
+    def test_build_cached_client_THEN_defers_building_tasks_resource(
+        self, tmp_path: Path
+    ) -> None:
+        with (
+            patch("gtasks.client.client_factory.CACHE_FILE_PATH", tmp_path / "cache.json"),
+            patch("gtasks.client.client_factory.TASKS_CACHE_DIR_PATH", tmp_path / "tasks"),
+            patch("gtasks.client.client_factory.build_tasks_resource") as mock_build,
+        ):
+            build_cached_client()
+
+        mock_build.assert_not_called()
+
+    def test_build_cached_client_GIVEN_sqlite_backend_THEN_uses_database(
+        self, tmp_path: Path
+    ) -> None:
+        with patch("gtasks.client.client_factory.CACHE_DB_PATH", tmp_path / "cache.sqlite3"):
+            client = build_cached_client(MagicMock(), backend="sqlite")
+
+        assert isinstance(client._tasks_cache, SqliteTasksCache)
+        assert (tmp_path / "cache.sqlite3").exists()
+
+    def test_build_cached_client_GIVEN_no_background_revalidation_THEN_passes_it_on(
+        self, tmp_path: Path
+    ) -> None:
+        with patch("gtasks.client.client_factory.CACHE_DB_PATH", tmp_path / "cache.sqlite3"):
+            client = build_cached_client(
+                MagicMock(), backend="sqlite", background_revalidation=False
+            )
+
+        assert client._background_revalidation is False
+
+    def test_build_cached_client_GIVEN_unknown_backend_THEN_raises(self) -> None:
+        with pytest.raises(ValueError, match="cache_backend"):
+            build_cached_client(MagicMock(), backend="redis")
+
+
+class TestCachePolicy:
+    def test_cache_policy_GIVEN_config_THEN_overrides_defaults(self, tmp_path: Path) -> None:
+        cfg = Config(tmp_path / "config.toml")
+        cfg.set(ConfigKey.CACHE_FRESH_TTL, "5")
+
+        assert cache_policy(cfg) == CachePolicy(
+            fresh_ttl=5.0, stale_window=CACHE_STALE_WINDOW, max_age=CACHE_MAX_AGE
+        )
+
+
+    def test_cache_policy_GIVEN_invalid_value_THEN_warns_and_uses_default(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        cfg = Config(tmp_path / "config.toml")
+        cfg.set(ConfigKey.CACHE_FRESH_TTL, "soon")
+
+        assert cache_policy(cfg).fresh_ttl == CACHE_FRESH_TTL
+        assert "cache_fresh_ttl" in capsys.readouterr().err
+
+
+class TestCacheBackend:
+    def test_cache_backend_GIVEN_unknown_value_THEN_warns_and_uses_default(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        cfg = Config(tmp_path / "config.toml")
+        cfg.set(ConfigKey.CACHE_BACKEND, "redis")
+
+        assert cache_backend(cfg) == CACHE_BACKEND
+        assert "cache_backend" in capsys.readouterr().err
+
+
+class TestRequestExecutor:
+    def test_request_executor_GIVEN_config_THEN_overrides_defaults(self, tmp_path: Path) -> None:
+        cfg = Config(tmp_path / "config.toml")
+        cfg.set(ConfigKey.API_MAX_RETRIES, "2")
+        cfg.set(ConfigKey.API_RATE_LIMIT, "3.5")
+
+        executor = request_executor(cfg)
+
+        assert executor.max_retries == 2
+        assert executor.limiter is not None
+        assert executor.limiter.rate == 3.5
+
+    def test_request_executor_GIVEN_invalid_value_THEN_uses_default(self, tmp_path: Path) -> None:
+        cfg = Config(tmp_path / "config.toml")
+        cfg.set(ConfigKey.API_MAX_RETRIES, "many")
+
+        assert request_executor(cfg).max_retries == API_MAX_RETRIES
 
 
 class TestLoadCredentials:
@@ -71,7 +198,7 @@ class TestLoadCredentials:
         mock_pickle.dump.assert_called_once()
         assert result == expired_creds_with_refresh_token
 
-    @patch("gtasks.client.client_factory.InstalledAppFlow")
+    @patch("google_auth_oauthlib.flow.InstalledAppFlow")
     @patch("gtasks.client.client_factory.pickle")
     def test_load_credentials_GIVEN_no_cached_token_THEN_runs_oauth_flow(
         self,
@@ -100,7 +227,7 @@ class TestLoadCredentials:
         mock_pickle.dump.assert_called_once()
         assert result == new_creds
 
-    @patch("gtasks.client.client_factory.InstalledAppFlow")
+    @patch("google_auth_oauthlib.flow.InstalledAppFlow")
     @patch("gtasks.client.client_factory.pickle")
     def test_load_credentials_GIVEN_invalid_cached_creds_THEN_runs_oauth_flow(
         self,
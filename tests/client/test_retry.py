@@ -0,0 +1,218 @@
+import json
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from gtasks.client.retry import (
+    RateLimiter,
+    RequestExecutor,
+    is_rate_limited,
+    is_transient,
+    retry_after,
+)
+
+
+def _http_error(status: int, **headers: str) -> HttpError:
+    return HttpError(httplib2.Response({"status": status, **headers}), b"")
+
+
+def _forbidden(reason: str) -> HttpError:
+    body = {"error": {"code": 403, "errors": [{"domain": "usageLimits", "reason": reason}]}}
+    return HttpError(httplib2.Response({"status": 403}), json.dumps(body).encode())
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instantly."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    clock = FakeClock()
+    with patch("gtasks.client.retry.time", clock):
+        yield clock
+
+
+class TestRateLimiter:
+    def test_GIVEN_full_bucket_THEN_burst_goes_out_without_waiting(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(rate=10, burst=5)
+
+        for _ in range(5):
+            limiter.acquire()
+
+        assert clock.slept == []
+
+    def test_GIVEN_empty_bucket_THEN_waits_for_refill(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.acquire()
+
+        limiter.acquire()
+
+        assert sum(clock.slept) == pytest.approx(0.1)
+
+    def test_GIVEN_cost_above_burst_THEN_takes_full_bucket_and_goes_into_debt(
+        self, clock: FakeClock
+    ) -> None:
+        limiter = RateLimiter(rate=10, burst=2)
+
+        limiter.acquire(cost=4)  # a batch of 4 sub-requests
+        limiter.acquire()
+
+        assert sum(clock.slept) == pytest.approx(0.3)
+
+    def test_GIVEN_throttled_THEN_halves_rate_and_recovers_additively(
+        self, clock: FakeClock
+    ) -> None:
+        limiter = RateLimiter(rate=10, burst=1)
+
+        limiter.throttled()
+        assert limiter.rate == 5
+        limiter.succeeded()
+        assert limiter.rate == 5.5
+        for _ in range(20):
+            limiter.succeeded()
+        assert limiter.rate == 10
+
+    def test_GIVEN_repeated_throttling_THEN_keeps_a_floor(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(rate=10, burst=1)
+
+        for _ in range(20):
+            limiter.throttled()
+
+        assert limiter.rate == pytest.approx(0.5)
+
+    def test_GIVEN_no_rate_THEN_never_waits(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(rate=0, burst=1)
+
+        for _ in range(100):
+            limiter.acquire()
+
+        assert clock.slept == []
+
+
+class TestRequestExecutor:
+    def test_GIVEN_transient_errors_THEN_retries_with_growing_backoff(
+        self, clock: FakeClock
+    ) -> None:
+        send = MagicMock(side_effect=[_http_error(503), ConnectionResetError(), "ok"])
+
+        with patch("gtasks.client.retry.random.uniform", side_effect=lambda lo, hi: hi):
+            result = RequestExecutor(base_delay=1).execute(send)
+
+        assert result == "ok"
+        assert clock.slept == [1, 2]
+
+    def test_GIVEN_retries_exhausted_THEN_raises_last_error(self, clock: FakeClock) -> None:
+        send = MagicMock(side_effect=_http_error(500))
+
+        with pytest.raises(HttpError):
+            RequestExecutor(max_retries=2).execute(send)
+
+        assert send.call_count == 3
+
+    def test_GIVEN_permanent_error_THEN_raises_without_retrying(self, clock: FakeClock) -> None:
+        send = MagicMock(side_effect=_http_error(404))
+
+        with pytest.raises(HttpError):
+            RequestExecutor().execute(send)
+
+        send.assert_called_once()
+
+    def test_GIVEN_retry_after_THEN_waits_as_long_as_asked(self, clock: FakeClock) -> None:
+        send = MagicMock(side_effect=[_http_error(429, **{"retry-after": "7"}), "ok"])
+
+        assert RequestExecutor().execute(send) == "ok"
+        assert clock.slept == [7]
+
+    def test_GIVEN_retry_after_beyond_max_delay_THEN_gives_up(self, clock: FakeClock) -> None:
+        send = MagicMock(side_effect=_http_error(503, **{"retry-after": "3600"}))
+
+        with pytest.raises(HttpError):
+            RequestExecutor(max_delay=30).execute(send)
+
+        send.assert_called_once()
+
+    def test_GIVEN_not_idempotent_THEN_retries_only_rate_limited_requests(
+        self, clock: FakeClock
+    ) -> None:
+        rate_limited = MagicMock(side_effect=[_http_error(429), "created"])
+        server_error = MagicMock(side_effect=_http_error(503))
+
+        assert RequestExecutor().execute(rate_limited, idempotent=False) == "created"
+        with pytest.raises(HttpError):
+            RequestExecutor().execute(server_error, idempotent=False)
+        server_error.assert_called_once()
+
+    def test_GIVEN_rate_limited_THEN_slows_shared_limiter(self, clock: FakeClock) -> None:
+        limiter = RateLimiter(rate=10, burst=1)
+        send = MagicMock(side_effect=[_http_error(429), "ok"])
+
+        RequestExecutor(limiter=limiter, base_delay=0).execute(send)
+
+        assert limiter.rate == pytest.approx(5.5)  # halved, then one success back
+
+    @pytest.mark.parametrize("reason", ["rateLimitExceeded", "userRateLimitExceeded"])
+    def test_GIVEN_rate_limit_403_THEN_retries_and_slows_limiter_like_429(
+        self, clock: FakeClock, reason: str
+    ) -> None:
+        limiter = RateLimiter(rate=10, burst=1)
+        send = MagicMock(side_effect=[_forbidden(reason), "created"])
+
+        result = RequestExecutor(limiter=limiter, base_delay=0).execute(send, idempotent=False)
+
+        assert result == "created"
+        assert limiter.rate == pytest.approx(5.5)
+
+    def test_GIVEN_other_403_THEN_raises_without_retrying(self, clock: FakeClock) -> None:
+        send = MagicMock(side_effect=_forbidden("insufficientPermissions"))
+
+        with pytest.raises(HttpError):
+            RequestExecutor().execute(send)
+
+        send.assert_called_once()
+
+
+class TestHelpers:
+    def test_is_transient(self) -> None:
+        assert is_transient(_http_error(429))
+        assert is_transient(_http_error(502))
+        assert is_transient(TimeoutError())
+        assert not is_transient(_http_error(400))
+        assert not is_transient(_http_error(304))
+        assert not is_transient(ValueError())
+
+    def test_is_rate_limited(self) -> None:
+        assert is_rate_limited(_http_error(429))
+        assert is_rate_limited(_forbidden("userRateLimitExceeded"))
+        assert not is_rate_limited(_forbidden("forbidden"))
+        assert not is_rate_limited(_http_error(403))  # no body
+        assert not is_rate_limited(_http_error(503))
+        assert not is_rate_limited(None)
+
+    def test_retry_after_GIVEN_http_date_THEN_returns_seconds_until_it(
+        self, clock: FakeClock
+    ) -> None:
+        clock.now = datetime(2026, 1, 1, tzinfo=UTC).timestamp()
+        when = format_datetime(datetime(2026, 1, 1, tzinfo=UTC) + timedelta(seconds=30), True)
+
+        assert retry_after(_http_error(503, **{"retry-after": when})) == pytest.approx(30)
+
+    def test_retry_after_GIVEN_no_header_THEN_returns_none(self) -> None:
+        assert retry_after(_http_error(503)) is None
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gtasks.client.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_do_GIVEN_concurrent_calls_with_same_key_THEN_runs_fn_once(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn() -> str:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "key", fn)
+            started.wait(5)
+            follower = pool.submit(flight.do, "key", fn)
+            threading.Event().wait(0.1)  # let the follower join the call in flight
+            release.set()
+
+        assert leader.result() == ("result", False)
+        assert follower.result() == ("result", True)
+        assert len(calls) == 1
+
+    def test_do_GIVEN_failing_call_THEN_raises_to_every_caller(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fn() -> str:
+            started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "key", fn)
+            started.wait(5)
+            follower = pool.submit(flight.do, "key", fn)
+            threading.Event().wait(0.1)
+            release.set()
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    def test_do_GIVEN_finished_call_THEN_runs_fn_again(self) -> None:
+        flight: SingleFlight[int] = SingleFlight()
+        calls = iter(range(2))
+
+        assert flight.do("key", lambda: next(calls)) == (0, False)
+        assert flight.do("key", lambda: next(calls)) == (1, False)
+
+    def test_do_GIVEN_different_keys_THEN_runs_each(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+
+        assert flight.do("a", lambda: "a") == ("a", False)
+        assert flight.do("b", lambda: "b") == ("b", False)
@@ -0,0 +1,168 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from gtasks.client.retry import RequestExecutor
+from gtasks.client.transport import (
+    HttpPool,
+    PooledHttp,
+    authorized_http_pool,
+    pooled_transport,
+)
+
+
+@pytest.fixture
+def session() -> MagicMock:
+    session = MagicMock()
+    response = session.request.return_value
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    response.content = b'{"items": []}'
+    return session
+
+
+@pytest.fixture
+def http(session: MagicMock) -> PooledHttp:
+    with patch("google.auth.transport.requests.AuthorizedSession", return_value=session):
+        return PooledHttp(MagicMock(), pool_size=4, idle_timeout=30.0, timeout=20.0)
+
+
+class TestPooledHttp:
+    def test_init_THEN_mounts_adapter_sized_to_pool(self, session: MagicMock) -> None:
+        with patch("google.auth.transport.requests.AuthorizedSession", return_value=session):
+            PooledHttp(MagicMock(), pool_size=4, idle_timeout=30.0, timeout=20.0)
+
+        prefix, adapter = session.mount.call_args.args
+        assert prefix == "https://"
+        assert adapter._pool_maxsize == 4
+
+    def test_request_THEN_returns_httplib2_style_response(
+        self, http: PooledHttp, session: MagicMock
+    ) -> None:
+        resp, content = http.request("https://example.com/tasks", "GET")
+
+        assert resp.status == 200
+        assert resp.reason == "OK"
+        assert resp["content-type"] == "application/json"
+        assert "content-encoding" not in resp  # body is already decompressed
+        assert content == b'{"items": []}'
+
+    def test_request_GIVEN_str_body_THEN_sends_utf8_bytes(
+        self, http: PooledHttp, session: MagicMock
+    ) -> None:
+        http.request("https://example.com/tasks", "POST", body='{"title": "Café"}')
+
+        assert session.request.call_args.kwargs["data"] == '{"title": "Café"}'.encode()
+
+    def test_request_THEN_sends_with_timeout(self, http: PooledHttp, session: MagicMock) -> None:
+        http.request("https://example.com/tasks")
+
+        assert session.request.call_args.kwargs["timeout"] == 20.0
+
+    def test_request_GIVEN_consecutive_calls_THEN_reuses_session(
+        self, http: PooledHttp, session: MagicMock
+    ) -> None:
+        http.request("https://example.com/a")
+        http.request("https://example.com/b")
+
+        assert session.request.call_count == 2
+        session.close.assert_not_called()
+
+    def test_request_GIVEN_idle_past_timeout_THEN_drops_pooled_connections(
+        self, http: PooledHttp, session: MagicMock
+    ) -> None:
+        with patch("gtasks.client.transport.time.monotonic", return_value=1e12):
+            http.request("https://example.com/a")
+
+        session.close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (requests.ConnectionError("reset"), ConnectionError),
+            (requests.exceptions.ChunkedEncodingError("cut off"), ConnectionError),
+            (requests.ReadTimeout("slow"), TimeoutError),
+            (requests.ConnectTimeout("slow"), TimeoutError),
+        ],
+    )
+    def test_request_GIVEN_transport_error_THEN_raises_builtin_error(
+        self, http: PooledHttp, session: MagicMock, error: Exception, expected: type
+    ) -> None:
+        session.request.side_effect = error
+
+        with pytest.raises(expected) as exc_info:
+            http.request("https://example.com/tasks")
+
+        assert exc_info.value.__cause__ is error
+
+    def test_request_GIVEN_dropped_connection_THEN_executor_retries_it(
+        self, http: PooledHttp, session: MagicMock
+    ) -> None:
+        response = session.request.return_value
+        session.request.side_effect = [requests.ConnectionError("reset"), response]
+
+        resp, _ = RequestExecutor(base_delay=0).execute(
+            lambda: http.request("https://example.com/tasks")
+        )
+
+        assert resp.status == 200
+        assert session.request.call_count == 2
+
+
+class TestPooledTransport:
+    def test_pooled_transport_THEN_builds_http_with_settings(self, session: MagicMock) -> None:
+        creds = MagicMock()
+
+        with patch("google.auth.transport.requests.AuthorizedSession", return_value=session):
+            http = pooled_transport(pool_size=2, idle_timeout=5.0, timeout=20.0)(creds)
+
+        assert isinstance(http, PooledHttp)
+        assert http.credentials is creds
+
+
+class TestHttpPool:
+    def test_borrow_GIVEN_idle_client_THEN_lends_it(self) -> None:
+        idle = MagicMock()
+        new_http = MagicMock()
+        pool = HttpPool(new_http, idle=[idle])
+
+        with pool.borrow() as http:
+            assert http is idle
+
+        new_http.assert_not_called()
+
+    def test_borrow_GIVEN_every_client_busy_THEN_builds_another(self) -> None:
+        idle = MagicMock()
+        pool = HttpPool(MagicMock, idle=[idle])
+
+        with pool.borrow() as first, pool.borrow() as second:
+            assert first is idle
+            assert second is not idle
+
+    def test_borrow_THEN_returns_client_for_reuse(self) -> None:
+        pool = HttpPool(MagicMock)
+
+        with pool.borrow() as first:
+            pass
+        with pool.borrow() as second:
+            assert second is first
+
+
+class TestAuthorizedHttpPool:
+    def test_GIVEN_authorized_http_THEN_pools_copies_with_its_credentials(self) -> None:
+        from google_auth_httplib2 import AuthorizedHttp
+
+        http = AuthorizedHttp(MagicMock())
+        pool = authorized_http_pool(http)
+
+        assert pool is not None
+        with pool.borrow() as first, pool.borrow() as second:
+            assert first is http
+            assert isinstance(second, AuthorizedHttp)
+            assert second.credentials is http.credentials
+            assert second.http is not http.http
+
+    def test_GIVEN_other_transport_THEN_returns_none(self) -> None:
+        assert authorized_http_pool(MagicMock()) is None
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from gtasks.utils.atomic_io import FileLock, atomic_write
+
+
+class TestAtomicWrite:
+    def test_GIVEN_text_THEN_writes_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "sub" / "file.json"
+
+        atomic_write(path, "{}")
+
+        assert path.read_text() == "{}"
+
+    def test_GIVEN_existing_file_THEN_replaces_it_and_leaves_no_temp_file(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "file.bin"
+        path.write_bytes(b"old")
+
+        atomic_write(path, b"new")
+
+        assert path.read_bytes() == b"new"
+        assert [p.name for p in tmp_path.iterdir()] == ["file.bin"]
+
+    def test_GIVEN_failed_write_THEN_keeps_old_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "file.json"
+        path.write_text("old")
+
+        with pytest.raises(TypeError):
+            atomic_write(path, 123)  # type: ignore[arg-type]
+
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["file.json"]
+
+
+class TestFileLock:
+    def test_GIVEN_nested_holds_THEN_does_not_deadlock(self, tmp_path: Path) -> None:
+        lock = FileLock(tmp_path / ".lock")
+
+        with lock.shared():
+            with lock.exclusive():
+                with lock.shared():
+                    pass
+
+        with lock.exclusive():
+            pass
@@ -1,10 +1,20 @@
+import multiprocessing
 from pathlib import Path
 
 import pytest
 
+from gtasks.utils import write_back
 from gtasks.utils.bidict_cache import BidictCache
 
 
+def _overwrite_worker(cache_path: str, worker: int, rounds: int) -> None:
+    # Runs in a separate process, alternating full rewrites with fresh loads.
+    cache: BidictCache[str, str] = BidictCache(Path(cache_path))
+    for i in range(rounds):
+        cache.overwrite({f"title{n}": f"id{worker}-{i}-{n}" for n in range(50)})
+        assert len(BidictCache(Path(cache_path))) == 50
+
+
 class TestInitBidictCache:
     # invalid path logic tested in the
     def test_init_GIVEN_valid_path_THEN_success(self, tmp_path: Path):
@@ -88,3 +98,95 @@ class TestClearBidictCache:
         bdc.clear()
 
         assert len(bdc) == 0
+
+
+class TestMetaBidictCache:
+    def test_overwrite_GIVEN_meta_THEN_persists_and_reloads(self, tmp_path: Path):
+        cache_path: Path = tmp_path / "test_cache.json"
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+
+        bdc.overwrite({"Work": "list1"}, {"list1": {"updated": "2026-01-01T00:00:00.000Z"}})
+
+        assert (tmp_path / "test_cache.meta.json").exists()
+        assert BidictCache(cache_path).meta == {"list1": {"updated": "2026-01-01T00:00:00.000Z"}}
+
+    def test_overwrite_GIVEN_meta_for_unknown_value_THEN_drops_it(self, tmp_path: Path):
+        bdc: BidictCache[str, str] = BidictCache(tmp_path / "test_cache.json")
+
+        bdc.overwrite({"Work": "list1"}, {"list1": {}, "list2": {}})
+
+        assert bdc.meta == {"list1": {}}
+
+    def test_overwrite_GIVEN_etag_THEN_persists_and_reloads(self, tmp_path: Path):
+        cache_path: Path = tmp_path / "test_cache.json"
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+
+        bdc.overwrite({"Work": "list1"}, etag='"v1"')
+
+        assert BidictCache(cache_path).etag == '"v1"'
+
+    def test_load_GIVEN_corrupt_meta_THEN_starts_without_meta(self, tmp_path: Path):
+        cache_path: Path = tmp_path / "test_cache.json"
+        cache_path.write_text('{"Work": "list1"}', encoding="utf-8")
+        (tmp_path / "test_cache.meta.json").write_text("not json", encoding="utf-8")
+
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+
+        assert bdc["Work"] == "list1"
+        assert bdc.meta == {}
+
+    def test_touch_GIVEN_cache_THEN_persists_fetch_time_only(self, tmp_path: Path):
+        cache_path: Path = tmp_path / "test_cache.json"
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+        bdc.overwrite({"Work": "list1"})
+        bdc.fetched_at = 0.0
+        mtime = cache_path.stat().st_mtime_ns
+
+        bdc.touch()
+
+        assert BidictCache(cache_path).fetched_at > 0
+        assert cache_path.stat().st_mtime_ns == mtime
+
+
+class TestMultiProcessBidictCache:
+    def test_GIVEN_concurrent_rewrites_THEN_loads_never_see_partial_file(
+        self, tmp_path: Path
+    ) -> None:
+        cache_path = tmp_path / "cache.json"
+        BidictCache(cache_path).overwrite({f"title{n}": f"id{n}" for n in range(50)})
+
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_overwrite_worker, args=(str(cache_path), w, 25))
+            for w in range(6)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+
+        assert [p.exitcode for p in procs] == [0] * 6
+
+
+class TestWriteBackBidictCache:
+    def test_overwrite_GIVEN_session_THEN_writes_once_at_end(self, tmp_path: Path):
+        cache_path = tmp_path / "cache.json"
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+
+        with write_back.session():
+            bdc.overwrite({"Work": "id1"})
+            bdc.overwrite({"Work": "id1", "Home": "id2"})
+            assert not cache_path.exists()
+
+        assert BidictCache(cache_path) == {"Work": "id1", "Home": "id2"}
+
+    def test_touch_GIVEN_unchanged_items_THEN_leaves_items_file_alone(self, tmp_path: Path):
+        cache_path = tmp_path / "cache.json"
+        BidictCache(cache_path).overwrite({"Work": "id1"})
+        inode = cache_path.stat().st_ino
+        bdc: BidictCache[str, str] = BidictCache(cache_path)
+
+        bdc.overwrite({"Work": "id1"})
+        bdc.touch()
+
+        assert cache_path.stat().st_ino == inode
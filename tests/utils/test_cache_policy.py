@@ -0,0 +1,26 @@
+import pytest
+
+from gtasks.utils.cache_policy import CachePolicy, Freshness
+
+POLICY = CachePolicy(fresh_ttl=60, stale_window=600, max_age=3600)
+NOW = 1_000_000.0
+
+
+class TestFreshness:
+    @pytest.mark.parametrize(
+        ("age", "expected"),
+        [
+            (0, Freshness.FRESH),
+            (60, Freshness.FRESH),
+            (61, Freshness.STALE),
+            (660, Freshness.STALE),
+            (661, Freshness.MUST_REVALIDATE),
+            (3600, Freshness.MUST_REVALIDATE),
+            (3601, Freshness.EXPIRED),
+        ],
+    )
+    def test_freshness_GIVEN_age_THEN_classifies(self, age: float, expected: Freshness) -> None:
+        assert POLICY.freshness(NOW - age, now=NOW) == expected
+
+    def test_freshness_GIVEN_no_fetch_time_THEN_must_revalidate(self) -> None:
+        assert POLICY.freshness(None, now=NOW) == Freshness.MUST_REVALIDATE
@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 
+from gtasks.utils import write_back
 from gtasks.utils.config import Config, ConfigKey
 
 LIST_TITLE = "ToDo"
@@ -71,7 +72,7 @@ class TestGetAll:
     def test_get_all_GIVEN_no_values_set_THEN_all_none(self, manager: Config) -> None:
         result = manager.get_all()
 
-        assert result == {ConfigKey.DEFAULT_TASKLIST_TITLE: None}
+        assert result == {key: None for key in ConfigKey}
 
     def test_get_all_GIVEN_value_set_THEN_returns_it(self, manager: Config) -> None:
         manager.set(ConfigKey.DEFAULT_TASKLIST_TITLE, LIST_TITLE)
@@ -79,3 +80,47 @@ class TestGetAll:
         result = manager.get_all()
 
         assert result[ConfigKey.DEFAULT_TASKLIST_TITLE] == LIST_TITLE
+
+
+class TestGetTyped:
+    def test_get_int_GIVEN_unset_THEN_returns_default(self, manager: Config) -> None:
+        assert manager.get_int(ConfigKey.HTTP_POOL_SIZE, 10) == 10
+
+    def test_get_int_GIVEN_value_set_THEN_converts(self, manager: Config) -> None:
+        manager.set(ConfigKey.HTTP_POOL_SIZE, "4")
+
+        assert manager.get_int(ConfigKey.HTTP_POOL_SIZE, 10) == 4
+
+    def test_get_float_GIVEN_value_set_THEN_converts(self, manager: Config) -> None:
+        manager.set(ConfigKey.HTTP_IDLE_TIMEOUT, "2.5")
+
+        assert manager.get_float(ConfigKey.HTTP_IDLE_TIMEOUT, 60.0) == 2.5
+
+    def test_get_int_GIVEN_invalid_value_THEN_raises_valueerror(self, manager: Config) -> None:
+        manager.set(ConfigKey.HTTP_POOL_SIZE, "lots")
+
+        with pytest.raises(ValueError, match="http_pool_size"):
+            manager.get_int(ConfigKey.HTTP_POOL_SIZE, 10)
+
+
+class TestWriteBack:
+    def test_set_GIVEN_session_THEN_writes_once_at_end(
+        self, manager: Config, config_path: Path
+    ) -> None:
+        with write_back.session():
+            manager.set(ConfigKey.DEFAULT_TASKLIST_TITLE, LIST_TITLE)
+            manager.set(ConfigKey.CACHE_BACKEND, "json")
+            assert not config_path.exists()
+
+        assert "cache_backend = json" in config_path.read_text()
+
+    def test_set_GIVEN_unchanged_value_THEN_skips_write(
+        self, manager: Config, config_path: Path
+    ) -> None:
+        manager.set(ConfigKey.DEFAULT_TASKLIST_TITLE, LIST_TITLE)
+        mtime = config_path.stat().st_mtime_ns
+
+        reloaded = Config(config_path, ConfigParser())
+        reloaded.set(ConfigKey.DEFAULT_TASKLIST_TITLE, LIST_TITLE)
+
+        assert config_path.stat().st_mtime_ns == mtime
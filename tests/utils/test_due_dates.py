@@ -0,0 +1,80 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from gtasks.utils.due_dates import _parse_due_date, parse_due_date
+
+TODAY = date(2026, 10, 17)  # a Saturday
+
+
+@pytest.fixture(autouse=True)
+def clear_memo() -> None:
+    _parse_due_date.cache_clear()
+
+
+class TestFastPath:
+    @pytest.mark.parametrize(
+        "expr, expected",
+        [
+            ("2026-05-01", "2026-05-01T00:00:00.000Z"),
+            ("2026-01-20T00:00:00Z", "2026-01-20T00:00:00.000Z"),
+            ("2026-01-20T23:30:00-05:00", "2026-01-21T00:00:00.000Z"),
+            ("today", "2026-10-17T00:00:00.000Z"),
+            ("Tomorrow", "2026-10-18T00:00:00.000Z"),
+            ("next week", "2026-10-24T00:00:00.000Z"),
+            ("in 3 days", "2026-10-20T00:00:00.000Z"),
+            ("in 1 day", "2026-10-18T00:00:00.000Z"),
+            ("in 2 weeks", "2026-10-31T00:00:00.000Z"),
+            ("friday", "2026-10-23T00:00:00.000Z"),
+            ("mon", "2026-10-19T00:00:00.000Z"),
+            ("next  Friday", "2026-10-23T00:00:00.000Z"),
+            ("saturday", "2026-10-24T00:00:00.000Z"),  # same weekday means next week
+        ],
+    )
+    def test_parse_due_date_GIVEN_common_expression_THEN_skips_dateparser(
+        self, expr: str, expected: str
+    ) -> None:
+        with patch("gtasks.utils.due_dates._parse_with_dateparser") as mock_fallback:
+            result = parse_due_date(expr, today=TODAY)
+
+        assert result == expected
+        mock_fallback.assert_not_called()
+
+
+class TestFallback:
+    def test_parse_due_date_GIVEN_unrecognised_expression_THEN_uses_dateparser(self) -> None:
+        parsed = datetime(2027, 5, 5, tzinfo=timezone.utc)
+
+        with patch("dateparser.parse", return_value=parsed) as mock_parse:
+            result = parse_due_date("May 5", today=TODAY)
+
+        assert result == "2027-05-05T00:00:00.000Z"
+        assert mock_parse.call_args.args[0] == "may 5"
+
+    def test_parse_due_date_GIVEN_unparseable_THEN_raises_value_error(self) -> None:
+        with patch("dateparser.parse", return_value=None):
+            with pytest.raises(ValueError, match="Could not parse due date"):
+                parse_due_date("gibberish", today=TODAY)
+
+    def test_parse_due_date_GIVEN_invalid_iso_date_THEN_falls_back(self) -> None:
+        with patch("dateparser.parse", return_value=None) as mock_parse:
+            with pytest.raises(ValueError):
+                parse_due_date("2026-02-30", today=TODAY)
+
+        mock_parse.assert_called_once()
+
+
+class TestMemo:
+    def test_parse_due_date_GIVEN_repeated_expression_THEN_parses_once(self) -> None:
+        parsed = datetime(2027, 5, 5, tzinfo=timezone.utc)
+
+        with patch("dateparser.parse", return_value=parsed) as mock_parse:
+            parse_due_date("may 5", today=TODAY)
+            parse_due_date("May  5", today=TODAY)
+
+        mock_parse.assert_called_once()
+
+    def test_parse_due_date_GIVEN_different_day_THEN_recomputes_relative_dates(self) -> None:
+        assert parse_due_date("tomorrow", today=TODAY) == "2026-10-18T00:00:00.000Z"
+        assert parse_due_date("tomorrow", today=date(2026, 10, 18)) == "2026-10-19T00:00:00.000Z"
@@ -0,0 +1,146 @@
+import json
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gtasks.utils.record_file import MAGIC, VERSION, read_records, write_records
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    return [{"id": f"t{i}", "title": f"Task {i}", "done": i % 2 == 1} for i in range(50)]
+
+
+class TestRoundTrip:
+    def test_GIVEN_records_THEN_reads_them_back(self, tmp_path: Path, records: list[dict]) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records)
+
+        view = read_records(path)
+
+        assert len(view) == len(records)
+        assert list(view) == records
+        assert view[3] == records[3]
+        assert view[-1] == records[-1]
+        assert view[10:13] == records[10:13]
+
+    def test_GIVEN_no_records_THEN_reads_empty_view(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, [])
+
+        assert list(read_records(path)) == []
+
+    def test_GIVEN_non_ascii_THEN_round_trips(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, [{"title": "Café ☕"}])
+
+        assert read_records(path)[0] == {"title": "Café ☕"}
+
+    def test_GIVEN_existing_file_mapped_THEN_rewrite_leaves_old_view_intact(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records)
+        old = read_records(path)
+
+        write_records(path, records[:1])
+
+        assert list(old) == records
+        assert list(read_records(path)) == records[:1]
+
+
+class TestLazyDecoding:
+    def test_GIVEN_slice_THEN_decodes_only_sliced_records(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            view = read_records(path)
+            first = view[:10]
+
+        assert first == records[:10]
+        assert loads.call_count == 10
+
+    def test_GIVEN_repeated_reads_THEN_decodes_once(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records)
+        view = read_records(path)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            view[0]
+            view[0]
+
+        assert loads.call_count == 1
+
+    def test_where_GIVEN_flags_THEN_selects_without_decoding(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records, flags=lambda r: 1 if r["done"] else 0)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            undone = read_records(path).where(lambda flags: not flags & 1)
+            assert loads.call_count == 0
+
+        assert list(undone) == [r for r in records if not r["done"]]
+
+    def test_segment_GIVEN_split_THEN_views_each_side_without_decoding(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records, split=20)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            view = read_records(path)
+            first, second = view.segment(first=True), view.segment(first=False)
+            assert loads.call_count == 0
+
+        assert list(first) == records[:20]
+        assert list(second) == records[20:]
+
+    def test_segment_GIVEN_no_split_THEN_first_segment_holds_everything(
+        self, tmp_path: Path, records: list[dict]
+    ) -> None:
+        path = tmp_path / "list.rec"
+        write_records(path, records)
+
+        view = read_records(path)
+
+        assert list(view.segment(first=True)) == records
+        assert list(view.segment(first=False)) == []
+
+
+class TestInvalidFiles:
+    def test_GIVEN_empty_file_THEN_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            read_records(path)
+
+    def test_GIVEN_json_file_THEN_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        path.write_text('[{"id": "t1"}]')
+
+        with pytest.raises(ValueError):
+            read_records(path)
+
+    def test_GIVEN_unknown_version_THEN_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        path.write_bytes(struct.pack("<4sHII", MAGIC, 99, 0, 0))
+
+        with pytest.raises(ValueError):
+            read_records(path)
+
+    def test_GIVEN_truncated_index_THEN_raises_value_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.rec"
+        path.write_bytes(struct.pack("<4sHII", MAGIC, VERSION, 10, 0))
+
+        with pytest.raises(ValueError):
+            read_records(path)
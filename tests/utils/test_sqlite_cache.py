@@ -0,0 +1,291 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from gtasks.utils.sqlite_cache import SqliteBidictCache, SqliteStore, SqliteTasksCache
+from gtasks.utils.tasks_cache import TasksCache
+
+TASKS = [
+    {"id": "t1", "title": "Buy milk", "status": "needsAction", "position": "001",
+     "updated": "2026-01-01T10:00:00.000Z"},
+    {"id": "c1", "title": "Subtask", "status": "completed", "parent": "t1", "position": "000",
+     "updated": "2026-01-02T10:00:00.000Z"},
+    {"id": "t2", "title": "Walk dog", "status": "completed", "position": "005",
+     "updated": "2026-01-01T11:00:00.000Z"},
+]
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache.sqlite3"
+
+
+@pytest.fixture
+def store(db_path: Path) -> Iterator[SqliteStore]:
+    store = SqliteStore(db_path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def cache(store: SqliteStore) -> SqliteTasksCache:
+    return SqliteTasksCache(store)
+
+
+@pytest.fixture
+def warm_cache(cache: SqliteTasksCache) -> SqliteTasksCache:
+    cache.set("list1", TASKS, etag='"v1"')
+    return cache
+
+
+class TestSqliteTasksCacheGet:
+    def test_GIVEN_no_entry_THEN_returns_none(self, cache: SqliteTasksCache) -> None:
+        assert cache.get("list1") is None
+
+    def test_GIVEN_entry_set_THEN_returns_tasks_in_order(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        assert warm_cache.get("list1") == TASKS
+
+    def test_GIVEN_empty_list_set_THEN_returns_empty_list(self, cache: SqliteTasksCache) -> None:
+        cache.set("list1", [])
+
+        assert cache.get("list1") == []
+
+    def test_GIVEN_show_completed_false_THEN_filters_completed(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        assert [t["id"] for t in warm_cache.get("list1", show_completed=False)] == ["t1"]
+
+    def test_GIVEN_reopened_store_THEN_persists(
+        self, warm_cache: SqliteTasksCache, db_path: Path
+    ) -> None:
+        reopened = SqliteTasksCache(SqliteStore(db_path))
+
+        assert reopened.get("list1") == TASKS
+        assert reopened.etag("list1") == '"v1"'
+
+
+class TestSqliteTasksCacheFindByTitle:
+    def test_GIVEN_title_in_other_case_THEN_matches(self, warm_cache: SqliteTasksCache) -> None:
+        assert [t["id"] for t in warm_cache.find_by_title("list1", "WALK DOG")] == ["t2"]
+
+    def test_GIVEN_non_ascii_title_THEN_matches_case_insensitively(
+        self, cache: SqliteTasksCache
+    ) -> None:
+        cache.set("list1", [{"id": "t1", "title": "Ölwechsel"}])
+
+        assert [t["id"] for t in cache.find_by_title("list1", "ÖLWECHSEL")] == ["t1"]
+
+    def test_GIVEN_missing_list_THEN_returns_none(self, cache: SqliteTasksCache) -> None:
+        assert cache.find_by_title("list1", "Buy milk") is None
+
+
+class TestSqliteTasksCacheSync:
+    def test_mark_stale_GIVEN_synced_entry_THEN_keeps_sync_base(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.mark_stale("list1")
+
+        assert warm_cache.get("list1") is None
+        assert warm_cache.sync_base("list1") == "2026-01-02T10:00:00.000Z"
+
+    def test_expire_THEN_clears_fetch_time_and_keeps_serving(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.expire("list1")
+
+        assert warm_cache.fetched_at("list1") is None
+        assert warm_cache.get("list1") is not None
+
+    def test_mark_stale_GIVEN_no_updated_timestamps_THEN_invalidates(
+        self, cache: SqliteTasksCache
+    ) -> None:
+        cache.set("list1", [{"id": "t1", "title": "Buy milk"}])
+
+        cache.mark_stale("list1")
+
+        assert cache.sync_base("list1") is None
+
+    def test_merge_GIVEN_delta_THEN_replaces_appends_and_removes(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.mark_stale("list1")
+        delta = [
+            {"id": "t1", "title": "Buy oat milk", "updated": "2026-01-03T10:00:00.000Z"},
+            {"id": "c1", "deleted": True, "updated": "2026-01-03T11:00:00.000Z"},
+            {"id": "t3", "title": "New", "updated": "2026-01-03T12:00:00.000Z"},
+        ]
+
+        merged = warm_cache.merge("list1", delta, etag='"v2"')
+
+        assert [t["id"] for t in merged] == ["t1", "t3", "t2"]  # active tasks first
+        assert merged[0]["title"] == "Buy oat milk"
+        assert warm_cache.sync_base("list1") == "2026-01-03T12:00:00.000Z"
+        assert warm_cache.etag("list1") == '"v2"'
+
+    def test_merge_GIVEN_new_or_moved_tasks_with_positions_THEN_places_them_among_siblings(
+        self, cache: SqliteTasksCache
+    ) -> None:
+        updated = "2026-01-01T10:00:00.000Z"
+        cache.set(
+            "list1",
+            [{"id": f"t{i}", "position": f"00{i}", "updated": updated} for i in range(1, 4)],
+        )
+        cache.mark_stale("list1")
+        delta = [
+            {"id": "t3", "position": "000", "updated": "2026-01-03T10:00:00.000Z"},
+            {"id": "t4", "position": "0015", "updated": "2026-01-03T11:00:00.000Z"},
+        ]
+
+        merged = cache.merge("list1", delta)
+
+        assert [t["id"] for t in merged] == ["t3", "t1", "t4", "t2"]
+
+    def test_revalidate_GIVEN_stale_entry_THEN_serves_it_again(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.mark_stale("list1")
+
+        warm_cache.revalidate("list1")
+
+        assert warm_cache.get("list1") == TASKS
+        assert warm_cache.fetched_at("list1") is not None
+
+    def test_add_history_GIVEN_active_only_list_THEN_merges_and_extends_coverage(
+        self, cache: SqliteTasksCache
+    ) -> None:
+        cache.set("list1", TASKS[:1], etag='"v1"', completed_min=None)
+
+        cache.add_history("list1", TASKS[1:], "2025-01-01T00:00:00Z")
+
+        assert cache.history("list1") == "2025-01-01T00:00:00Z"
+        assert [t["id"] for t in cache.get("list1")] == ["t1", "c1", "t2"]
+        assert cache.etag("list1") == '"v1"'
+
+    def test_merge_GIVEN_history_THEN_keeps_it(self, cache: SqliteTasksCache) -> None:
+        cache.set("list1", TASKS, completed_min="2025-01-01T00:00:00Z")
+
+        cache.merge("list1", [{"id": "t3", "updated": "2026-01-03T10:00:00.000Z"}])
+
+        assert cache.history("list1") == "2025-01-01T00:00:00Z"
+
+    def test_completed_since_THEN_returns_completed_tasks_by_completion_time(
+        self, cache: SqliteTasksCache
+    ) -> None:
+        cache.set(
+            "list1",
+            [
+                {"id": "t1", "status": "needsAction"},
+                {"id": "c2", "status": "completed", "completed": "2026-02-01T00:00:00.000Z"},
+                {"id": "c1", "status": "completed", "completed": "2026-01-01T00:00:00.000Z"},
+                {"id": "c0", "status": "completed", "completed": "2025-12-01T00:00:00.000Z"},
+            ],
+        )
+
+        result = cache.completed_since("list1", "2026-01-01T00:00:00.000Z")
+
+        assert [t["id"] for t in result] == ["c1", "c2"]
+
+    def test_clear_THEN_drops_every_list(self, warm_cache: SqliteTasksCache) -> None:
+        warm_cache.set("list2", TASKS)
+
+        warm_cache.clear()
+
+        assert warm_cache.get("list1") is None
+        assert warm_cache.get("list2") is None
+
+
+class TestSqliteTasksCacheWriteThrough:
+    def test_upsert_GIVEN_new_task_THEN_inserts_by_position_among_siblings(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.upsert("list1", [{"id": "t3", "title": "New", "position": "003"}])
+
+        assert [t["id"] for t in warm_cache.get("list1")] == ["t1", "t3", "c1", "t2"]
+
+    def test_upsert_GIVEN_new_first_task_THEN_inserts_at_top(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.upsert("list1", [{"id": "t0", "title": "New", "position": "000"}])
+
+        assert warm_cache.get("list1")[0]["id"] == "t0"
+
+    def test_upsert_GIVEN_known_task_THEN_replaces_in_place(
+        self, warm_cache: SqliteTasksCache
+    ) -> None:
+        warm_cache.upsert("list1", [{**TASKS[0], "status": "completed"}])
+
+        assert [t["status"] for t in warm_cache.get("list1")] == ["completed"] * 3
+
+    def test_upsert_GIVEN_stale_list_THEN_does_nothing(self, warm_cache: SqliteTasksCache) -> None:
+        warm_cache.mark_stale("list1")
+        warm_cache.upsert("list1", [{"id": "t3", "title": "New"}])
+        warm_cache.revalidate("list1")
+
+        assert warm_cache.get("list1") == TASKS
+
+    def test_remove_GIVEN_ids_THEN_drops_them(self, warm_cache: SqliteTasksCache) -> None:
+        warm_cache.remove("list1", ["t1", "c1"])
+
+        assert [t["id"] for t in warm_cache.get("list1")] == ["t2"]
+
+
+class TestSqliteBidictCache:
+    def test_overwrite_GIVEN_items_and_meta_THEN_persists(
+        self, store: SqliteStore, db_path: Path
+    ) -> None:
+        cache = SqliteBidictCache(store)
+
+        cache.overwrite({"Work": "list1"}, {"list1": {"updated": "2026-01-01"}}, '"v1"')
+
+        reopened = SqliteBidictCache(SqliteStore(db_path))
+        assert dict(reopened) == {"Work": "list1"}
+        assert reopened.inv["list1"] == "Work"
+        assert reopened.meta == {"list1": {"updated": "2026-01-01"}}
+        assert reopened.etag == '"v1"'
+        assert reopened.fetched_at is not None
+
+    def test_overwrite_GIVEN_existing_items_THEN_replaces(self, store: SqliteStore) -> None:
+        cache = SqliteBidictCache(store)
+        cache.overwrite({"Work": "list1"})
+
+        cache.overwrite({"Personal": "list2"})
+
+        assert dict(SqliteBidictCache(store)) == {"Personal": "list2"}
+
+    def test_init_GIVEN_empty_database_THEN_starts_empty(self, store: SqliteStore) -> None:
+        cache = SqliteBidictCache(store)
+
+        assert len(cache) == 0
+        assert cache.fetched_at is None
+
+
+class TestBackendParity:
+    MIXED = [
+        {"id": "c1", "title": "Done", "status": "completed", "position": "000",
+         "completed": "2026-01-05T00:00:00.000Z", "updated": "2026-01-05T00:00:00.000Z"},
+        {"id": "t1", "title": "Buy milk", "status": "needsAction", "position": "001",
+         "updated": "2026-01-01T00:00:00.000Z"},
+        {"id": "c2", "title": "Done", "status": "completed", "position": "002",
+         "completed": "2026-01-02T00:00:00.000Z", "updated": "2026-01-02T00:00:00.000Z"},
+        {"id": "t2", "title": "Walk dog", "status": "needsAction", "position": "003",
+         "updated": "2026-01-01T00:00:00.000Z"},
+    ]
+
+    def test_reads_GIVEN_same_tasks_THEN_both_backends_return_same_order(
+        self, cache: SqliteTasksCache, tmp_path: Path
+    ) -> None:
+        json_cache = TasksCache(tmp_path / "tasks")
+        for backend in (cache, json_cache):
+            backend.set("list1", self.MIXED)
+
+        for read in (
+            lambda c: c.get("list1"),
+            lambda c: c.get("list1", show_completed=False),
+            lambda c: c.find_by_title("list1", "done"),
+            lambda c: c.completed_since("list1", "2026-01-01T00:00:00.000Z"),
+        ):
+            assert read(cache) == read(json_cache)
+        assert [t["id"] for t in cache.get("list1")] == ["t1", "t2", "c2", "c1"]
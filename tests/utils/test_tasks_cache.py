@@ -1,9 +1,25 @@
 import json
+import multiprocessing
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from gtasks.utils.tasks_cache import TasksCache
+from gtasks.utils import write_back
+from gtasks.utils.record_file import read_records, write_records
+from gtasks.utils.tasks_cache import ALL_HISTORY, TasksCache, api_timestamp
+
+
+def _stress_worker(cache_dir: str, worker: int, rounds: int) -> None:
+    # Runs in a separate process: each round writes to a shared list and reads it back
+    # through a fresh cache, as concurrent gtasks invocations would.
+    cache = TasksCache(Path(cache_dir), compact_threshold=1024)
+    cache.set(f"own{worker}", [{"id": f"own{worker}", "title": "Own"}])
+    for i in range(rounds):
+        cache.upsert("shared", [{"id": f"w{worker}-{i}", "title": f"Task {worker}-{i}"}])
+        tasks = TasksCache(Path(cache_dir)).get("shared")
+        assert tasks is not None, "shared list was dropped"
+        assert len(list(tasks)) > i
 
 
 @pytest.fixture
@@ -42,9 +58,9 @@ class TestSet:
     ) -> None:
         cache.set("list1", sample_tasks)
 
-        path = cache_dir / "list1.json"
+        path = cache_dir / "list1.rec"
         assert path.exists()
-        assert json.loads(path.read_text()) == sample_tasks
+        assert list(read_records(path)) == sample_tasks
 
     def test_GIVEN_existing_entry_THEN_overwrites(
         self, cache: TasksCache, sample_tasks: list[dict]
@@ -125,3 +141,647 @@ class TestLoadOnStartup:
         cache = TasksCache(tmp_path / "nonexistent")
 
         assert cache.get("list1") is None
+
+
+class TestMarkStale:
+    SYNCED_TASKS = [
+        {"id": "t1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"},
+        {"id": "t2", "title": "Walk dog", "updated": "2026-01-02T10:00:00.000Z"},
+    ]
+
+    def test_GIVEN_synced_entry_THEN_get_returns_none_but_keeps_sync_base(
+        self, cache: TasksCache, cache_dir: Path
+    ) -> None:
+        cache.set("list1", self.SYNCED_TASKS)
+
+        cache.mark_stale("list1")
+
+        assert cache.get("list1") is None
+        assert cache.sync_base("list1") == "2026-01-02T10:00:00.000Z"
+        assert (cache_dir / "list1.rec").exists()
+
+    def test_GIVEN_no_updated_timestamps_THEN_invalidates(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        cache.mark_stale("list1")
+
+        assert cache.get("list1") is None
+        assert cache.sync_base("list1") is None
+        assert not (cache_dir / "list1.rec").exists()
+
+    def test_GIVEN_reload_THEN_stays_stale(self, cache: TasksCache, cache_dir: Path) -> None:
+        cache.set("list1", self.SYNCED_TASKS)
+        cache.mark_stale("list1")
+
+        reloaded = TasksCache(cache_dir)
+
+        assert reloaded.get("list1") is None
+        assert reloaded.sync_base("list1") == "2026-01-02T10:00:00.000Z"
+
+    def test_GIVEN_missing_entry_THEN_no_error(self, cache: TasksCache) -> None:
+        cache.mark_stale("nonexistent")
+
+
+class TestMerge:
+    BASE = [
+        {"id": "t1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"},
+        {"id": "t2", "title": "Walk dog", "updated": "2026-01-02T10:00:00.000Z"},
+        {"id": "t3", "title": "Call mum", "updated": "2026-01-02T11:00:00.000Z"},
+    ]
+
+    @pytest.fixture
+    def stale_cache(self, cache: TasksCache) -> TasksCache:
+        cache.set("list1", self.BASE)
+        cache.mark_stale("list1")
+        return cache
+
+    def test_GIVEN_changed_task_THEN_replaces_in_place(self, stale_cache: TasksCache) -> None:
+        changed = {"id": "t2", "title": "Walk cat", "updated": "2026-01-03T10:00:00.000Z"}
+
+        merged = stale_cache.merge("list1", [changed])
+
+        assert [t["title"] for t in merged] == ["Buy milk", "Walk cat", "Call mum"]
+        assert stale_cache.get("list1") == merged
+
+    def test_GIVEN_new_task_THEN_appends(self, stale_cache: TasksCache) -> None:
+        new = {"id": "t4", "title": "Pay rent", "updated": "2026-01-03T10:00:00.000Z"}
+
+        merged = stale_cache.merge("list1", [new])
+
+        assert [t["id"] for t in merged] == ["t1", "t2", "t3", "t4"]
+
+    def test_GIVEN_new_or_moved_tasks_with_positions_THEN_places_them_among_siblings(
+        self, cache: TasksCache
+    ) -> None:
+        updated = "2026-01-01T10:00:00.000Z"
+        cache.set(
+            "list1",
+            [{"id": f"t{i}", "position": f"00{i}", "updated": updated} for i in range(1, 4)],
+        )
+        cache.mark_stale("list1")
+        delta = [
+            {"id": "t3", "position": "000", "updated": "2026-01-03T10:00:00.000Z"},
+            {"id": "t4", "position": "0015", "updated": "2026-01-03T11:00:00.000Z"},
+        ]
+
+        merged = cache.merge("list1", delta)
+
+        assert [t["id"] for t in merged] == ["t3", "t1", "t4", "t2"]
+
+    def test_GIVEN_deleted_or_hidden_tasks_THEN_removes_them(
+        self, stale_cache: TasksCache
+    ) -> None:
+        delta = [
+            {"id": "t1", "deleted": True, "updated": "2026-01-03T10:00:00.000Z"},
+            {"id": "t3", "hidden": True, "updated": "2026-01-03T11:00:00.000Z"},
+            {"id": "t9", "deleted": True, "updated": "2026-01-03T12:00:00.000Z"},
+        ]
+
+        merged = stale_cache.merge("list1", delta)
+
+        assert [t["id"] for t in merged] == ["t2"]
+
+    def test_GIVEN_delta_THEN_advances_high_water_mark(self, stale_cache: TasksCache) -> None:
+        stale_cache.merge("list1", [{"id": "t1", "updated": "2026-02-01T00:00:00.000Z"}])
+
+        assert stale_cache.sync_base("list1") == "2026-02-01T00:00:00.000Z"
+
+    def test_GIVEN_empty_delta_THEN_keeps_high_water_mark(self, stale_cache: TasksCache) -> None:
+        merged = stale_cache.merge("list1", [])
+
+        assert merged == self.BASE
+        assert stale_cache.sync_base("list1") == "2026-01-02T11:00:00.000Z"
+
+    def test_GIVEN_merge_THEN_persists_to_disk(
+        self, stale_cache: TasksCache, cache_dir: Path
+    ) -> None:
+        stale_cache.merge("list1", [{"id": "t1", "deleted": True}])
+
+        reloaded = TasksCache(cache_dir)
+
+        assert [t["id"] for t in reloaded.get("list1")] == ["t2", "t3"]
+
+
+class TestUpsert:
+    TASKS = [
+        {"id": "t1", "title": "Buy milk", "position": "001"},
+        {"id": "c1", "title": "Subtask", "parent": "t1", "position": "000"},
+        {"id": "t2", "title": "Walk dog", "position": "005"},
+    ]
+
+    @pytest.fixture
+    def warm_cache(self, cache: TasksCache) -> TasksCache:
+        cache.set("list1", [dict(t) for t in self.TASKS])
+        return cache
+
+    def test_GIVEN_known_task_THEN_replaces_in_place(self, warm_cache: TasksCache) -> None:
+        warm_cache.upsert("list1", [{"id": "t1", "title": "Buy oat milk", "position": "001"}])
+
+        assert warm_cache.get("list1")[0]["title"] == "Buy oat milk"
+
+    def test_GIVEN_new_task_THEN_inserts_by_position_among_siblings(
+        self, warm_cache: TasksCache
+    ) -> None:
+        warm_cache.upsert("list1", [{"id": "t3", "title": "New", "position": "003"}])
+
+        assert [t["id"] for t in warm_cache.get("list1")] == ["t1", "c1", "t3", "t2"]
+
+    def test_GIVEN_new_task_without_position_THEN_appends(self, warm_cache: TasksCache) -> None:
+        warm_cache.upsert("list1", [{"id": "t3", "title": "New"}])
+
+        assert warm_cache.get("list1")[-1]["id"] == "t3"
+
+    def test_GIVEN_upsert_THEN_persists_to_disk(
+        self, warm_cache: TasksCache, cache_dir: Path
+    ) -> None:
+        warm_cache.upsert("list1", [{"id": "t3", "title": "New"}])
+
+        assert len(TasksCache(cache_dir).get("list1")) == 4
+
+    def test_GIVEN_missing_list_THEN_does_nothing(self, cache: TasksCache) -> None:
+        cache.upsert("list1", [{"id": "t3", "title": "New"}])
+
+        assert cache.get("list1") is None
+
+
+class TestRemove:
+    def test_GIVEN_cached_ids_THEN_drops_them(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        cache.remove("list1", ["t1"])
+
+        assert [t["id"] for t in cache.get("list1")] == ["t2"]
+        assert [t["id"] for t in TasksCache(cache_dir).get("list1")] == ["t2"]
+
+    def test_GIVEN_missing_list_THEN_does_nothing(self, cache: TasksCache) -> None:
+        cache.remove("list1", ["t1"])
+
+        assert cache.get("list1") is None
+
+
+class TestEtag:
+    TASKS = [{"id": "t1", "title": "Buy milk", "updated": "2026-01-01T10:00:00.000Z"}]
+
+    def test_GIVEN_set_with_etag_THEN_persists_it(self, cache: TasksCache, cache_dir: Path) -> None:
+        cache.set("list1", self.TASKS, etag='"v1"')
+
+        assert TasksCache(cache_dir).etag("list1") == '"v1"'
+
+    def test_GIVEN_merge_with_etag_THEN_replaces_it(self, cache: TasksCache) -> None:
+        cache.set("list1", self.TASKS, etag='"v1"')
+
+        cache.merge("list1", [], etag='"v2"')
+
+        assert cache.etag("list1") == '"v2"'
+
+    def test_revalidate_GIVEN_stale_list_THEN_serves_it_again(
+        self, cache: TasksCache, cache_dir: Path
+    ) -> None:
+        cache.set("list1", self.TASKS, etag='"v1"')
+        cache.mark_stale("list1")
+
+        cache.revalidate("list1")
+
+        assert cache.get("list1") == self.TASKS
+        assert TasksCache(cache_dir).get("list1") == self.TASKS
+
+
+class TestFetchedAt:
+    def test_GIVEN_set_THEN_records_fetch_time(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        assert TasksCache(cache_dir).fetched_at("list1") is not None
+
+    def test_GIVEN_missing_list_THEN_returns_none(self, cache: TasksCache) -> None:
+        assert cache.fetched_at("list1") is None
+
+    def test_GIVEN_expired_THEN_clears_fetch_time_and_keeps_serving(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        cache.expire("list1")
+
+        reloaded = TasksCache(cache_dir)
+        assert reloaded.fetched_at("list1") is None
+        assert reloaded.get("list1") == sample_tasks
+
+
+class TestLazyLoading:
+    def test_GIVEN_cached_lists_THEN_init_reads_no_list_file(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        cache.set("list2", sample_tasks)
+
+        with patch("gtasks.utils.tasks_cache.read_records", wraps=read_records) as read:
+            reloaded = TasksCache(cache_dir)
+            assert read.call_count == 0
+            reloaded.get("list1")
+
+        assert read.call_count == 1
+
+    def test_GIVEN_corrupt_list_file_THEN_other_lists_still_load(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        cache.set("list2", sample_tasks)
+        (cache_dir / "list2.rec").write_text("not a record file")
+
+        reloaded = TasksCache(cache_dir)
+
+        assert reloaded.get("list1") == sample_tasks
+        assert reloaded.get("list2") is None
+        assert not (cache_dir / "list2.rec").exists()
+
+    def test_GIVEN_no_manifest_THEN_indexes_existing_files_once(
+        self, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "list1.json").write_text(json.dumps(sample_tasks))
+
+        TasksCache(cache_dir)
+
+        manifest = json.loads((cache_dir / ".sync.json").read_text())
+        assert list(manifest) == ["list1"]
+
+    def test_GIVEN_corrupt_manifest_THEN_rebuilds_it_from_files(
+        self, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "list1.json").write_text(json.dumps(sample_tasks))
+        (cache_dir / ".sync.json").write_text("not valid json{{{")
+
+        cache = TasksCache(cache_dir)
+
+        assert cache.get("list1") == sample_tasks
+
+    def test_clear_GIVEN_unrelated_json_file_THEN_leaves_it(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        unrelated = cache_dir / "notes.json"
+        unrelated.write_text("{}")
+
+        cache.clear()
+
+        assert unrelated.exists()
+        assert not (cache_dir / "list1.rec").exists()
+
+
+class TestHistory:
+    ACTIVE = [{"id": "t1", "title": "Buy milk", "status": "needsAction"}]
+    OLD = [
+        {"id": "t2", "title": "Walk dog", "status": "completed", "completed": "2025-06-01T00:00Z"}
+    ]
+
+    def test_GIVEN_full_listing_THEN_holds_all_history(
+        self, cache: TasksCache, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        assert cache.history("list1") == ALL_HISTORY
+
+    def test_GIVEN_active_only_listing_THEN_holds_no_history(self, cache: TasksCache) -> None:
+        cache.set("list1", self.ACTIVE, completed_min=None)
+
+        assert cache.history("list1") is None
+        assert cache.history("missing") is None
+
+    def test_add_history_THEN_merges_tasks_and_extends_coverage(
+        self, cache: TasksCache, cache_dir: Path
+    ) -> None:
+        cache.set("list1", self.ACTIVE, completed_min=None)
+
+        cache.add_history("list1", self.OLD, "2025-01-01T00:00Z")
+        cache.add_history("list1", [], "2025-03-01T00:00Z")  # narrower: coverage is kept
+
+        reloaded = TasksCache(cache_dir)
+        assert reloaded.history("list1") == "2025-01-01T00:00Z"
+        assert reloaded.get("list1") == self.ACTIVE + self.OLD
+
+    def test_add_history_THEN_keeps_sync_state(self, cache: TasksCache) -> None:
+        cache.set("list1", self.ACTIVE, etag='"v1"', completed_min=None)
+        base = cache.sync_base("list1")
+
+        cache.add_history("list1", self.OLD, ALL_HISTORY)
+
+        assert cache.etag("list1") == '"v1"'
+        assert cache.sync_base("list1") == base
+
+    def test_get_GIVEN_snapshot_THEN_active_tasks_skip_completed_segment(
+        self, cache_dir: Path
+    ) -> None:
+        TasksCache(cache_dir).set("list1", self.OLD + self.ACTIVE)
+        cache = TasksCache(cache_dir)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            assert list(cache.get("list1", show_completed=False)) == self.ACTIVE
+            assert loads.call_count == 1
+
+    def test_GIVEN_legacy_manifest_entry_THEN_assumes_full_history(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        manifest_path = cache_dir / ".sync.json"
+        manifest = json.loads(manifest_path.read_text())
+        del manifest["list1"]["completed_min"]
+        manifest_path.write_text(json.dumps(manifest))
+
+        assert TasksCache(cache_dir).history("list1") == ALL_HISTORY
+
+
+class TestApiTimestamp:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("2026-03-01T00:00:00.000Z", "2026-03-01T00:00:00.000Z"),
+            ("2026-03-01T00:00:00Z", "2026-03-01T00:00:00.000Z"),
+            ("2026-03-01T00:00:00+01:00", "2026-02-28T23:00:00.000Z"),
+            ("2026-03-01T12:30:00.123456-02:00", "2026-03-01T14:30:00.123Z"),
+            ("2026-03-01T00:00:00", "2026-03-01T00:00:00.000Z"),
+        ],
+    )
+    def test_THEN_returns_utc_milliseconds(self, value: str, expected: str) -> None:
+        assert api_timestamp(value) == expected
+
+    def test_GIVEN_invalid_timestamp_THEN_raises(self) -> None:
+        with pytest.raises(ValueError):
+            api_timestamp("yesterday")
+
+
+class TestCompletedSince:
+    TASKS = [
+        {"id": "a1", "status": "needsAction"},
+        {"id": "c3", "status": "completed", "completed": "2026-03-01T00:00:00.000Z"},
+        {"id": "c1", "status": "completed", "completed": "2026-01-01T00:00:00.000Z"},
+        {"id": "c2", "status": "completed", "completed": "2026-02-01T00:00:00.000Z"},
+    ]
+
+    def test_GIVEN_snapshot_THEN_returns_tasks_completed_since_oldest_first(
+        self, cache_dir: Path
+    ) -> None:
+        TasksCache(cache_dir).set("list1", self.TASKS)
+
+        result = TasksCache(cache_dir).completed_since("list1", "2026-02-01T00:00:00.000Z")
+
+        assert [t["id"] for t in result] == ["c2", "c3"]
+
+    def test_GIVEN_snapshot_THEN_decodes_only_what_the_search_touches(
+        self, cache_dir: Path
+    ) -> None:
+        tasks = [
+            {"id": f"c{i}", "status": "completed", "completed": f"2026-01-01T00:{i:02d}:00Z"}
+            for i in range(60)
+        ]
+        TasksCache(cache_dir).set("list1", tasks)
+        cache = TasksCache(cache_dir)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            result = cache.completed_since("list1", "2026-01-01T00:58:00Z")
+            assert [t["id"] for t in result] == ["c58", "c59"]
+            assert loads.call_count <= 8
+
+    def test_GIVEN_changes_since_snapshot_THEN_index_follows_them(
+        self, cache: TasksCache
+    ) -> None:
+        cache.set("list1", self.TASKS)
+
+        cache.upsert(
+            "list1", [{"id": "a1", "status": "completed", "completed": "2026-01-15T00:00:00.000Z"}]
+        )
+        cache.remove("list1", ["c3"])
+
+        result = cache.completed_since("list1", "2026-01-01T00:00:00.000Z")
+        assert [t["id"] for t in result] == ["c1", "a1", "c2"]
+
+    def test_GIVEN_stale_list_THEN_returns_none(self, cache: TasksCache) -> None:
+        cache.set("list1", [{**t, "updated": "2026-01-01T00:00:00.000Z"} for t in self.TASKS])
+        cache.mark_stale("list1")
+
+        assert cache.completed_since("list1", ALL_HISTORY) is None
+
+    def test_GIVEN_snapshot_from_older_layout_THEN_reorders_and_rewrites_it(
+        self, cache_dir: Path
+    ) -> None:
+        TasksCache(cache_dir).set("list1", self.TASKS)
+        write_records(cache_dir / "list1.rec", self.TASKS, split=1)  # unsorted history
+        manifest_path = cache_dir / ".sync.json"
+        manifest = json.loads(manifest_path.read_text())
+        del manifest["list1"]["layout"], manifest["list1"]["digest"]
+        manifest_path.write_text(json.dumps(manifest))
+
+        with write_back.session():
+            result = TasksCache(cache_dir).completed_since("list1", ALL_HISTORY)
+
+        assert [t["id"] for t in result] == ["c1", "c2", "c3"]
+        assert [t["id"] for t in read_records(cache_dir / "list1.rec")] == ["a1", "c1", "c2", "c3"]
+
+
+class TestRecordFormat:
+    def test_GIVEN_legacy_json_list_THEN_migrates_to_record_file(
+        self, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "list1.json").write_text(json.dumps(sample_tasks, indent=2))
+
+        cache = TasksCache(cache_dir)
+
+        assert cache.get("list1") == sample_tasks
+        assert not (cache_dir / "list1.json").exists()
+        assert list(read_records(cache_dir / "list1.rec")) == sample_tasks
+
+    def test_GIVEN_legacy_json_list_THEN_record_file_is_smaller(
+        self, cache_dir: Path
+    ) -> None:
+        tasks = [
+            {"id": f"t{i}", "title": f"Task {i}", "status": "needsAction"} for i in range(200)
+        ]
+        cache_dir.mkdir(parents=True)
+        legacy = cache_dir / "list1.json"
+        legacy.write_text(json.dumps(tasks, indent=2))
+        legacy_size = legacy.stat().st_size
+
+        TasksCache(cache_dir).get("list1")
+
+        assert (cache_dir / "list1.rec").stat().st_size < legacy_size
+
+    def test_get_GIVEN_hide_completed_THEN_filters_without_decoding_completed(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        reloaded = TasksCache(cache_dir)
+
+        with patch("gtasks.utils.record_file.json.loads", wraps=json.loads) as loads:
+            result = reloaded.get("list1", show_completed=False)
+            assert loads.call_count == 0
+            assert list(result) == [sample_tasks[0]]
+
+        assert loads.call_count == 1
+
+    def test_upsert_GIVEN_mapped_list_THEN_persists_change(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        reloaded = TasksCache(cache_dir)
+        changed = {**sample_tasks[0], "title": "Buy oat milk"}
+
+        reloaded.upsert("list1", [changed])
+
+        assert TasksCache(cache_dir).get("list1") == [changed, sample_tasks[1]]
+
+
+class TestJournal:
+    def test_upsert_GIVEN_snapshot_THEN_appends_without_rewriting_it(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        snapshot = (cache_dir / "list1.rec").read_bytes()
+
+        cache.upsert("list1", [{"id": "t3", "title": "New", "status": "needsAction"}])
+
+        assert (cache_dir / "list1.rec").read_bytes() == snapshot
+        assert len((cache_dir / "list1.log").read_text().splitlines()) == 1
+
+    def test_GIVEN_journaled_changes_THEN_reload_replays_them(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        new = {"id": "t3", "title": "New", "status": "needsAction"}
+        cache.upsert("list1", [new])
+        cache.remove("list1", ["t1"])
+        cache.merge("list1", [{"id": "t2", "title": "Walk cat", "status": "completed"}])
+
+        assert TasksCache(cache_dir).get("list1") == cache.get("list1")
+        assert cache.get("list1") == [
+            new,
+            {"id": "t2", "title": "Walk cat", "status": "completed"},
+        ]
+
+    def test_GIVEN_torn_last_line_THEN_replays_complete_entries(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        cache.remove("list1", ["t1"])
+        with (cache_dir / "list1.log").open("a") as f:
+            f.write('{"op":"remove","ids":["t')
+
+        assert TasksCache(cache_dir).get("list1") == [sample_tasks[1]]
+
+    def test_GIVEN_journal_past_threshold_THEN_compacts_into_snapshot(
+        self, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache = TasksCache(cache_dir, compact_threshold=200)
+        cache.set("list1", sample_tasks)
+
+        for i in range(10):
+            cache.upsert("list1", [{"id": f"n{i}", "title": f"New {i}"}])
+
+        log = cache_dir / "list1.log"
+        assert not log.exists() or log.stat().st_size <= 200
+        assert TasksCache(cache_dir).get("list1") == cache.get("list1")
+        assert len(cache.get("list1")) == 12
+
+    def test_set_GIVEN_journal_THEN_discards_it(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        cache.remove("list1", ["t1"])
+
+        cache.set("list1", sample_tasks)
+
+        assert not (cache_dir / "list1.log").exists()
+        assert TasksCache(cache_dir).get("list1") == sample_tasks
+
+    def test_invalidate_GIVEN_journal_THEN_deletes_it(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        cache.remove("list1", ["t1"])
+
+        cache.invalidate("list1")
+
+        assert not (cache_dir / "list1.log").exists()
+
+
+class TestMultiProcess:
+    def test_GIVEN_concurrent_processes_THEN_no_write_is_lost(self, cache_dir: Path) -> None:
+        workers, rounds = 8, 25
+        TasksCache(cache_dir).set("shared", [])
+
+        ctx = multiprocessing.get_context("spawn")
+        procs = [
+            ctx.Process(target=_stress_worker, args=(str(cache_dir), w, rounds))
+            for w in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(timeout=60)
+
+        assert [p.exitcode for p in procs] == [0] * workers
+        cache = TasksCache(cache_dir)
+        shared = cache.get("shared")
+        assert shared is not None
+        assert {t["id"] for t in shared} == {
+            f"w{w}-{i}" for w in range(workers) for i in range(rounds)
+        }
+        assert all(cache.get(f"own{w}") is not None for w in range(workers))
+
+
+class TestWriteBack:
+    def test_GIVEN_session_THEN_writes_nothing_until_it_ends(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        with write_back.session():
+            cache.set("list1", sample_tasks)
+            cache.upsert("list1", [{"id": "t3", "title": "New"}])
+            cache.remove("list1", ["t1"])
+            assert not (cache_dir / "list1.rec").exists()
+
+        assert not (cache_dir / "list1.log").exists()  # folded into the snapshot
+        # Snapshots store active tasks ahead of completed ones.
+        assert TasksCache(cache_dir).get("list1") == [{"id": "t3", "title": "New"}, sample_tasks[1]]
+
+    def test_GIVEN_session_THEN_coalesces_journal_entries_into_one_append(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+
+        with write_back.session():
+            cache.upsert("list1", [{"id": "t3", "title": "New"}])
+            cache.remove("list1", ["t1"])
+
+        assert len((cache_dir / "list1.log").read_text().splitlines()) == 2
+        assert TasksCache(cache_dir).get("list1") == cache.get("list1")
+
+    def test_set_GIVEN_identical_tasks_THEN_skips_snapshot_rewrite(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        inode = (cache_dir / "list1.rec").stat().st_ino
+
+        TasksCache(cache_dir).set("list1", [dict(t) for t in sample_tasks], etag='"v2"')
+
+        assert (cache_dir / "list1.rec").stat().st_ino == inode
+        assert TasksCache(cache_dir).etag("list1") == '"v2"'
+
+    def test_GIVEN_pending_changes_and_another_writer_THEN_keeps_both(
+        self, cache: TasksCache, cache_dir: Path, sample_tasks: list[dict]
+    ) -> None:
+        cache.set("list1", sample_tasks)
+        other = TasksCache(cache_dir)
+
+        with write_back.session():
+            cache.upsert("list1", [{"id": "mine", "title": "Mine"}])
+            other.upsert("list1", [{"id": "theirs", "title": "Theirs"}])
+            other.flush()
+
+        ids = {t["id"] for t in TasksCache(cache_dir).get("list1")}
+        assert ids == {"t1", "t2", "mine", "theirs"}
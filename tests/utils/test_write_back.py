@@ -0,0 +1,60 @@
+import pytest
+
+from gtasks.utils import write_back
+
+
+class _Recorder:
+    def __init__(self, fail: bool = False) -> None:
+        self.flushes = 0
+        self.fail = fail
+
+    def flush(self) -> None:
+        self.flushes += 1
+        if self.fail:
+            raise OSError("disk full")
+
+
+class TestSession:
+    def test_schedule_GIVEN_no_session_THEN_returns_false(self) -> None:
+        assert write_back.schedule(_Recorder()) is False
+
+    def test_GIVEN_repeated_schedules_THEN_flushes_once_at_end(self) -> None:
+        target = _Recorder()
+
+        with write_back.session():
+            assert write_back.schedule(target)
+            write_back.schedule(target)
+            assert target.flushes == 0
+
+        assert target.flushes == 1
+
+    def test_GIVEN_nested_sessions_THEN_flushes_when_outermost_ends(self) -> None:
+        target = _Recorder()
+
+        with write_back.session():
+            with write_back.session():
+                write_back.schedule(target)
+            assert target.flushes == 0
+
+        assert target.flushes == 1
+
+    def test_GIVEN_exception_in_block_THEN_still_flushes(self) -> None:
+        target = _Recorder()
+
+        with pytest.raises(RuntimeError):
+            with write_back.session():
+                write_back.schedule(target)
+                raise RuntimeError
+
+        assert target.flushes == 1
+
+    def test_GIVEN_failing_flush_THEN_flushes_others_and_raises(self) -> None:
+        failing, other = _Recorder(fail=True), _Recorder()
+
+        with pytest.raises(ExceptionGroup):
+            with write_back.session():
+                write_back.schedule(failing)
+                write_back.schedule(other)
+
+        assert other.flushes == 1
+        assert write_back.schedule(other) is False